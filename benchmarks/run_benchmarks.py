@@ -0,0 +1,278 @@
+"""Benchmarks for page-object operations with regression budgets.
+
+    python -m benchmarks.run_benchmarks [--iterations 20] [--only cart.] [--update-baseline]
+
+Each operation runs many times against the local stand-in store (or
+--base-url). Wall time, WebDriver command count and network bytes the browser
+received (Network.loadingFinished in Chrome's performance log) are compared
+with benchmarks/baseline.json; the run fails when an operation exceeds its
+budget (BENCH_*_BUDGET_PCT in utils/config.py, or a per-operation "budget"
+entry in the baseline file). The locator cache and network blocking are off
+during the run, so results do not depend on what earlier runs left behind.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+
+from pages.cart_page import CartPage
+from pages.checkout_page import CheckoutPage
+from pages.order_success_page import OrderSuccessPage
+from pages.product_page import ProductPage
+from utils import config
+from selenium import webdriver
+from utils.browser_startup import clone_profile, fast_options
+from utils.driver_pool import DriverPool, enable_network_log
+from utils.local_store import LocalStore
+from utils.locator_cache import locator_cache
+from utils.network_blocking import network_blocker
+from utils.perf_timing import perf_recorder
+from utils.profiler import CommandProfiler
+from utils.resource_usage import resource_monitor
+from utils.seeding import StoreSession
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+BASELINE_FILE = os.path.join(HERE, "baseline.json")
+RESULTS_FILE = os.path.join(HERE, "last_run.json")
+METRICS = ("wall_ms", "commands", "bytes")
+
+
+# -------------------------------
+# SETUP HELPERS
+# -------------------------------
+BILLING = {"firstname": "Bench", "lastname": "User", "email": "bench@example.com",
+           "address_1": "1 Bench Street", "city": "Colombo", "postcode": "10000", "country_id": "195"}
+
+
+def _session_at(base_url, step):
+    """A seeded HTTP session advanced to a guest checkout step."""
+    s = StoreSession(base_url=base_url)
+    s.add_to_cart(50, quantity=1)
+    steps = ["cart", "guest_step_1", "guest_step_2", "guest_step_3", "confirm", "success"]
+    target = steps.index(step)
+    if target >= 1:
+        s.submit_form(s.url("checkout/checkout"), {"account": "guest"})
+    if target >= 2:
+        s.submit_form(s.url("checkout/guest_step_1"), BILLING)
+    if target >= 3:
+        s.submit_form(s.url("checkout/guest_step_2"), {}, required=("shipping_method",))
+    if target >= 4:
+        s.submit_form(s.url("checkout/guest_step_3"), {"payment_method": "cod", "agree": "1"})
+    if target >= 5:
+        s.post(s.url("checkout/confirm"), {})
+    return s
+
+
+def _open_at(driver, base_url, step):
+    s = _session_at(base_url, step)
+    route = "checkout/cart" if step == "cart" else f"checkout/{step}"
+    s.inject_into(driver, s.url(route))
+
+
+def _open_product(driver, base_url):
+    ProductPage(driver, base_url=base_url).open_product(50)
+
+
+def bench_chrome():
+    """Chrome with the network log on (for byte counts) whatever BLOCK_RESOURCES says."""
+    profile_dir = clone_profile()
+    options = fast_options(profile_dir)
+    enable_network_log(options)
+    d = webdriver.Chrome(options=options)
+    d._qa_profile_dir = profile_dir
+    return d
+
+
+def network_bytes(driver):
+    """Bytes received over the network (headers included) since the last call."""
+    total = 0
+    for entry in driver.get_log("performance"):
+        message = entry.get("message", "")
+        if "Network.loadingFinished" not in message:
+            continue
+        try:
+            total += int(json.loads(message)["message"]["params"].get("encodedDataLength", 0))
+        except (KeyError, ValueError):
+            continue
+    return total
+
+
+# -------------------------------
+# OPERATIONS
+# -------------------------------
+# name -> (setup(driver, base_url), operation(driver)); setup is not timed.
+OPERATIONS = {
+    "product.open_product": (
+        lambda d, url: d.get("about:blank"),
+        lambda d: ProductPage(d).open_product(50),
+    ),
+    "product.set_quantity": (
+        _open_product,
+        lambda d: ProductPage(d).set_quantity(2),
+    ),
+    "product.click_add_to_cart": (
+        _open_product,
+        lambda d: ProductPage(d).click_add_to_cart(),
+    ),
+    "cart.get_product_names": (
+        lambda d, url: _open_at(d, url, "cart"),
+        lambda d: CartPage(d).get_product_names(),
+    ),
+    "cart.get_quantities": (
+        lambda d, url: _open_at(d, url, "cart"),
+        lambda d: CartPage(d).get_quantities(),
+    ),
+    "cart.snapshot": (
+        lambda d, url: _open_at(d, url, "cart"),
+        lambda d: CartPage(d).snapshot(),
+    ),
+    "checkout.fill_billing": (
+        lambda d, url: _open_at(d, url, "guest_step_1"),
+        lambda d: CheckoutPage(d).fill_billing(),
+    ),
+    "checkout.continue_payment": (
+        lambda d, url: _open_at(d, url, "guest_step_3"),
+        lambda d: CheckoutPage(d).continue_payment(),
+    ),
+    "success.is_success": (
+        lambda d, url: _open_at(d, url, "success"),
+        lambda d: OrderSuccessPage(d).is_success(),
+    ),
+}
+
+
+def run_operation(driver, counter, pool, base_url, name, iterations):
+    setup, operation = OPERATIONS[name]
+    walls, commands, sizes = [], [], []
+    for _ in range(iterations):
+        pool.reset(driver)
+        setup(driver, base_url)
+        network_bytes(driver)   # setup traffic is not the operation's
+        before_cmds = counter.commands
+        start = time.perf_counter()
+        operation(driver)
+        walls.append((time.perf_counter() - start) * 1000)
+        # The log reads are not part of the operation: count commands before them
+        commands.append(counter.commands - before_cmds)
+        sizes.append(network_bytes(driver))
+    return {
+        "wall_ms": round(statistics.median(walls), 2),
+        "wall_ms_p95": round(sorted(walls)[int(0.95 * (len(walls) - 1))], 2),
+        "commands": round(statistics.mean(commands), 2),
+        "bytes": round(statistics.mean(sizes)),
+        "iterations": iterations,
+    }
+
+
+# -------------------------------
+# BASELINES
+# -------------------------------
+def default_budgets():
+    return {"wall_ms": config.BENCH_TIME_BUDGET_PCT,
+            "commands": config.BENCH_COMMAND_BUDGET_PCT,
+            "bytes": config.BENCH_BYTES_BUDGET_PCT}
+
+
+def compare(results, baseline, budgets=None):
+    """Return a list of regression messages (empty when everything is within budget)."""
+    budgets = budgets or default_budgets()
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        limits = {**budgets, **base.get("budget", {})}
+        for metric, pct in limits.items():
+            if metric not in base:
+                continue
+            allowed = base[metric] * (1 + pct / 100.0)
+            if result[metric] > allowed:
+                regressions.append(
+                    f"{name}: {metric} {result[metric]} > baseline {base[metric]} (+{pct:g}% budget)"
+                )
+    return regressions
+
+
+def _load(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save(path, data):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark page-object operations.")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--only", default="", help="run operations whose name starts with this")
+    parser.add_argument("--base-url", help="site to benchmark (default: local stand-in store)")
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args(argv)
+
+    store = None
+    base_url = args.base_url
+    if not base_url:
+        store = LocalStore(port=0, latency_ms=0).start()
+        base_url = store.url
+    config.BASE_URL = base_url
+    # Measure the page objects alone: the run-time instrumentation adds its own script calls
+    perf_recorder.enabled = False
+    resource_monitor.enabled = False
+    config.READINESS_STATS = False
+    # Pinned: a remembered locator or a blocked request would change what is measured between runs
+    locator_cache.enabled = False
+    locator_cache.entries = {}
+    network_blocker.enabled = False
+    config.BLOCK_RESOURCES = False
+
+    pool = DriverPool(factory=bench_chrome)
+    driver = pool.acquire()
+    counter = CommandProfiler()
+    counter.attach(driver)
+    results = {}
+    try:
+        for name in OPERATIONS:
+            if not name.startswith(args.only):
+                continue
+            results[name] = run_operation(driver, counter, pool, base_url, name, args.iterations)
+            r = results[name]
+            print(f" {name:<28} {r['wall_ms']:>9.1f} ms  (p95 {r['wall_ms_p95']:.1f})"
+                  f"  {r['commands']:>6.1f} cmds  {r['bytes']:>8} bytes")
+    finally:
+        pool._discard(driver)
+        if store:
+            store.stop()
+
+    _save(RESULTS_FILE, results)
+    baseline = _load(BASELINE_FILE)
+    if args.update_baseline:
+        for name, r in results.items():
+            budget = baseline.get(name, {}).get("budget")
+            baseline[name] = {k: r[k] for k in METRICS}
+            if budget:
+                baseline[name]["budget"] = budget
+        _save(BASELINE_FILE, baseline)
+        print(f" Baseline updated: {BASELINE_FILE}")
+        return 0
+
+    if not baseline:
+        print(" No baseline yet — run with --update-baseline to create one.")
+        return 0
+    unmeasured = [name for name in results if not any(k in baseline.get(name, {}) for k in METRICS)]
+    if unmeasured:
+        print(f" No baseline numbers yet for {', '.join(unmeasured)} — record them with --update-baseline.")
+    regressions = compare(results, baseline)
+    for line in regressions:
+        print(" REGRESSION", line)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
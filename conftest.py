@@ -1,27 +1,276 @@
 # conftest.py
+import os
 import pytest
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
 from utils import config
+from utils import parallel
+from utils.account_pool import AccountPool, AccountPoolError
+from utils.artifacts import flush_all
+from utils.browser_contexts import ContextPool, attach_chrome
+from utils.browser_startup import WarmPool, new_fast_chrome, startup_stats
+from utils.checkpoints import checkpoints
+from utils.deadline import deadline_scope
+from utils.driver_pool import DriverPool
+from utils.html_driver import HtmlDriver
+from utils.local_store import LocalStore
+from utils.locator_cache import locator_cache
+from utils.network_blocking import network_blocker
+from utils.perf_timing import compare as compare_timings, load_baseline, perf_recorder
+from utils.profiler import CommandProfiler, profiler, summary_html
+from utils.readiness import readiness_stats
+from utils.resource_usage import resource_monitor
+from utils.seeding import SeedingError, StoreSession
+from utils.test_selection import affected_tests, recorder as deps_recorder
+from pages.cart_page import CartPage
 from pages.login_page import LoginPage
+from pages.product_page import ProductPage
+
+# Local stand-in store, started for the whole session when LOCAL_SITE=True
+_local_store = None
+
+def pytest_configure():
+    global _local_store
+    # Record before anything else runs, so session setup lands in the session bucket
+    if config.RECORD_DEPS:
+        deps_recorder.start()
+    if config.LOCAL_SITE:
+        _local_store = LocalStore().start()
+        config.BASE_URL = _local_store.url
+
+def pytest_unconfigure():
+    if _local_store:
+        # Its accounts live only in this process
+        AccountPool(base_url=_local_store.url).forget()
+        _local_store.stop()
+
+def pytest_sessionstart(session):
+    session.config.addinivalue_line(
+        "markers", "allow_resources(*names): resource types or hosts this test needs unblocked"
+    )
+    session.config.addinivalue_line(
+        "markers", "needs_browser: skipped in browserless smoke runs (BROWSERLESS=True)"
+    )
+
+def pytest_collection_modifyitems(session, items):
+    if not config.SELECT_CHANGED:
+        return
+    selected, reason = affected_tests([item.nodeid for item in items], since=config.CHANGED_SINCE or None)
+    if selected is None:
+        print(f"\n Running the full suite: {reason}.")
+        return
+    deselected = [item for item in items if item.nodeid not in selected]
+    print(f"\n {len(items) - len(deselected)} of {len(items)} tests affected ({reason}).")
+    if deselected:
+        session.config.hook.pytest_deselected(items=deselected)
+        items[:] = [item for item in items if item.nodeid in selected]
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_protocol(item, nextitem):
+    if not config.RECORD_DEPS:
+        yield
+        return
+    deps_recorder.begin()
+    yield
+    deps_recorder.end(item.nodeid, item.fixturenames)
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_fixture_setup(fixturedef, request):
+    # Shared fixtures are set up inside whichever test needs them first
+    if config.RECORD_DEPS and fixturedef.scope != "function":
+        with deps_recorder.session_scope():
+            yield
+    else:
+        yield
+
+# Per-test wall time for this run (setup + call + teardown)
+_durations = {}
+
+def pytest_runtest_logreport(report):
+    _durations[report.nodeid] = _durations.get(report.nodeid, 0.0) + report.duration
+
+def pytest_sessionfinish(session):
+    if config.RECORD_DEPS:
+        deps_recorder.stop()
+        if deps_recorder.tests:
+            deps_recorder.save()
+    if _durations:
+        parallel.save_durations(parallel.merge_durations(parallel.load_durations(), _durations))
+    locator_cache.save()
+    network_blocker.save()
+    perf_recorder.save()
+    resource_monitor.save()
+    flush_all()
+
+# WebDriver commands per page-object method, across the whole run
+_session_profile = CommandProfiler()
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    outcome = yield
+    report = outcome.get_result()
+    summary = getattr(item, "command_profile", None)
+    usage = getattr(item, "resource_usage", None)
+    if report.when != "teardown" or not (summary or usage):
+        return
+    try:
+        import pytest_html
+    except ImportError:
+        return
+    extras = getattr(report, "extras", [])
+    if summary:
+        extras.append(pytest_html.extras.html(summary_html(summary)))
+        extras.append(pytest_html.extras.json(summary, name="WebDriver profile"))
+    if usage:
+        extras.append(pytest_html.extras.json(usage, name="Browser resources"))
+    report.extras = extras
+
+def pytest_terminal_summary(terminalreporter):
+    hottest = list(_session_profile.summary()["methods"].items())[:5]
+    if hottest:
+        terminalreporter.write_line("Hottest page-object methods (WebDriver time):")
+        for method, m in hottest:
+            terminalreporter.write_line(f"  {method}: {m['ms']:.0f} ms in {m['commands']} commands")
+    for kind, s in startup_stats.summary().items():
+        terminalreporter.write_line(
+            f"Browser startup ({kind}): {s['count']} browsers, avg {s['avg_ms']:.0f} ms, max {s['max_ms']:.0f} ms"
+        )
+    for page, r in readiness_stats.summary().items():
+        line = f"Page ready: {page} {r['ready_ms']:.0f} ms avg over {r['count']} opens"
+        if "load_ms" in r:
+            line += f" (full load {r['load_ms']:.0f} ms, saved {r['saved_ms']:.0f} ms)"
+        terminalreporter.write_line(line)
+    usage = resource_monitor.totals()
+    if usage:
+        terminalreporter.write_line("Browser resources per test (max / avg): " + ", ".join(
+            f"{key} {t['max']:g} / {t['avg']:g}" for key, t in usage.items()))
+    for line in resource_monitor.over_budget:
+        terminalreporter.write_line(f"Resource budget exceeded: {line}", yellow=True)
+    timings = perf_recorder.medians()
+    for line in compare_timings(timings, load_baseline()):
+        terminalreporter.write_line(f"Page timing regression: {line}", yellow=True)
+    if checkpoints.stats["restored"] or checkpoints.stats["built"]:
+        c = checkpoints.stats
+        terminalreporter.write_line(
+            f"Checkpoints: {c['restored']} restored, {c['built']} built, {c['invalid']} invalid"
+        )
+    saved = network_blocker.totals
+    if saved["requests"]:
+        terminalreporter.write_line(
+            f"Network blocking: {saved['requests']} requests, ~{saved['bytes'] / 1024:.0f} KB not downloaded"
+        )
+    stats = locator_cache.stats()
+    if stats["hits"] or stats["misses"]:
+        terminalreporter.write_line(
+            f"Locator cache: {stats['hits']} hits, {stats['misses']} misses, "
+            f"{stats['stale']} stale, hit rate {stats['hit_rate']:.0%}"
+        )
+
+@pytest.fixture(autouse=True)
+def test_deadline():
+    """Caps the sum of all page-object waits in a test at TEST_DEADLINE_SECONDS."""
+    with deadline_scope(config.TEST_DEADLINE_SECONDS or None) as deadline:
+        yield deadline
+
+@pytest.fixture(scope="session")
+def driver_pool():
+    if config.BROWSERLESS:
+        pool = DriverPool(factory=HtmlDriver)
+        yield pool
+        pool.close_all()
+        return
+    if config.BROWSER_CONTEXTS:
+        # Under utils.parallel --contexts every worker attaches its own session to one shared Chrome
+        pool = ContextPool(factory=attach_chrome if config.SHARED_BROWSER else new_fast_chrome)
+        yield pool
+        pool.close_all()
+        return
+    # Browsers start from a trimmed profile copy; WARM_BROWSERS launch in the background before they are needed
+    warm = WarmPool(new_fast_chrome) if config.WARM_BROWSERS > 0 else None
+    pool = DriverPool(factory=warm or new_fast_chrome)
+    yield pool
+    pool.close_all()
+    if warm:
+        warm.close()
 
 @pytest.fixture
-def driver():
-    options = Options()
-    if config.HEADLESS:
-        options.add_argument("--headless=new")
-    options.add_argument("--start-maximized")
-
-    # Disable autofill and password manager
-    prefs = {
-        "credentials_enable_service": False,
-        "profile.password_manager_enabled": False
-    }
-    options.add_experimental_option("prefs", prefs)
-
-    with webdriver.Chrome(options=options) as d:
+def driver(driver_pool, request):
+    if config.BROWSERLESS and request.node.get_closest_marker("needs_browser"):
+        pytest.skip("needs a real browser (BROWSERLESS=True)")
+    d = driver_pool.acquire()
+    # The HTML driver fetches no subresources and has no command executor to profile
+    browser = not config.BROWSERLESS
+    marker = request.node.get_closest_marker("allow_resources")
+    usage = None
+    # Instrumentation may fail; the browser still goes back to the pool
+    try:
+        if browser:
+            network_blocker.apply(d, allow=marker.args if marker else ())
+        if config.PROFILE_COMMANDS and browser:
+            profiler.reset()
+            profiler.attach(d)
+        resource_monitor.begin(d)
         yield d
+        usage = resource_monitor.end(d, request.node.nodeid)
+        if usage:
+            request.node.resource_usage = usage
+            request.node.user_properties.append(("browser_resources", usage["peak"]))
+            request.node.user_properties.append(("browser_cpu_s", usage["cpu_s"]))
+        if config.PROFILE_COMMANDS and browser:
+            request.node.command_profile = profiler.summary()
+            profiler.write_json(request.node.nodeid)
+            _session_profile.merge(profiler)
+        if browser:
+            blocked = network_blocker.collect(d)
+            request.node.user_properties.append(("blocked_requests", blocked["requests"]))
+            request.node.user_properties.append(("blocked_bytes_estimate", blocked["bytes"]))
+        if config.READINESS_STATS:
+            readiness_stats.harvest(d)
+        perf_recorder.harvest(d, final=True)
+    finally:
+        driver_pool.release(d)
+    if usage and usage["over_budget"] and config.RESOURCE_BUDGET_ACTION == "fail":
+        pytest.fail("Browser resource budget exceeded: " + "; ".join(usage["over_budget"]), pytrace=False)
 
 @pytest.fixture
 def login_page(driver):
     return LoginPage(driver, timeout=config.DEFAULT_TIMEOUT)
+
+@pytest.fixture
+def account(request):
+    """An account leased to this test alone (loginname, password, email)."""
+    pool = AccountPool()
+    try:
+        leased = pool.lease(f"{config.WORKER_ID or os.getpid()}:{request.node.nodeid}")
+    except (AccountPoolError, SeedingError, OSError) as e:
+        print(f" Account pool unavailable ({e}). Using the shared account.")
+        yield {"loginname": config.USERNAME, "password": config.PASSWORD, "email": None}
+        return
+    yield leased
+    pool.release(leased)
+
+@pytest.fixture
+def store_session():
+    return StoreSession()
+
+def _add_product_through_ui(d):
+    product = ProductPage(d)
+    product.open_product(50)
+    product.set_quantity(1)
+    product.click_add_to_cart()
+    CartPage(d).go_to_cart()
+
+@pytest.fixture
+def cart_with_product(driver):
+    """Browser on the cart with product 50 in it, restored from a checkpoint when possible."""
+    checkpoints.ensure(driver, "cart_with_product", [ProductPage, CartPage],
+                       build=_add_product_through_ui,
+                       validate=lambda d: CartPage(d).snapshot().lines)
+    return CartPage(driver)
+
+@pytest.fixture(scope="session")
+def local_store():
+    """The session's stand-in store, or a private one when LOCAL_SITE is off."""
+    if _local_store:
+        yield _local_store
+    else:
+        with LocalStore(port=0) as store:
+            yield store
@@ -1,31 +1,56 @@
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
+from utils.deadline import budget
+from utils.forms import fill_fields
+from utils.locators import wait_for_any
+from utils.readiness import open_ready
 
 class BasePage:
-    def __init__(self, driver, timeout=15):
+    # Locators (any one visible) that make the page usable; subclasses override
+    READY = []
+
+    def __init__(self, driver, timeout=15, deadline=None):
         self.driver = driver
-        self.wait = WebDriverWait(driver, timeout)
+        self.timeout = timeout
+        self.deadline = deadline
+
+    def _wait(self, timeout=None):
+        """A wait limited by the flow's remaining budget."""
+        return WebDriverWait(self.driver, budget(timeout or self.timeout, self.deadline))
 
     def open(self, url: str):
-        self.driver.get(url)
+        return open_ready(self, url)
 
     def click(self, locator):
-        el = self.wait.until(EC.element_to_be_clickable(locator))
+        el = self._wait().until(EC.element_to_be_clickable(locator))
         self.driver.execute_script("arguments[0].scrollIntoView(true);", el)
         el.click()
 
     def type(self, locator, text: str, clear=True):
-        el = self.wait.until(EC.visibility_of_element_located(locator))
+        el = self._wait().until(EC.visibility_of_element_located(locator))
         self.driver.execute_script("arguments[0].value = '';", el)
         el.send_keys(text)
 
     def text(self, locator):
-        el = self.wait.until(EC.visibility_of_element_located(locator))
+        el = self._wait().until(EC.visibility_of_element_located(locator))
         return el.text
 
-    def is_visible(self, locator):
-        try:
-            self.wait.until(EC.visibility_of_element_located(locator))
-            return True
-        except Exception:
-            return False
+    def is_visible(self, locator, timeout=None):
+        el, _ = wait_for_any(self.driver, [locator], budget(timeout or self.timeout, self.deadline))
+        return el is not None
+
+    def fill_form(self, fields, verify=False, type_keys=()):
+        """Fill {name: ([locators], value)} in one script call once the first field is visible.
+
+        Raises TimeoutException naming the fields that were missing or (with verify) did not take the value.
+        """
+        first_candidates = next(iter(fields.values()))[0]
+        el, _ = wait_for_any(self.driver, first_candidates, budget(self.timeout, self.deadline))
+        if el is None:
+            raise TimeoutException(f"Form field not visible: {first_candidates}")
+        results = fill_fields(self.driver, fields, verify=verify, type_keys=type_keys)
+        failed = [key for key, ok in results.items() if not ok]
+        if failed:
+            raise TimeoutException(f"Form fields not filled: {', '.join(failed)}")
+        return results
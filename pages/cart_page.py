@@ -1,12 +1,133 @@
 import os
-import time
+import re
+from dataclasses import dataclass, field
+from typing import Optional
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from utils import config
+from utils.artifacts import artifact_writer
+from utils.locator_cache import locator_cache
+from utils.locators import first_in_order, resolve_first
+from utils.readiness import open_ready
+
+
+@dataclass
+class CartLine:
+    name: str
+    product_id: Optional[int] = None
+    options: list = field(default_factory=list)
+    quantity: int = 0
+    unit_price: Optional[float] = None
+    line_total: Optional[float] = None
+
+
+@dataclass
+class CartSnapshot:
+    lines: list = field(default_factory=list)
+    totals: dict = field(default_factory=dict)   # e.g. {"Sub-Total": 29.5, "Total": 29.5}
+
+    @property
+    def names(self):
+        return [line.name for line in self.lines]
+
+    @property
+    def quantities(self):
+        return [line.quantity for line in self.lines]
+
+    @property
+    def is_empty(self):
+        return not self.lines
+
+    @classmethod
+    def from_raw(cls, raw):
+        raw = raw or {}
+        lines = [
+            CartLine(
+                name=r["name"],
+                product_id=int(r["productId"]) if r.get("productId") else None,
+                options=r.get("options") or [],
+                quantity=_to_int(r.get("quantity")),
+                unit_price=_money(r.get("price")),
+                line_total=_money(r.get("total")),
+            )
+            for r in raw.get("lines", [])
+        ]
+        totals = {label: _money(value) for label, value in raw.get("totals", [])}
+        return cls(lines=lines, totals=totals)
+
+
+def _money(text):
+    m = re.search(r"-?\d[\d,]*(?:\.\d+)?", text or "")
+    return float(m.group().replace(",", "")) if m else None
+
+
+def _to_int(text):
+    try:
+        return int(str(text).strip())
+    except (TypeError, ValueError):
+        return 0
+
+
+def _xpath_literal(text):
+    # XPath 1.0 has no escapes: pick the quote the text lacks, or concat() the pieces
+    if "'" not in text:
+        return f"'{text}'"
+    if '"' not in text:
+        return f'"{text}"'
+    return "concat(" + ", \"'\", ".join(f"'{part}'" for part in text.split("'")) + ")"
+
+
+def _text_xpath(phrases):
+    # Elements with a text node containing any of the (lowercase) phrases, case-insensitively
+    lower = "translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz')"
+    return "//*[text()[" + " or ".join(f"contains({lower}, {_xpath_literal(p)})" for p in phrases) + "]]"
+
+
+# Reads every cart row (name, id, options, qty, prices) and the totals table in one pass
+_SNAPSHOT_JS = r"""
+var rowSelectors = arguments[0];
+var money = /\d[\d,]*\.\d{2}/;
+function text(el) { return el ? el.innerText.replace(/\s+/g, ' ').trim() : ''; }
+var rows = [];
+for (var i = 0; i < rowSelectors.length && !rows.length; i++) {
+    rows = Array.prototype.slice.call(document.querySelectorAll(rowSelectors[i])).filter(function (r) {
+        return r.querySelector('td a');
+    });
+}
+var lines = rows.map(function (r) {
+    var tds = r.querySelectorAll('td');
+    var nameCell = r.querySelector('td.name, td.product-name, td[class*="name"]') || tds[1] || r;
+    var a = nameCell.querySelector('a') || r.querySelector('a');
+    var idMatch = /product_id=(\d+)/.exec(a.getAttribute('href') || '');
+    var qty = r.querySelector("input[name*='quantity'], input[name*='qty']");
+    var cells = Array.prototype.filter.call(tds, function (td) { return money.test(text(td)); });
+    var price = r.querySelector('td.price, td[class*="price"]') || cells[0];
+    var total = r.querySelector('td.total, td[class*="subtotal"]') || cells[cells.length - 1];
+    return {
+        name: text(a),
+        productId: idMatch ? idMatch[1] : null,
+        options: Array.prototype.map.call(nameCell.querySelectorAll('small'), function (s) {
+            return text(s).replace(/^-\s*/, '');
+        }),
+        quantity: qty ? qty.value : text(r.querySelector('td.quantity')),
+        price: text(price),
+        total: text(total)
+    };
+}).filter(function (l) { return l.name; });
+var totals = [];
+var totalRows = document.querySelectorAll('#totals_table tr, table.totals tr, .cart-totals tr');
+Array.prototype.forEach.call(totalRows, function (tr) {
+    var cells = tr.querySelectorAll('td, th');
+    if (cells.length >= 2) totals.push([text(cells[0]).replace(/:$/, ''), text(cells[cells.length - 1])]);
+});
+return {lines: lines, totals: totals};
+"""
+
 
 class CartPage:
-    CART_URL = "https://automationteststore.com/index.php?rt=checkout/cart"
+    CART_ROUTE = "index.php?rt=checkout/cart"
+    CHECKOUT_ROUTE = "index.php?rt=checkout/checkout"
 
     # Checkout button candidates
     CHECKOUT_BTN_CANDIDATES = [
@@ -43,44 +164,36 @@ class CartPage:
         "there are no items in your shopping cart",
     ]
 
-    def __init__(self, driver, wait_time=12, screenshot_dir="reports_screenshots"):
+    # Usable once the cart table or any of the empty-cart messages is visible
+    READY = [
+        (By.CSS_SELECTOR, "table"),
+        (By.XPATH, _text_xpath(EMPTY_CART_MESSAGES)),
+    ]
+
+    PERF_KEY = "cart"
+
+    def __init__(self, driver, wait_time=12, screenshot_dir=None, base_url=None, deadline=None):
         self.driver = driver
-        self.wait = WebDriverWait(driver, wait_time)
-        self.screenshot_dir = screenshot_dir
+        self.deadline = deadline
+        self.base_url = (base_url or config.BASE_URL).rstrip("/")
+        self.cart_url = f"{self.base_url}/{self.CART_ROUTE}"
+        self.timeout = wait_time
+        self.screenshot_dir = screenshot_dir or config.ARTIFACT_DIR
         os.makedirs(self.screenshot_dir, exist_ok=True)
 
     def _screenshot(self, name):
-        path = os.path.join(self.screenshot_dir, f"{name}_{int(time.time())}.png")
-        try:
-            self.driver.save_screenshot(path)
-        except Exception:
-            pass
-        return path
+        return artifact_writer(self.screenshot_dir).screenshot(self.driver, name)
 
     def _dump_page(self, name):
-        path = os.path.join(self.screenshot_dir, f"{name}_{int(time.time())}.html")
-        try:
-            with open(path, "w", encoding="utf-8") as f:
-                f.write(self.driver.page_source)
-        except Exception:
-            pass
-        return path
+        return artifact_writer(self.screenshot_dir).page_source(self.driver, name)
 
     # -------------------------------
     # OPEN CART
     # -------------------------------
     def go_to_cart(self):
-        self.driver.get(self.CART_URL)
-
-        # Wait for either a table or known empty-cart text to appear
-        try:
-            self.wait.until(
-                lambda d: d.find_elements(By.CSS_SELECTOR, "table") or
-                          any(msg in d.page_source.lower() for msg in self.EMPTY_CART_MESSAGES)
-            )
-        except Exception:
-            # If the generic wait fails, proceed — we'll catch missing products later
-            pass
+        # Returns once a table or the empty-cart text is visible; if neither
+        # shows up we proceed and catch missing products later
+        open_ready(self, self.cart_url)
 
         print(" Cart page opened.")
 
@@ -99,57 +212,126 @@ class CartPage:
             (By.XPATH, "//a[contains(.,'Checkout') and contains(@class,'btn')]"),
         ]
 
-        for sel in REAL_CHECKOUT_SELECTORS:
+        e, sel = resolve_first(self.driver, REAL_CHECKOUT_SELECTORS,
+                               require_enabled=True, page=self)
+        if e is not None:
+            # Scroll into view
             try:
-                elems = self.driver.find_elements(*sel)
-                for e in elems:
-                    if e.is_displayed() and e.is_enabled():
-                        # Scroll into view
-                        try:
-                            self.driver.execute_script(
-                                "arguments[0].scrollIntoView({block:'center'});", e
-                            )
-                        except:
-                            pass
-
-                        # Try normal click → fallback to JS click
-                        try:
-                            e.click()
-                        except:
-                            self.driver.execute_script("arguments[0].click();", e)
-
-                        print(" Correct Checkout button clicked:", sel)
-                        return True
+                self.driver.execute_script(
+                    "arguments[0].scrollIntoView({block:'center'});", e
+                )
+            except:
+                pass
+
+            # Try normal click → fallback to JS click
+            try:
+                e.click()
             except:
-                continue
+                self.driver.execute_script("arguments[0].click();", e)
+
+            print(" Correct Checkout button clicked:", sel)
+            return True
 
         # ----- If still not found, direct navigation (safe fallback) -----
         print(" REAL Checkout button not found. Navigating directly.")
-        self.driver.get("https://automationteststore.com/index.php?rt=checkout/checkout")
+        self.driver.get(f"{self.base_url}/{self.CHECKOUT_ROUTE}")
         return True
 
 
+    # -------------------------------
+    # SNAPSHOT
+    # -------------------------------
+    def snapshot(self):
+        """Everything in the cart, extracted in a single script call."""
+        row_selectors = [value for _, value in self.PRODUCT_ROW_CANDIDATES]
+        try:
+            if getattr(self.driver, "is_browserless", False):
+                raw = self._snapshot_elements(row_selectors)
+            else:
+                raw = self.driver.execute_script(_SNAPSHOT_JS, row_selectors)
+        except Exception:
+            raw = None
+        snap = CartSnapshot.from_raw(raw)
+        print(f" Cart snapshot: {len(snap.lines)} lines, totals {snap.totals}")
+        return snap
+
+    def _snapshot_elements(self, row_selectors):
+        """What _SNAPSHOT_JS returns, read through the element API (drivers without JavaScript)."""
+        money = re.compile(r"\d[\d,]*\.\d{2}")
+
+        def text(el):
+            return " ".join(el.text.split()) if el is not None else ""
+
+        def first(elems):
+            return elems[0] if elems else None
+
+        rows = []
+        for sel in row_selectors:
+            rows = [r for r in self.driver.find_elements(By.CSS_SELECTOR, sel)
+                    if r.find_elements(By.CSS_SELECTOR, "td a")]
+            if rows:
+                break
+        lines = []
+        for r in rows:
+            tds = r.find_elements(By.TAG_NAME, "td")
+            name_cell = (first(r.find_elements(By.CSS_SELECTOR, "td.name, td.product-name, td[class*='name']"))
+                         or (tds[1] if len(tds) > 1 else r))
+            a = first(name_cell.find_elements(By.TAG_NAME, "a")) or r.find_element(By.TAG_NAME, "a")
+            id_match = re.search(r"product_id=(\d+)", a.get_attribute("href") or "")
+            qty = first(r.find_elements(*self.QTY_INPUT))
+            cells = [td for td in tds if money.search(text(td))]
+            price = first(r.find_elements(By.CSS_SELECTOR, "td.price, td[class*='price']")) or first(cells)
+            total = first(r.find_elements(By.CSS_SELECTOR, "td.total, td[class*='subtotal']")) or (cells[-1] if cells else None)
+            lines.append({
+                "name": text(a),
+                "productId": id_match.group(1) if id_match else None,
+                "options": [re.sub(r"^-\s*", "", text(s)) for s in name_cell.find_elements(By.TAG_NAME, "small")],
+                "quantity": qty.get_attribute("value") if qty else text(first(r.find_elements(By.CSS_SELECTOR, "td.quantity"))),
+                "price": text(price),
+                "total": text(total),
+            })
+        totals = []
+        for tr in self.driver.find_elements(By.CSS_SELECTOR, "#totals_table tr, table.totals tr, .cart-totals tr"):
+            cells = tr.find_elements(By.CSS_SELECTOR, "td, th")
+            if len(cells) >= 2:
+                totals.append([re.sub(r":$", "", text(cells[0])), text(cells[-1])])
+        return {"lines": [l for l in lines if l["name"]], "totals": totals}
+
     # -------------------------------
     # GET PRODUCT NAMES
     # -------------------------------
     def get_product_names(self):
+        snap = self.snapshot()
+        if snap.lines:
+            print(" Products found in snapshot:", snap.names)
+            return snap.names
+
         # try candidate selectors first
-        names = []
-        for sel in self.PRODUCT_NAME_CANDIDATES:
+        def texts(sel):
             try:
                 elems = self.driver.find_elements(*sel)
             except Exception:
                 elems = []
+            found = []
             for e in elems:
                 try:
                     txt = e.text.strip()
                     if txt:
-                        names.append(txt)
+                        found.append(txt)
                 except Exception:
                     continue
-            if names:
-                print("Products found using selector:", sel, names)
-                return names
+            return found
+
+        key = locator_cache.key(self, self.PRODUCT_NAME_CANDIDATES)
+        first = first_in_order(self.PRODUCT_NAME_CANDIDATES, texts,
+                               locator_cache.hint(key, self.PRODUCT_NAME_CANDIDATES))
+        if first:
+            names, index = first
+            sel = self.PRODUCT_NAME_CANDIDATES[index]
+            locator_cache.record(key, sel)
+            print("Products found using selector:", sel, names)
+            return names
+        names = []
 
         # fallback: parse table rows and take 2nd-column anchor text
         for sel in self.PRODUCT_ROW_CANDIDATES:
@@ -205,6 +387,12 @@ class CartPage:
     # GET QUANTITIES
     # -------------------------------
     def get_quantities(self):
+        snap = self.snapshot()
+        if snap.lines:
+            qtys = [str(q) for q in snap.quantities]
+            print(" Quantities:", qtys)
+            return qtys
+
         qtys = []
         try:
             inputs = self.driver.find_elements(*self.QTY_INPUT)
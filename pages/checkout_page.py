@@ -1,15 +1,21 @@
 import os
 import time
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException
+from selenium.common.exceptions import TimeoutException, StaleElementReferenceException
+from utils import config
+from utils.artifacts import artifact_writer
+from utils.deadline import budget
+from utils.forms import fill_fields
+from utils.locators import wait_for_any
+from utils.perf_timing import perf_recorder
+from utils.resource_usage import resource_monitor
 
 class CheckoutPage:
-    def __init__(self, driver, wait_time=12, screenshot_dir="reports_screenshots"):
+    def __init__(self, driver, wait_time=12, screenshot_dir=None, deadline=None):
         self.driver = driver
-        self.wait = WebDriverWait(driver, wait_time)
-        self.screenshot_dir = screenshot_dir
+        self.wait_time = wait_time
+        self.deadline = deadline
+        self.screenshot_dir = screenshot_dir or config.ARTIFACT_DIR
         os.makedirs(self.screenshot_dir, exist_ok=True)
 
     # Guest checkout candidates
@@ -84,39 +90,42 @@ class CheckoutPage:
     ]
 
     def _screenshot(self, name):
-        p = os.path.join(self.screenshot_dir, f"{name}_{int(time.time())}.png")
-        self.driver.save_screenshot(p)
-        return p
+        return artifact_writer(self.screenshot_dir).screenshot(self.driver, name)
 
     def click_any(self, selectors, timeout=15):
-        """Try all selectors, scroll into view, JS click fallback."""
-        end = time.time() + timeout
-        while time.time() < end:
-            for sel in selectors:
-                try:
-                    elems = self.driver.find_elements(*sel)
-                except Exception:
-                    elems = []
-                for e in elems:
-                    if e.is_displayed():
-                        try:
-                            self.driver.execute_script("arguments[0].scrollIntoView(true);", e)
-                            e.click()
-                        except:
-                            self.driver.execute_script("arguments[0].click();", e)
-                        return True
-            time.sleep(0.4)
-        return False
+        """Wait for any selector to become visible, scroll into view, JS click fallback."""
+        end = time.time() + budget(timeout, self.deadline)
+        while True:
+            e, sel = wait_for_any(self.driver, selectors, end - time.time(), page=self)
+            if e is None:
+                return False
+            # The click may navigate: book the timing of the page being left
+            perf_recorder.harvest(self.driver)
+            try:
+                self.driver.execute_script("arguments[0].scrollIntoView(true);", e)
+                e.click()
+            except StaleElementReferenceException:
+                # Re-rendered between match and click — wait for the new element
+                continue
+            except:
+                self.driver.execute_script("arguments[0].click();", e)
+            return True
 
     def choose_guest_checkout(self):
-        if self.click_any(self.GUEST_RADIOS):
+        perf_recorder.capture(self.driver, "checkout_account")
+        resource_monitor.step(self.driver, "checkout_account")
+        # Race the guest option against the billing form: stores that skip the
+        # account step show the form straight away, so there is nothing to wait for
+        e, sel = wait_for_any(self.driver, self.GUEST_RADIOS + self.FIRST_NAME,
+                              budget(self.wait_time, self.deadline), page=self)
+        if e is not None and sel in self.GUEST_RADIOS and self.click_any(self.GUEST_RADIOS):
             print(" Guest checkout selected.")
             self.click_any(self.CONTINUE_BUTTONS)
             return True
         print(" Guest checkout step skipped.")
         return True
 
-    def fill_billing(self, data=None):
+    def fill_billing(self, data=None, verify=False):
         d = data or {
             "first": "Test",
             "last": "User",
@@ -127,38 +136,23 @@ class CheckoutPage:
             "country": "Sri Lanka"
         }
 
-        def fill(field_list, value):
-            for sel in field_list:
-                try:
-                    e = self.driver.find_element(*sel)
-                    e.clear()
-                    e.send_keys(value)
-                    return True
-                except:
-                    continue
-            return False
-
-        fill(self.FIRST_NAME, d["first"])
-        fill(self.LAST_NAME, d["last"])
-        fill(self.EMAIL, d["email"])
-        fill(self.ADDRESS, d["address"])
-        fill(self.CITY, d["city"])
-        fill(self.POSTCODE, d["postcode"])
-
-        # Select country
-        for sel in self.COUNTRY:
-            try:
-                dropdown = self.driver.find_element(*sel)
-                opts = dropdown.find_elements(By.TAG_NAME, "option")
-                for o in opts:
-                    if d["country"].lower() in o.text.lower():
-                        self.driver.execute_script(
-                            "arguments[0].value = arguments[1]; arguments[0].dispatchEvent(new Event('change'));",
-                            dropdown, o.get_attribute("value")
-                        )
-                        break
-            except:
-                continue
+        # Billing form comes from the previous step's navigation
+        wait_for_any(self.driver, self.FIRST_NAME, budget(self.wait_time, self.deadline), page=self)
+        perf_recorder.capture(self.driver, "checkout_billing")
+        resource_monitor.step(self.driver, "checkout_billing")
+        results = fill_fields(self.driver, {
+            "first": (self.FIRST_NAME, d["first"]),
+            "last": (self.LAST_NAME, d["last"]),
+            "email": (self.EMAIL, d["email"]),
+            "address": (self.ADDRESS, d["address"]),
+            "city": (self.CITY, d["city"]),
+            "postcode": (self.POSTCODE, d["postcode"]),
+            "country": (self.COUNTRY, d["country"]),
+        }, verify=verify)
+        failed = [key for key, ok in results.items() if not ok]
+        if failed:
+            ss = self._screenshot("billing_fill_fail")
+            raise TimeoutException(f"Billing fields not filled: {', '.join(failed)}. Screenshot: {ss}")
 
         print(" Billing info filled.")
 
@@ -167,24 +161,22 @@ class CheckoutPage:
             raise TimeoutException(f"Could not continue after billing. Screenshot: {ss}")
 
     def continue_shipping(self):
+        perf_recorder.capture(self.driver, "checkout_shipping")
+        resource_monitor.step(self.driver, "checkout_shipping")
         if not self.click_any(self.CONTINUE_BUTTONS):
             ss = self._screenshot("shipping_continue_fail")
             raise TimeoutException(f"Failed to continue shipping. Screenshot: {ss}")
         print(" Shipping continued.")
 
     def continue_payment(self):
-        # Wait for any payment section to be visible
-        found_section = False
-        for sel in self.PAYMENT_SECTIONS:
-            try:
-                self.wait.until(EC.visibility_of_element_located(sel))
-                found_section = True
-                break
-            except TimeoutException:
-                continue
-        if not found_section:
+        # Wait for any payment section to be visible (all candidates in one race)
+        section, _ = wait_for_any(self.driver, self.PAYMENT_SECTIONS,
+                                  budget(self.wait_time, self.deadline), page=self)
+        if section is None:
             ss = self._screenshot("payment_section_not_visible")
             raise TimeoutException(f"Payment section not visible. Screenshot: {ss}")
+        perf_recorder.capture(self.driver, "checkout_payment")
+        resource_monitor.step(self.driver, "checkout_payment")
 
         # Select payment method
         if not self.click_any(self.PAYMENT_METHODS):
@@ -204,6 +196,8 @@ class CheckoutPage:
         print(" Payment continued.")
 
     def confirm_order(self):
+        perf_recorder.capture(self.driver, "checkout_confirm")
+        resource_monitor.step(self.driver, "checkout_confirm")
         if not self.click_any(self.CONFIRM_BUTTONS):
             ss = self._screenshot("confirm_fail")
             raise TimeoutException(f"Failed to confirm order. Screenshot: {ss}")
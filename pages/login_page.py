@@ -6,6 +6,8 @@ class LoginPage(BasePage):
     PASSWORD = (By.NAME, "password")
     LOGIN_BTN = (By.XPATH, "//button[@title='Login']")
     SUCCESS_MSG = (By.CSS_SELECTOR, ".heading1")
+    READY = [USERNAME]
+    PERF_KEY = "login"
 
     def open_login(self, base_url: str):
         self.open(f"{base_url}/index.php?rt=account/login")
@@ -1,6 +1,11 @@
 import os
-import time
 from selenium.webdriver.common.by import By
+from utils import config
+from utils.artifacts import artifact_writer
+from utils.locators import resolve_first
+from utils.page_text import find_texts
+from utils.perf_timing import perf_recorder
+from utils.resource_usage import resource_monitor
 
 class OrderSuccessPage:
     SUCCESS_TEXTS = [
@@ -20,34 +25,30 @@ class OrderSuccessPage:
         (By.CSS_SELECTOR, "div.checkout-success"),
     ]
 
-    def __init__(self, driver, screenshot_dir="reports_screenshots"):
+    def __init__(self, driver, screenshot_dir=None):
         self.driver = driver
-        self.screenshot_dir = screenshot_dir
+        self.screenshot_dir = screenshot_dir or config.ARTIFACT_DIR
         os.makedirs(self.screenshot_dir, exist_ok=True)
 
     def _screenshot(self, name):
-        path = os.path.join(self.screenshot_dir, f"{name}_{int(time.time())}.png")
-        self.driver.save_screenshot(path)
-        return path
+        return artifact_writer(self.screenshot_dir).screenshot(self.driver, name)
 
     def is_success(self):
         # Check UI headings / success containers
-        for sel in self.SUCCESS_LOCATORS:
-            try:
-                els = self.driver.find_elements(*sel)
-                for e in els:
-                    if e.is_displayed():
-                        print(f" Success element found: {sel}")
-                        return True
-            except Exception:
-                continue
+        e, sel = resolve_first(self.driver, self.SUCCESS_LOCATORS, page=self)
+        if e is not None:
+            print(f" Success element found: {sel}")
+            perf_recorder.capture(self.driver, "success")
+            resource_monitor.step(self.driver, "success")
+            return True
 
-        # Check page text for known success phrases
-        page = self.driver.page_source.lower()
-        for t in self.SUCCESS_TEXTS:
-            if t in page:
-                print(f" Success text matched: '{t}'")
-                return True
+        # Check visible page text for known success phrases
+        matched = find_texts(self.driver, self.SUCCESS_TEXTS)
+        if matched:
+            print(f" Success text matched: '{matched[0]}'")
+            perf_recorder.capture(self.driver, "success")
+            resource_monitor.step(self.driver, "success")
+            return True
 
         # If nothing matched, capture screenshot for debugging
         ss = self._screenshot("order_success_not_found")
@@ -1,5 +1,4 @@
 import os
-import time
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.common.exceptions import (
@@ -7,12 +6,21 @@ from selenium.common.exceptions import (
     NoSuchElementException,
     ElementClickInterceptedException,
 )
+from utils import config
+from utils.artifacts import artifact_writer
+from utils.deadline import budget
+from utils.locators import resolve_first, wait_for_any
+from utils.readiness import open_ready
 
 class ProductPage:
-    def __init__(self, driver, wait_time=12):
+    PRODUCT_ROUTE = "index.php?rt=product/product&product_id={product_id}"
+
+    def __init__(self, driver, wait_time=12, base_url=None, deadline=None):
         self.driver = driver
-        self.wait = WebDriverWait(driver, wait_time)
-        self.screenshot_dir = "reports_screenshots"
+        self.timeout = wait_time
+        self.deadline = deadline
+        self.base_url = (base_url or config.BASE_URL).rstrip("/")
+        self.screenshot_dir = config.ARTIFACT_DIR
         os.makedirs(self.screenshot_dir, exist_ok=True)
 
     # Multiple possible Add-to-Cart button selectors
@@ -31,6 +39,10 @@ class ProductPage:
         (By.CSS_SELECTOR, "input[name*='quantity']"),
     ]
 
+    # Usable once the quantity box or an Add-to-Cart button is visible
+    READY = QTY_SELECTORS + ADD_TO_CART_CANDIDATES[:2]
+    PERF_KEY = "product"
+
     # Options
     OPTIONS_DROPDOWN = (By.CSS_SELECTOR, "select[name*='option']")
     OPTIONS_LIST = (By.CSS_SELECTOR, "select[name*='option'] option")
@@ -51,15 +63,17 @@ class ProductPage:
     ]
 
     def _screenshot(self, name):
-        path = os.path.join(self.screenshot_dir, f"{name}_{int(time.time())}.png")
-        self.driver.save_screenshot(path)
-        return path
+        return artifact_writer(self.screenshot_dir).screenshot(self.driver, name)
 
     def _dump_page(self, name):
-        path = os.path.join(self.screenshot_dir, f"{name}_{int(time.time())}.html")
-        with open(path, "w", encoding="utf-8") as f:
-            f.write(self.driver.page_source)
-        return path
+        return artifact_writer(self.screenshot_dir).page_source(self.driver, name)
+
+    # ------------------------------------------
+    # OPEN
+    # ------------------------------------------
+    def open_product(self, product_id):
+        url = f"{self.base_url}/{self.PRODUCT_ROUTE.format(product_id=product_id)}"
+        return open_ready(self, url)
 
     # ------------------------------------------
     # QUANTITY
@@ -98,15 +112,9 @@ class ProductPage:
     # ADD BUTTON FINDER
     # ------------------------------------------
     def _find_add_button(self):
-        for sel in self.ADD_TO_CART_CANDIDATES:
-            try:
-                elems = self.driver.find_elements(*sel)
-                for e in elems:
-                    if e.is_displayed() and e.is_enabled():
-                        return e
-            except:
-                continue
-        return None
+        btn, _ = resolve_first(self.driver, self.ADD_TO_CART_CANDIDATES,
+                               require_enabled=True, page=self)
+        return btn
 
     # ------------------------------------------
     # CLICK ADD TO CART
@@ -146,13 +154,16 @@ class ProductPage:
                     raise Exception(
                         f"Could not click Add to Cart.\nScreenshot: {ss}\nPage Source: {src}\nError: {e}"
                     )
-                time.sleep(1)
+                # Retry as soon as the button is clickable and nothing covers it
+                again, _ = wait_for_any(self.driver, self.ADD_TO_CART_CANDIDATES, budget(1, self.deadline),
+                                        require_enabled=True, require_unobscured=True, page=self)
+                btn = again or btn
 
         # ------------------------------------------
         # VERIFY CART UPDATED
         # ------------------------------------------
         try:
-            self.wait.until(
+            WebDriverWait(self.driver, budget(self.timeout, self.deadline)).until(
                 lambda d: (
                     any(len(d.find_elements(*sel)) > 0 for sel in self.SUCCESS_ALERTS)
                     or self._cart_has_items(d)
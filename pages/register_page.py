@@ -10,17 +10,21 @@ class RegisterPage(BasePage):
     CONFIRM_PASSWORD = (By.NAME, "confirm")
     REGISTER_BTN = (By.XPATH, "//button[@title='Continue']")
     SUCCESS_MSG = (By.CSS_SELECTOR, ".heading1")
+    READY = [FIRSTNAME]
+    PERF_KEY = "register"
 
     def open_register(self, base_url: str):
         self.open(f"{base_url}/index.php?rt=account/create")
 
     def register(self, firstname, lastname, email, loginname, password):
-        self.type(self.FIRSTNAME, firstname)
-        self.type(self.LASTNAME, lastname)
-        self.type(self.EMAIL, email)
-        self.type(self.LOGINNAME, loginname)
-        self.type(self.PASSWORD, password)
-        self.type(self.CONFIRM_PASSWORD, password)
+        self.fill_form({
+            "firstname": ([self.FIRSTNAME], firstname),
+            "lastname": ([self.LASTNAME], lastname),
+            "email": ([self.EMAIL], email),
+            "loginname": ([self.LOGINNAME], loginname),
+            "password": ([self.PASSWORD], password),
+            "confirm": ([self.CONFIRM_PASSWORD], password),
+        })
         self.click(self.REGISTER_BTN)
 
     def is_registered(self):
@@ -0,0 +1,68 @@
+import threading
+
+from utils.account_pool import AccountPool
+from utils.seeding import StoreSession
+
+
+def _pool(tmp_path, url="http://store.test", **kwargs):
+    return AccountPool(path=str(tmp_path / "accounts.json"), base_url=url, **kwargs)
+
+
+def test_leases_are_unique_until_released(tmp_path):
+    pool = _pool(tmp_path)
+    pool.add({"loginname": "a", "password": "p", "email": "a@x"},
+             {"loginname": "b", "password": "p", "email": "b@x"})
+    first = pool.lease("w1", provision_missing=False)
+    second = pool.lease("w2", provision_missing=False)
+    assert {first["loginname"], second["loginname"]} == {"a", "b"}
+    assert pool.lease("w3", provision_missing=False) is None
+
+    pool.release(first)
+    assert pool.lease("w3", provision_missing=False)["loginname"] == first["loginname"]
+
+
+def test_expired_lease_is_handed_out_again(tmp_path):
+    pool = _pool(tmp_path, lease_minutes=0)
+    pool.add({"loginname": "a", "password": "p", "email": "a@x"})
+    pool.lease("crashed-worker", provision_missing=False)
+    assert pool.lease("w2", provision_missing=False)["loginname"] == "a"
+
+
+def test_concurrent_leases_never_share_an_account(tmp_path):
+    pool = _pool(tmp_path)
+    pool.add(*[{"loginname": f"u{i}", "password": "p", "email": None} for i in range(8)])
+    got = []
+
+    def worker(i):
+        got.append(_pool(tmp_path).lease(f"w{i}", provision_missing=False)["loginname"])
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert sorted(got) == sorted(f"u{i}" for i in range(8))
+
+
+def test_dry_pool_provisions_a_working_account_over_http(tmp_path, local_store):
+    pool = _pool(tmp_path, url=local_store.url)
+    account = pool.lease("w1")
+    assert StoreSession(base_url=local_store.url).login(account["loginname"], account["password"])
+    assert pool.status() == {"accounts": 1, "leased": 1, "free": 0}
+    pool.forget()
+    assert pool.status()["accounts"] == 0
+
+
+def test_concurrent_leases_on_a_dry_pool_each_get_their_own_account(tmp_path, local_store):
+    got = []
+
+    def worker(i):
+        got.append(_pool(tmp_path, url=local_store.url).lease(f"w{i}"))
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert None not in got and len({a["loginname"] for a in got}) == 4
+    assert _pool(tmp_path, url=local_store.url).status() == {"accounts": 4, "leased": 4, "free": 0}
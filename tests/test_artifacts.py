@@ -0,0 +1,41 @@
+import base64
+import gzip
+import os
+from utils.artifacts import ArtifactWriter
+
+
+class FakeDriver:
+    def __init__(self, source="<html>cart</html>"):
+        self.page_source = source
+
+    def execute_cdp_cmd(self, cmd, params):
+        assert params["format"] == "jpeg"
+        return {"data": base64.b64encode(b"jpeg-bytes").decode()}
+
+
+def test_page_dump_is_compressed_and_written_in_background(tmp_path):
+    writer = ArtifactWriter(str(tmp_path), max_mb=10, max_age_hours=1)
+    path = writer.page_source(FakeDriver(), "cart_no_products")
+    writer.flush()
+    assert path.endswith(".html.gz")
+    assert gzip.decompress(open(path, "rb").read()) == b"<html>cart</html>"
+
+
+def test_identical_captures_are_stored_once(tmp_path):
+    writer = ArtifactWriter(str(tmp_path), max_mb=10, max_age_hours=1)
+    first = writer.screenshot(FakeDriver(), "add_failed")
+    second = writer.screenshot(FakeDriver(), "add_failed")
+    writer.flush()
+    assert first == second and first.endswith(".jpg")
+    assert open(first, "rb").read() == b"jpeg-bytes"
+    assert len(os.listdir(tmp_path)) == 1
+
+
+def test_directory_is_kept_under_size_limit(tmp_path):
+    writer = ArtifactWriter(str(tmp_path), max_mb=0.001, max_age_hours=1)  # ~1 KB
+    for i in range(5):
+        writer.page_source(FakeDriver(os.urandom(400).hex()), f"dump{i}")
+    writer.flush()
+    sizes = [os.path.getsize(tmp_path / name) for name in os.listdir(tmp_path)]
+    assert 0 < len(sizes) < 5
+    assert sum(sizes) <= 1024 * 1.1
@@ -0,0 +1,51 @@
+import json
+
+from benchmarks.run_benchmarks import BASELINE_FILE, OPERATIONS, compare, network_bytes
+
+BUDGETS = {"wall_ms": 25, "commands": 0, "bytes": 25}
+BASELINE = {"cart.get_quantities": {"wall_ms": 100.0, "commands": 4, "bytes": 2000}}
+
+
+def test_within_budget_passes():
+    results = {"cart.get_quantities": {"wall_ms": 120.0, "commands": 4, "bytes": 2400}}
+    assert compare(results, BASELINE, BUDGETS) == []
+
+
+def test_extra_commands_and_slowdown_are_regressions():
+    results = {"cart.get_quantities": {"wall_ms": 130.0, "commands": 5, "bytes": 2000}}
+    regressions = compare(results, BASELINE, BUDGETS)
+    assert len(regressions) == 2
+    assert any("commands" in r for r in regressions)
+
+
+def test_per_operation_budget_overrides_default():
+    baseline = {"cart.get_quantities": {**BASELINE["cart.get_quantities"], "budget": {"wall_ms": 50}}}
+    results = {"cart.get_quantities": {"wall_ms": 140.0, "commands": 4, "bytes": 2000}}
+    assert compare(results, baseline, BUDGETS) == []
+
+
+def test_operations_without_baseline_are_skipped():
+    assert compare({"new.op": {"wall_ms": 1.0, "commands": 1, "bytes": 1}}, BASELINE, BUDGETS) == []
+
+
+def test_network_bytes_sums_finished_requests_since_the_last_read():
+    def event(method, params):
+        return {"message": json.dumps({"message": {"method": method, "params": params}})}
+
+    class LogDriver:
+        log = [event("Network.requestWillBeSent", {"requestId": "1"}),
+               event("Network.loadingFinished", {"requestId": "1", "encodedDataLength": 5120}),
+               event("Network.loadingFinished", {"requestId": "2", "encodedDataLength": 880})]
+
+        def get_log(self, kind):
+            entries, self.log = self.log, []
+            return entries
+
+    d = LogDriver()
+    assert network_bytes(d) == 6000
+    assert network_bytes(d) == 0
+
+
+def test_baseline_lists_every_operation():
+    with open(BASELINE_FILE, encoding="utf-8") as f:
+        assert set(json.load(f)) == set(OPERATIONS)
@@ -0,0 +1,132 @@
+from selenium.webdriver.chrome.webdriver import WebDriver as ChromeDriver
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.remote.errorhandler import ErrorHandler
+from selenium.webdriver.remote.switch_to import SwitchTo
+from selenium.webdriver.remote.webelement import WebElement
+
+from utils import browser_contexts
+from utils.browser_contexts import ContextPool
+from utils.locators import _wait_in_page
+
+
+class FakeChromedriver:
+    """Answers commands like chromedriver for one session: many tabs, one current window."""
+
+    def __init__(self):
+        self.tabs = {"home": None}  # handle -> browser context id
+        self.urls = {}
+        self.current = "home"
+        self.log = []
+        self.waits = 0
+        self.quit_called = False
+
+    def execute(self, command, params):
+        self.log.append((command, self.current))
+        value = None
+        if command == Command.SWITCH_TO_WINDOW:
+            self.current = params["handle"]
+        elif command == Command.W3C_GET_WINDOW_HANDLES:
+            value = list(self.tabs)
+        elif command == Command.W3C_GET_CURRENT_WINDOW_HANDLE:
+            value = self.current
+        elif command == Command.GET:
+            self.urls[self.current] = params["url"]
+        elif command == Command.GET_CURRENT_URL:
+            value = self.urls.get(self.current, "about:blank")
+        elif command == Command.W3C_EXECUTE_SCRIPT_ASYNC:
+            self.waits += 1
+            value = None if self.waits < 3 else [None, 0]
+        elif command == Command.QUIT:
+            self.quit_called = True
+        elif command == "executeCdpCommand":
+            value = self.cdp(params["cmd"], params["params"])
+        return {"value": value}
+
+    def cdp(self, cmd, params):
+        if cmd == "Target.createBrowserContext":
+            return {"browserContextId": f"ctx{len(self.tabs)}"}
+        if cmd == "Target.createTarget":
+            handle = f"tab{len(self.tabs)}"
+            self.tabs[handle] = params["browserContextId"]
+            return {"targetId": handle}
+        if cmd == "Target.getTargets":
+            return {"targetInfos": [{"targetId": h, "type": "page", "browserContextId": c}
+                                    for h, c in self.tabs.items()]}
+        if cmd == "Target.disposeBrowserContext":
+            self.tabs = {h: c for h, c in self.tabs.items() if c != params["browserContextId"]}
+        return {}
+
+
+def fake_chrome(server):
+    d = ChromeDriver.__new__(ChromeDriver)
+    d.command_executor = server
+    d.session_id = "session"
+    d.caps = {"browserName": "chrome"}
+    d.error_handler = ErrorHandler()
+    d._switch_to = SwitchTo(d)
+    d._web_element_cls = WebElement
+    d._websocket_connection = None
+    d.service = None
+    return d
+
+
+def test_each_handle_drives_its_own_context_tab():
+    server = FakeChromedriver()
+    pool = ContextPool(factory=lambda: fake_chrome(server))
+    a, b = pool.acquire(), pool.acquire()
+    assert (a.context_id, b.context_id) == ("ctx1", "ctx2")
+
+    a.get("http://store.test/a")
+    b.get("http://store.test/b")
+    assert server.urls == {"tab1": "http://store.test/a", "tab2": "http://store.test/b"}
+    assert a.current_url == "http://store.test/a"
+    assert a.window_handles == ["tab1"] and b.window_handles == ["tab2"]
+    # Page-level DevTools commands go to the handle's own tab
+    a.execute_cdp_cmd("Network.enable", {})
+    assert server.log[-1] == ("executeCdpCommand", "tab1")
+
+
+def test_release_and_reset_replace_the_context():
+    server = FakeChromedriver()
+    pool = ContextPool(factory=lambda: fake_chrome(server))
+    d = pool.acquire()
+    assert pool.reset(d)
+    assert d.context_id == "ctx2" and list(server.tabs) == ["home", "tab2"]
+    d.get("http://store.test/")
+    assert server.urls == {"tab2": "http://store.test/"}
+
+    pool.release(d)
+    assert list(server.tabs) == ["home"]
+    pool.close_all()
+    assert server.quit_called
+
+
+def test_waits_run_in_short_slices():
+    server = FakeChromedriver()
+    pool = ContextPool(factory=lambda: fake_chrome(server))
+    d = pool.acquire()
+    d.wait_slice = 0.05
+    # Two empty slices, then the element shows up; the lock is free between slices
+    assert _wait_in_page(d, [], 5, True, False, False)[1] == 0
+    assert server.waits == 3
+
+
+def test_attached_pool_gives_every_handle_its_own_session(monkeypatch):
+    servers, stopped = [], []
+
+    def attach(address):
+        servers.append(FakeChromedriver())
+        d = fake_chrome(servers[-1])
+        d._qa_attached = True
+        d.service = type("Service", (), {"stop": lambda self: stopped.append(address)})()
+        return d
+
+    monkeypatch.setattr(browser_contexts, "attach_chrome", attach)
+    pool = ContextPool(address="127.0.0.1:9222")
+    a, b = pool.acquire(), pool.acquire()
+    assert a._browser.lock is not b._browser.lock and len(servers) == 2
+
+    pool.release(a)
+    # Only our chromedriver stops; the shared browser keeps running for the others
+    assert stopped == ["127.0.0.1:9222"] and not servers[0].quit_called
+    assert list(servers[0].tabs) == ["home"]
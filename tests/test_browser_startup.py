@@ -0,0 +1,79 @@
+import os
+import shutil
+import threading
+import time
+
+from utils.browser_startup import StartupStats, WarmPool, build_template, clone_profile
+
+
+class FakeDriver:
+    def __init__(self):
+        self.quit_called = False
+
+    def quit(self):
+        self.quit_called = True
+
+
+def test_template_is_built_once_and_cloned(tmp_path):
+    path = str(tmp_path / "template")
+    assert build_template(path) == path
+    assert os.path.exists(os.path.join(path, "First Run"))
+    assert os.path.exists(os.path.join(path, "Default", "Preferences"))
+
+    clone = clone_profile(path)
+    try:
+        assert clone != path
+        assert os.path.exists(os.path.join(clone, "Default", "Preferences"))
+    finally:
+        shutil.rmtree(clone)
+
+
+def test_warm_pool_hands_out_prelaunched_browsers():
+    launched = []
+    ready = threading.Event()
+
+    def factory():
+        launched.append(FakeDriver())
+        ready.set()
+        return launched[-1]
+
+    stats = StartupStats()
+    pool = WarmPool(factory, size=1, stats=stats)
+    assert ready.wait(2)
+    time.sleep(0.05)
+    d = pool.take()
+    assert d is launched[0]
+    assert stats.summary()["warm"]["count"] == 1
+    # No spare is launched until the pool asks for one
+    time.sleep(0.05)
+    assert len(launched) == 1
+    pool.close()
+
+
+def test_size_zero_launches_cold():
+    stats = StartupStats()
+    pool = WarmPool(FakeDriver, size=0, stats=stats)
+    assert isinstance(pool.take(), FakeDriver)
+    assert stats.summary() == {"cold": stats.summary()["cold"]}
+    pool.close()
+
+
+def test_failed_background_launch_wakes_take_at_once():
+    calls = []
+
+    def factory():
+        calls.append(1)
+        if len(calls) == 1:
+            time.sleep(0.1)
+            raise RuntimeError("chrome did not start")
+        return FakeDriver()
+
+    stats = StartupStats()
+    pool = WarmPool(factory, size=1, stats=stats)
+    pool.launch_timeout = 30
+    start = time.perf_counter()
+    d = pool.take()
+    assert isinstance(d, FakeDriver)
+    assert time.perf_counter() - start < 5
+    assert stats.summary()["cold"]["count"] == 1
+    pool.close()
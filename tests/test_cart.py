@@ -1,26 +1,26 @@
-import pytest
-from selenium import webdriver
 from pages.product_page import ProductPage
 from pages.cart_page import CartPage
 
-@pytest.fixture
-def driver():
-    driver = webdriver.Chrome()
-    driver.maximize_window()
-    driver.implicitly_wait(5)
-    yield driver
-    driver.quit()
-
 def test_add_to_cart_and_verify(driver):
-    driver.get("https://automationteststore.com/index.php?product_id=50&rt=product/product")
-
     product = ProductPage(driver)
     cart = CartPage(driver)
 
+    product.open_product(50)
+
     product.set_quantity(2)
     assert product.click_add_to_cart() is True
 
     cart.go_to_cart()
+    snapshot = cart.snapshot()
+    assert len(snapshot.lines) > 0
+    assert snapshot.lines[0].product_id == 50
+    assert snapshot.lines[0].quantity == 2
     assert len(cart.get_product_names()) > 0
     assert cart.get_quantities()[0] == "2"
 
+def test_cart_line_details(cart_with_product):
+    snapshot = cart_with_product.snapshot()
+    line = snapshot.lines[0]
+    assert line.product_id == 50
+    assert line.unit_price and line.line_total
+    assert snapshot.totals
@@ -0,0 +1,30 @@
+from pages.cart_page import CartSnapshot, _text_xpath
+from utils.html_driver import HtmlDriver
+
+
+def test_snapshot_parses_rows_and_totals():
+    snap = CartSnapshot.from_raw({
+        "lines": [{
+            "name": "Brown Bronze", "productId": "50", "options": ["Color Light Bronze"],
+            "quantity": "2", "price": "$29.50", "total": "$1,059.00",
+        }],
+        "totals": [["Sub-Total", "$1,059.00"], ["Total", "$1,061.00"]],
+    })
+    line = snap.lines[0]
+    assert (line.product_id, line.quantity, line.unit_price, line.line_total) == (50, 2, 29.5, 1059.0)
+    assert line.options == ["Color Light Bronze"]
+    assert snap.totals == {"Sub-Total": 1059.0, "Total": 1061.0}
+    assert snap.names == ["Brown Bronze"]
+
+
+def test_snapshot_of_empty_cart():
+    snap = CartSnapshot.from_raw(None)
+    assert snap.is_empty and snap.totals == {}
+
+
+def test_text_xpath_survives_quotes_in_phrases():
+    d = HtmlDriver()
+    d._load("http://store.test/cart", """<html><body>
+      <p>You haven't added anything</p><p>It's "empty"</p></body></html>""")
+    for phrase, expected in (("haven't added", "You haven't added anything"), ('it\'s "empty"', 'It\'s "empty"')):
+        assert [e.text for e in d.find_elements("xpath", _text_xpath([phrase]))] == [expected]
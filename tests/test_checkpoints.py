@@ -0,0 +1,67 @@
+from utils.checkpoints import CheckpointStore, checkpoint_key
+
+
+class PageA:
+    X = 1
+
+
+class PageB:
+    X = 2
+
+
+class StateDriver:
+    """Just enough of a browser: cookies via CDP, storage and URL via scripts."""
+
+    def __init__(self):
+        self.cookies = []
+        self.url = "about:blank"
+        self.cdp = []
+
+    def execute_cdp_cmd(self, cmd, params):
+        self.cdp.append(cmd)
+        if cmd == "Network.getAllCookies":
+            return {"cookies": list(self.cookies)}
+        if cmd == "Network.setCookies":
+            self.cookies = list(params["cookies"])
+        if cmd == "Page.addScriptToEvaluateOnNewDocument":
+            return {"identifier": "1"}
+        return {}
+
+    def execute_script(self, script, *args):
+        return {"url": self.url, "local": {"k": "v"}, "session": {}}
+
+    def get(self, url):
+        self.url = url
+
+
+def test_key_changes_with_page_source_and_base_url():
+    assert checkpoint_key("cart", [PageA], "http://a") != checkpoint_key("cart", [PageB], "http://a")
+    assert checkpoint_key("cart", [PageA], "http://a") != checkpoint_key("cart", [PageA], "http://b")
+    assert checkpoint_key("cart", [PageA], "http://a/") == checkpoint_key("cart", [PageA], "http://a")
+
+
+def _build(d):
+    d.cookies = [{"name": "store_session", "value": "abc", "domain": "127.0.0.1", "path": "/"}]
+    d.url = "http://127.0.0.1/index.php?rt=checkout/cart"
+
+
+def test_build_once_then_restore_into_another_browser(tmp_path):
+    store = CheckpointStore(directory=str(tmp_path), ttl_minutes=5, enabled=True)
+    assert store.ensure(StateDriver(), "cart", [PageA], build=_build) == "built"
+
+    fresh = StateDriver()
+    assert store.ensure(fresh, "cart", [PageA], build=_build) == "restored"
+    assert fresh.cookies[0]["value"] == "abc"
+    assert fresh.url.endswith("rt=checkout/cart")
+    # the storage script is removed again so pooled browsers do not keep it
+    assert "Page.removeScriptToEvaluateOnNewDocument" in fresh.cdp
+
+
+def test_invalid_or_expired_checkpoint_is_rebuilt(tmp_path):
+    store = CheckpointStore(directory=str(tmp_path), ttl_minutes=5, enabled=True)
+    store.ensure(StateDriver(), "cart", [PageA], build=_build)
+    assert store.ensure(StateDriver(), "cart", [PageA], build=_build, validate=lambda d: False) == "built"
+    assert store.stats["invalid"] == 1
+
+    expired = CheckpointStore(directory=str(tmp_path), ttl_minutes=0, enabled=True)
+    assert expired.ensure(StateDriver(), "cart", [PageA], build=_build) == "built"
@@ -0,0 +1,45 @@
+import threading
+import time
+
+import pytest
+from utils.deadline import Deadline, DeadlineExceeded, budget, current, deadline_scope
+
+
+def test_budget_is_capped_by_what_is_left():
+    with deadline_scope(0.5):
+        assert budget(15) <= 0.5
+        assert budget(0.1) == 0.1
+    assert budget(15) == 15
+
+
+def test_budget_raises_once_the_deadline_has_passed():
+    with deadline_scope(0.01):
+        time.sleep(0.02)
+        with pytest.raises(DeadlineExceeded, match="0.01s budget used up"):
+            budget(15)
+    assert budget(15, Deadline(60)) == 15
+
+
+def test_nested_scope_cannot_extend_the_outer_one():
+    with deadline_scope(1):
+        with deadline_scope(60) as inner:
+            assert inner.remaining() <= 1
+        with deadline_scope(0.2):
+            assert budget(15) <= 0.2
+
+
+def test_expired_deadline_gives_zero_and_check_raises():
+    d = Deadline(0.01)
+    time.sleep(0.02)
+    assert d.remaining(15) == 0.0
+    with pytest.raises(DeadlineExceeded):
+        d.check("checkout")
+
+
+def test_scopes_are_per_thread():
+    seen = []
+    with deadline_scope(1):
+        t = threading.Thread(target=lambda: seen.append(current().end))
+        t.start()
+        t.join()
+    assert seen == [None]
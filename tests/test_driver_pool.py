@@ -0,0 +1,125 @@
+import time
+
+from utils.browser_startup import StartupStats, WarmPool
+from utils.driver_pool import DriverPool
+
+
+class FakeDriver:
+    def __init__(self):
+        self.quit_called = False
+        self.crashed = False
+        self.cleared = False
+        self.tabs = {"main": ["http://store.test/cart", "https://pay.test/form", "about:blank"]}
+        self.current_window_handle = "main"
+        self.cleared_origins = []
+
+    @property
+    def window_handles(self):
+        if self.crashed:
+            raise RuntimeError("browser gone")
+        return list(self.tabs)
+
+    @property
+    def current_url(self):
+        if self.crashed:
+            raise RuntimeError("browser gone")
+        return "about:blank"
+
+    @property
+    def switch_to(self):
+        return self
+
+    def window(self, handle):
+        self.current_window_handle = handle
+
+    def new_window(self, kind):
+        self.current_window_handle = f"tab{len(self.tabs)}"
+        self.tabs[self.current_window_handle] = []
+
+    def close(self):
+        del self.tabs[self.current_window_handle]
+
+    def execute_script(self, script, *args):
+        return None
+
+    def execute_cdp_cmd(self, cmd, params):
+        if cmd == "Network.clearBrowserCookies":
+            self.cleared = True
+        elif cmd == "Page.getNavigationHistory":
+            return {"entries": [{"url": url} for url in self.tabs[self.current_window_handle]]}
+        elif cmd == "Storage.clearDataForOrigin":
+            self.cleared_origins.append(params["origin"])
+
+    def implicitly_wait(self, seconds):
+        pass
+
+    def get(self, url):
+        pass
+
+    def quit(self):
+        self.quit_called = True
+
+
+def test_pool_reuses_and_resets_browser():
+    pool = DriverPool(factory=FakeDriver, max_uses=5)
+    d = pool.acquire()
+    pool.release(d)
+    assert d.cleared
+    assert pool.acquire() is d
+
+
+def test_reset_clears_every_visited_origin_in_a_fresh_tab():
+    pool = DriverPool(factory=FakeDriver, max_uses=5)
+    d = pool.acquire()
+    d.tabs["popup"] = ["https://help.test/faq"]
+    pool.release(d)
+    assert d.cleared_origins == ["http://store.test", "https://help.test", "https://pay.test"]
+    assert list(d.tabs) == ["tab2"] and d.current_window_handle == "tab2"
+
+
+def test_zero_max_uses_means_a_new_browser_every_time():
+    pool = DriverPool(factory=FakeDriver, max_uses=0)
+    d = pool.acquire()
+    pool.release(d)
+    assert d.quit_called
+
+
+def test_pool_recycles_after_max_uses():
+    pool = DriverPool(factory=FakeDriver, max_uses=2)
+    d = pool.acquire()
+    pool.release(d)
+    assert pool.acquire() is d
+    pool.release(d)
+    assert d.quit_called
+    assert pool.acquire() is not d
+
+
+def test_pool_replaces_crashed_browser():
+    pool = DriverPool(factory=FakeDriver, max_uses=5)
+    d = pool.acquire()
+    d.crashed = True
+    pool.release(d)
+    assert d.quit_called
+    assert pool.acquire() is not d
+
+
+def test_driver_pool_primes_the_replacement_before_recycling():
+    launched = []
+
+    def factory():
+        launched.append(FakeDriver())
+        return launched[-1]
+
+    warm = WarmPool(factory, size=1, stats=StartupStats())
+    pool = DriverPool(factory=warm, max_uses=3)
+    d = pool.acquire()
+    pool.release(d)
+    time.sleep(0.05)
+    assert len(launched) == 1
+    pool.release(pool.acquire())   # one use left: the replacement starts launching
+    time.sleep(0.05)
+    assert len(launched) == 2
+    pool.release(pool.acquire())
+    assert d.quit_called and pool.acquire() is launched[1]
+    pool.close_all()
+    warm.close()
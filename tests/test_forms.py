@@ -0,0 +1,56 @@
+from selenium.webdriver.common.by import By
+from utils.forms import fill_fields
+
+NAME = [(By.NAME, "firstname")]
+COUNTRY = [(By.NAME, "country_id")]
+PHONE = [(By.NAME, "telephone")]
+
+
+class FakeElement:
+    def __init__(self):
+        self.keys = ""
+
+    def clear(self):
+        self.keys = ""
+
+    def send_keys(self, text):
+        self.keys += text
+
+    def get_attribute(self, name):
+        return self.keys
+
+
+class FillDriver:
+    def __init__(self, result):
+        self.result = result
+        self.calls = 0
+
+    def execute_script(self, script, payload, verify):
+        self.calls += 1
+        self.payload = payload
+        return self.result
+
+
+def test_all_fields_filled_in_one_call():
+    d = FillDriver({"first": {"found": True, "index": 0}, "country": {"found": True, "index": 0}})
+    result = fill_fields(d, {"first": (NAME, "Test"), "country": (COUNTRY, "Sri Lanka")})
+    assert result == {"first": True, "country": True}
+    assert d.calls == 1
+    assert d.payload["country"] == {"candidates": [["name", "country_id"]], "value": "Sri Lanka",
+                                    "type_keys": False}
+
+
+def test_missing_field_and_failed_read_back_are_reported():
+    d = FillDriver({"first": {"found": False},
+                    "country": {"found": True, "index": 0, "value": "United Kingdom"}})
+    result = fill_fields(d, {"first": (NAME, "Test"), "country": (COUNTRY, "Sri Lanka")}, verify=True)
+    assert result == {"first": False, "country": False}
+
+
+def test_type_keys_fields_are_typed_after_lookup():
+    el = FakeElement()
+    d = FillDriver({"phone": {"found": True, "index": 0, "element": el}})
+    result = fill_fields(d, {"phone": (PHONE, "0771234567")}, verify=True, type_keys=("phone",))
+    assert result == {"phone": True}
+    assert el.keys == "0771234567"
+    assert d.payload["phone"]["type_keys"] is True
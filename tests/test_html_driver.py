@@ -0,0 +1,142 @@
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+import pytest
+
+from pages.cart_page import CartPage
+from pages.checkout_page import CheckoutPage
+from pages.order_success_page import OrderSuccessPage
+from pages.product_page import ProductPage
+from pages.register_page import RegisterPage
+from utils import readiness
+from utils.forms import fill_fields
+from utils.html_driver import HtmlDriver, form_data, parse_html, select_css, select_xpath
+from utils.locator_cache import locator_cache
+from utils.locators import resolve_first
+from utils.readiness import ReadinessStats
+
+PAGE = """<html><head><title>T</title><script>var x = 1;</script></head><body>
+<div id="main" class="box wide">
+  <a href="/index.php?rt=checkout/checkout" class="btn checkout">Checkout</a>
+  <p>Your shopping <b>cart</b> is empty!</p>
+  <input type="hidden" name="token" value="t">
+  <span style="display: none">secret</span>
+</div>
+<table><tbody>
+  <tr><td>1</td><td class="name"><a href="/p?product_id=7">Lipstick</a><br><small>- Red</small></td></tr>
+  <tr><td>2</td><td class="name"><a href="/p?product_id=8">Blush</a></td></tr>
+</tbody></table>
+<form id="f" action="/submit" method="post">
+  <input type="text" name="first" value="A">
+  <input type="checkbox" name="agree" value="1">
+  <label><input type="radio" name="pay" value="card" checked> Card</label>
+  <label><input type="radio" name="pay" value="cod"> Cash On Delivery</label>
+  <select name="country"><option value="1">Sri Lanka</option><option value="2" selected>India</option></select>
+  <button type="submit" name="go" value="yes" title="Continue">Continue</button>
+</form>
+</body></html>"""
+
+
+@pytest.fixture(autouse=True)
+def isolated(monkeypatch):
+    monkeypatch.setattr(locator_cache, "enabled", False)
+    monkeypatch.setattr(readiness, "readiness_stats", ReadinessStats())
+
+
+def _names(nodes):
+    return [n.attrs.get("name") or n.attrs.get("id") or n.tag for n in nodes]
+
+
+def test_css_subset():
+    doc = parse_html(PAGE)
+    assert _names(select_css(doc, "div#main.box")) == ["main"]
+    assert len(select_css(doc, "a[href*='checkout'], a.btn.checkout")) == 1
+    assert [n.text_content() for n in select_css(doc, "td[class*='name'] > a")] == ["Lipstick", "Blush"]
+    assert [n.text_content() for n in select_css(doc, "table tbody tr td:nth-child(2) a")] == ["Lipstick", "Blush"]
+    assert _names(select_css(doc, "input[type='checkbox'][name='agree']")) == ["agree"]
+    assert _names(select_css(doc, "form input[name^='fi']")) == ["first"]
+
+
+def test_xpath_subset():
+    doc = parse_html(PAGE)
+    cart_empty = "//*[text()[contains(translate(., 'CARTISEMPY', 'cartisempy'), ' is empty')]]"
+    assert [n.tag for n in select_xpath(doc, cart_empty)] == ["p"]
+    assert select_xpath(doc, "//*[contains(text(), 'cart is empty')]") == []
+    assert _names(select_xpath(doc, "//label[contains(.,'Cash On Delivery')]//input")) == ["pay"]
+    assert _names(select_xpath(doc, "//input[@name='pay' and contains(@value,'cod')]")) == ["pay"]
+    assert _names(select_xpath(doc, "//button[contains(text(),'Continue')]")) == ["go"]
+    assert [n.text_content() for n in select_xpath(doc, "//tr[2]/td/a")] == ["Blush"]
+    assert select_xpath(doc, "//a[not(contains(@href,'product_id'))]")[0].attrs["class"] == "btn checkout"
+
+
+def test_text_visibility_and_form_state():
+    d = HtmlDriver()
+    d._load("http://store.test/cart", PAGE)
+    assert d.title == "T"
+    assert d.find_element(By.ID, "main").text == "Checkout\nYour shopping cart is empty!"
+    assert not d.find_element(By.NAME, "token").is_displayed()
+    assert d.find_element(By.CSS_SELECTOR, "td.name").text == "Lipstick\n- Red"
+    assert d.find_element(By.CSS_SELECTOR, "td.name a").get_attribute("href") == "http://store.test/p?product_id=7"
+
+    d.find_element(By.XPATH, "//label[contains(.,'Cash')]").click()
+    d.find_element(By.NAME, "agree").click()
+    first = d.find_element(By.NAME, "first")
+    first.clear()
+    first.send_keys("Bob")
+    form = d.find_element(By.ID, "f")._node
+    assert form_data(form, d.find_element(By.NAME, "go")._node) == [
+        ("first", "Bob"), ("agree", "1"), ("pay", "cod"), ("country", "2"), ("go", "yes"),
+    ]
+
+
+def test_locator_and_form_helpers_work_without_javascript():
+    d = HtmlDriver()
+    d._load("http://store.test/form", PAGE)
+    el, sel = resolve_first(d, [(By.ID, "missing"), (By.NAME, "token"), (By.NAME, "first")])
+    assert sel == (By.NAME, "first") and el.get_attribute("value") == "A"
+
+    results = fill_fields(d, {
+        "first": ([(By.NAME, "first")], "Zed"),
+        "country": ([(By.NAME, "country")], "Sri Lanka"),
+        "agree": ([(By.NAME, "agree")], True),
+    }, verify=True)
+    assert results == {"first": True, "country": True, "agree": True}
+
+
+def test_guest_checkout_flow_over_http(local_store):
+    d = HtmlDriver()
+    product = ProductPage(d, base_url=local_store.url)
+    product.open_product(50)
+    product.set_quantity(1)
+    product.click_add_to_cart()
+
+    cart = CartPage(d, base_url=local_store.url)
+    cart.go_to_cart()
+    snapshot = cart.snapshot()
+    assert snapshot.names == ["Skinsheen Bronzer Stick"]
+    assert snapshot.lines[0].product_id == 50 and snapshot.lines[0].quantity == 1
+
+    cart.click_checkout()
+    checkout = CheckoutPage(d)
+    checkout.choose_guest_checkout()
+    checkout.fill_billing()
+    checkout.continue_shipping()
+    checkout.continue_payment()
+    checkout.confirm_order()
+    assert OrderSuccessPage(d).is_success()
+    assert d.get_cookies()[0]["name"] == "store_session"
+
+
+def test_cart_ready_contract_matches_every_empty_cart_message():
+    xpath = CartPage.READY[1][1]
+    for message in CartPage.EMPTY_CART_MESSAGES:
+        doc = parse_html(f"<div><p>{message.upper()}.</p></div>")
+        assert [n.tag for n in select_xpath(doc, xpath)] == ["p"], message
+
+
+def test_form_fields_that_are_not_filled_raise():
+    d = HtmlDriver()
+    d._load("http://store.test/account/create", """<form>
+      <input name="firstname"><input name="lastname"><input name="email">
+      <input name="password"><input name="confirm"></form>""")
+    with pytest.raises(TimeoutException, match="not filled: loginname"):
+        RegisterPage(d, timeout=1).register("A", "B", "a@b.c", "ab", "pw")
@@ -0,0 +1,48 @@
+from utils.loadgen import percentile, run_load
+
+
+class FakeDriver:
+    def __init__(self):
+        self.current_url = "about:blank"
+
+    def quit(self):
+        pass
+
+
+def _steps(fail_every=None):
+    calls = []
+
+    def pay(flow):
+        calls.append(1)
+        if fail_every and len(calls) % fail_every == 0:
+            raise RuntimeError("payment section not visible")
+        return True
+
+    return [("add", lambda f: True), ("pay", pay), ("done", lambda f: True)]
+
+
+def test_percentile_nearest_rank():
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 95) == 95
+    assert percentile(values, 99) == 99
+    assert percentile([], 50) is None
+
+
+def test_run_load_reports_latency_and_error_rate(monkeypatch):
+    monkeypatch.setattr("utils.loadgen.DriverPool.reset", lambda self, d: True)
+    report = run_load(3, iterations=12, factory=FakeDriver, steps=_steps(fail_every=4),
+                      make_flow=lambda d: d)
+    assert report["add"]["count"] == 12
+    assert report["pay"]["errors"] == 3
+    assert report["pay"]["error_rate"] == 0.25
+    # steps after a failure are not run for that flow
+    assert report["done"]["count"] == 9
+    assert report["flow"]["errors"] == 3
+    assert report["add"]["p99_ms"] is not None
+
+
+def test_run_load_stops_after_duration(monkeypatch):
+    monkeypatch.setattr("utils.loadgen.DriverPool.reset", lambda self, d: True)
+    report = run_load(2, duration=0.05, factory=FakeDriver, steps=_steps(), make_flow=lambda d: d)
+    assert report["flow"]["count"] > 0 and report["flow"]["errors"] == 0
@@ -0,0 +1,56 @@
+import time
+import urllib.error
+
+import pytest
+from utils.local_store import LocalStore
+from utils.seeding import StoreSession
+
+
+def test_guest_checkout_flow_places_order(local_store):
+    s = StoreSession(base_url=local_store.url)
+    s.add_to_cart(52, quantity=2)
+
+    url, html = s.get(s.url("checkout/cart"))
+    assert "Benefit Bella Bamba" in html and 'value="2"' in html
+
+    url, _ = s.submit_form(s.url("checkout/checkout"), {"account": "guest"})
+    assert "guest_step_1" in url
+    url, _ = s.submit_form(url, {"firstname": "Test", "lastname": "User", "email": "t@example.com",
+                                 "address_1": "1 Street", "city": "Colombo", "postcode": "10000",
+                                 "country_id": "195"})
+    assert "guest_step_2" in url
+    url, _ = s.submit_form(url, {}, required=("shipping_method",))
+    assert "guest_step_3" in url
+    url, _ = s.submit_form(url, {"payment_method": "cod", "agree": "1"})
+    assert "checkout/confirm" in url
+    orders = len(local_store.orders)
+    _, html = s.post(s.url("checkout/confirm"), {})
+    assert "Your Order Has Been Processed!" in html
+    assert len(local_store.orders) == orders + 1
+
+
+def test_empty_cart_message(local_store):
+    s = StoreSession(base_url=local_store.url)
+    _, html = s.get(s.url("checkout/cart"))
+    assert "Your shopping cart is empty!" in html
+
+
+@pytest.mark.parametrize("form, status", [
+    ({"product_id": "999"}, 404),
+    ({"product_id": "abc"}, 404),
+    ({"product_id": "50", "option[1]": "7", "quantity": "two"}, 400),
+])
+def test_bad_add_to_cart_input_gets_an_error_page(local_store, form, status):
+    s = StoreSession(base_url=local_store.url)
+    with pytest.raises(urllib.error.HTTPError) as e:
+        s.post(s.url("checkout/cart"), form)
+    assert e.value.code == status
+    assert "Automation Test Store" in e.value.read().decode()
+
+
+def test_artificial_latency():
+    with LocalStore(port=0, latency_ms=200) as store:
+        s = StoreSession(base_url=store.url)
+        start = time.monotonic()
+        s.get(store.url + "/robots.txt")
+        assert time.monotonic() - start >= 0.2
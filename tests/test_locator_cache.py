@@ -0,0 +1,63 @@
+import json
+import time
+from selenium.webdriver.common.by import By
+from utils.locator_cache import LocatorCache
+from utils.locators import first_in_order
+
+CANDIDATES = [
+    (By.CSS_SELECTOR, "button#first"),
+    (By.CSS_SELECTOR, "button#second"),
+    (By.XPATH, "//button[3]"),
+]
+
+
+def test_winner_is_tried_first_and_counted_as_hit(tmp_path):
+    cache = LocatorCache(path=str(tmp_path / "cache.json"), ttl_days=1, enabled=True)
+    key = cache.key("CheckoutPage", CANDIDATES, "http://store")
+    assert cache.hint(key, CANDIDATES) is None
+
+    cache.record(key, CANDIDATES[2])
+    assert cache.hint(key, CANDIDATES) == 2
+    cache.record(key, CANDIDATES[2])
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_cache_persists_and_is_keyed_by_site(tmp_path):
+    path = str(tmp_path / "cache.json")
+    cache = LocatorCache(path=path, ttl_days=1, enabled=True)
+    key = cache.key("CartPage", CANDIDATES, "http://store")
+    cache.record(key, CANDIDATES[1])
+    cache.save()
+
+    reloaded = LocatorCache(path=path, ttl_days=1, enabled=True)
+    assert reloaded.hint(key, CANDIDATES) == 1
+    other_site = reloaded.key("CartPage", CANDIDATES, "http://localhost")
+    assert reloaded.hint(other_site, CANDIDATES) is None
+
+
+def test_expired_entries_are_invalidated(tmp_path):
+    path = tmp_path / "cache.json"
+    cache = LocatorCache(path=str(path), ttl_days=1, enabled=True)
+    key = cache.key("CartPage", CANDIDATES, "http://store")
+    cache.entries[key] = {"locator": list(CANDIDATES[1]), "confirmed": time.time() - 2 * 86400}
+    assert cache.hint(key, CANDIDATES) is None
+    assert cache.stale == 1
+    cache.save()
+    assert json.loads(path.read_text()) == {}
+
+
+def test_an_earlier_match_outranks_the_cached_winner():
+    # The catch-all (last) won before; now the specific first candidate matches too
+    matches = {CANDIDATES[0]: "specific", CANDIDATES[2]: "catch-all"}
+    checked = []
+
+    def match(candidate):
+        checked.append(candidate)
+        return matches.get(candidate)
+
+    assert first_in_order(CANDIDATES, match, hint=2) == ["specific", 0]
+    assert checked == [CANDIDATES[2], CANDIDATES[0]]
+    # Only the cached winner matches: it wins without the candidates after it
+    del matches[CANDIDATES[0]]
+    assert first_in_order(CANDIDATES, match, hint=1) == ["catch-all", 2]
+    assert first_in_order(CANDIDATES, match, hint=2) == ["catch-all", 2]
@@ -0,0 +1,93 @@
+from selenium.webdriver.common.by import By
+from utils.locators import resolve_first
+
+
+class ScriptDriver:
+    """Records execute_script calls and answers with a canned result."""
+
+    def __init__(self, result):
+        self.result = result
+        self.calls = []
+
+    def execute_script(self, script, *args):
+        self.calls.append(args)
+        return self.result
+
+
+CANDIDATES = [
+    (By.CSS_SELECTOR, "button#a"),
+    (By.XPATH, "//button[@id='b']"),
+    (By.NAME, "c"),
+]
+
+
+def test_resolve_first_returns_matching_locator_in_one_call():
+    d = ScriptDriver(["element", 2])
+    el, sel = resolve_first(d, CANDIDATES, require_enabled=True)
+    assert (el, sel) == ("element", (By.NAME, "c"))
+    assert len(d.calls) == 1
+    assert d.calls[0] == ([list(c) for c in CANDIDATES], True, True, None)
+
+
+def test_resolve_first_returns_none_when_nothing_qualifies():
+    assert resolve_first(ScriptDriver(None), CANDIDATES) == (None, None)
+
+
+class AsyncScriptDriver:
+    """Fails the first async script (as a navigation would), then answers."""
+
+    def __init__(self, results):
+        self.results = list(results)
+        self.script_timeout = None
+
+    def set_script_timeout(self, seconds):
+        self.script_timeout = seconds
+
+    def execute_async_script(self, script, *args):
+        result = self.results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+def test_wait_for_any_rearms_after_navigation():
+    from selenium.common.exceptions import JavascriptException
+    from utils.locators import wait_for_any
+
+    d = AsyncScriptDriver([JavascriptException("document unloaded"), ["element", 1]])
+    el, sel = wait_for_any(d, CANDIDATES, timeout=5)
+    assert (el, sel) == ("element", CANDIDATES[1])
+    assert d.script_timeout >= 10
+
+
+def test_wait_for_any_raises_when_the_session_is_gone():
+    import pytest
+    from selenium.common.exceptions import InvalidSessionIdException
+    from utils.locators import wait_for_any
+
+    d = AsyncScriptDriver([InvalidSessionIdException("invalid session id"), ["element", 1]])
+    with pytest.raises(InvalidSessionIdException):
+        wait_for_any(d, CANDIDATES, timeout=5)
+
+
+def test_wait_for_any_times_out():
+    from utils.locators import wait_for_any
+
+    assert wait_for_any(AsyncScriptDriver([None]), CANDIDATES, timeout=1) == (None, None)
+
+
+def test_wait_for_any_checks_once_even_without_time_left():
+    from utils.locators import wait_for_any
+
+    d = AsyncScriptDriver([["element", 0]])
+    assert wait_for_any(d, CANDIDATES, timeout=0) == ("element", CANDIDATES[0])
+
+
+def test_raised_script_timeout_is_restored():
+    from utils.locators import restore_script_timeout, wait_for_any
+
+    d = AsyncScriptDriver([["element", 0]])
+    wait_for_any(d, CANDIDATES, timeout=60)
+    assert d.script_timeout > 60
+    restore_script_timeout(d)
+    assert d.script_timeout == 30 and not hasattr(d, "_qa_script_timeout")
@@ -1,11 +1,11 @@
 from utils import config
 
-def test_login_success(driver, login_page):
+def test_login_success(driver, login_page, account):
     print(" Opening login page...")
     login_page.open_login(config.BASE_URL)
 
-    print(" Logging in with:", config.USERNAME)
-    login_page.login(config.USERNAME, config.PASSWORD)
+    print(" Logging in with:", account["loginname"])
+    login_page.login(account["loginname"], account["password"])
 
     print(" Verifying login success...")
     assert login_page.is_logged_in(), "Login failed — welcome message not found"
@@ -0,0 +1,77 @@
+import json
+import re
+
+from utils.network_blocking import NetworkBlocker
+
+
+class FakeDriver:
+    def __init__(self, events=()):
+        self.cdp = []
+        self.log = [{"message": json.dumps({"message": e})} for e in events]
+
+    def execute_cdp_cmd(self, cmd, params):
+        self.cdp.append((cmd, params))
+        return {}
+
+    def get_log(self, kind):
+        entries, self.log = self.log, []
+        return entries
+
+
+def _blocker(tmp_path, **kwargs):
+    return NetworkBlocker(types="image,font", hosts="facebook.net", enabled=True,
+                          sizes_file=str(tmp_path / "sizes.json"), **kwargs)
+
+
+def test_patterns_respect_allow_list(tmp_path):
+    blocker = _blocker(tmp_path)
+    assert {"*.png", "*.png?*"} <= set(blocker.patterns())
+    assert "*://facebook.net/*" in blocker.patterns()
+    allowed = blocker.patterns(allow=("image", "facebook.net"))
+    assert "*.png" not in allowed and "*.woff2" in allowed
+    assert not any("facebook" in p for p in allowed)
+
+
+def test_apply_installs_blocked_urls(tmp_path):
+    d = FakeDriver()
+    urls = _blocker(tmp_path).apply(d)
+    assert ("Network.setBlockedURLs", {"urls": urls}) in d.cdp
+
+
+def test_collect_counts_blocked_requests_and_learns_sizes(tmp_path):
+    blocker = _blocker(tmp_path)
+    d = FakeDriver([
+        {"method": "Network.requestWillBeSent",
+         "params": {"requestId": "1", "type": "Image", "request": {"url": "http://x/image/a.png?v=2"}}},
+        {"method": "Network.loadingFinished", "params": {"requestId": "1", "encodedDataLength": 1234}},
+        {"method": "Network.requestWillBeSent",
+         "params": {"requestId": "2", "type": "Image", "request": {"url": "http://x/image/a.png?v=3"}}},
+        {"method": "Network.loadingFailed", "params": {"requestId": "2", "blockedReason": "inspector"}},
+        {"method": "Network.requestWillBeSent",
+         "params": {"requestId": "3", "type": "Font", "request": {"url": "http://x/f.woff2"}}},
+        {"method": "Network.loadingFailed", "params": {"requestId": "3", "blockedReason": "inspector"}},
+    ])
+    blocked = blocker.collect(d)
+    assert blocked == {"requests": 2, "bytes": 1234 + 40000}
+
+    blocker.save()
+    assert NetworkBlocker(sizes_file=str(tmp_path / "sizes.json")).sizes == {"x/image/a.png": 1234}
+
+
+def test_extensions_are_matched_at_the_end_of_the_path(tmp_path):
+    patterns = NetworkBlocker(types="script", hosts="", enabled=True,
+                              sizes_file=str(tmp_path / "sizes.json")).patterns()
+
+    def blocked(url):
+        # Chrome's blocked-URL patterns: "*" is the only wildcard
+        return any(re.fullmatch(re.escape(p).replace(r"\*", ".*"), url) for p in patterns)
+
+    assert blocked("http://x/app.js") and blocked("http://x/app.js?v=2")
+    assert not blocked("http://x/data.json") and not blocked("http://x/api.jsonp?cb=f")
+
+
+def test_disabled_blocker_leaves_the_browser_alone(tmp_path):
+    d = FakeDriver([{"method": "Network.loadingFailed", "params": {"requestId": "1", "blockedReason": "inspector"}}])
+    blocker = NetworkBlocker(enabled=False, sizes_file=str(tmp_path / "sizes.json"))
+    assert blocker.apply(d) == [] and blocker.collect(d) == {"requests": 0, "bytes": 0}
+    assert d.cdp == [] and len(d.log) == 1
@@ -0,0 +1,37 @@
+from selenium.common.exceptions import WebDriverException
+
+from utils.html_driver import HtmlDriver
+from utils.page_text import find_texts
+
+PHRASES = ["Your Order Has Been Processed", "thank you for shopping", "order failed"]
+
+
+class ScriptDriver:
+    def __init__(self, result):
+        self.result = result
+        self.calls = []
+
+    def execute_script(self, script, phrases):
+        self.calls.append(phrases)
+        if isinstance(self.result, Exception):
+            raise self.result
+        return self.result
+
+
+def test_only_the_matched_phrases_come_back():
+    d = ScriptDriver(["thank you for shopping"])
+    assert find_texts(d, tuple(PHRASES)) == ["thank you for shopping"]
+    assert d.calls == [PHRASES]
+    assert find_texts(ScriptDriver(None), PHRASES) == []
+    assert find_texts(ScriptDriver(WebDriverException("gone")), PHRASES) == []
+
+
+def test_browserless_match_ignores_case_whitespace_and_hidden_text():
+    d = HtmlDriver()
+    d._load("http://store.test/success", """<html><body>
+      <h1>YOUR ORDER   HAS BEEN
+          processed!</h1>
+      <p>Thank You for <b>shopping</b> with us.</p>
+      <div style="display:none">order failed</div>
+    </body></html>""")
+    assert find_texts(d, PHRASES) == ["Your Order Has Been Processed", "thank you for shopping"]
@@ -0,0 +1,76 @@
+from utils import config, parallel
+from utils.parallel import schedule, merge_durations, split_args, worker_options
+
+
+def test_schedule_puts_longest_tests_on_separate_workers():
+    durations = {"a": 60.0, "b": 50.0, "c": 10.0, "d": 5.0}
+    plan = schedule(list(durations), durations, 2)
+    shards = [set(tests) for _, tests in plan]
+    assert {"a"} <= shards[0] and {"b"} <= shards[1]
+    assert max(est for est, _ in plan) == 65.0
+
+
+def test_schedule_estimates_unknown_tests_with_average():
+    plan = schedule(["a", "b", "new"], {"a": 4.0, "b": 2.0}, 3)
+    assert sorted(est for est, _ in plan) == [2.0, 3.0, 4.0]
+
+
+def test_merge_durations_blends_history():
+    merged = merge_durations({"a": 10.0}, {"a": 20.0, "b": 1.0})
+    assert merged == {"a": 15.0, "b": 1.0}
+
+
+def test_split_args_keeps_option_values_with_their_options():
+    assert split_args(["tests/", "-k", "tests", "--html=r.html", "tests/test_cart.py::test_a", "-x"]) == (
+        ["-k", "tests", "--html=r.html", "-x"], ["tests/", "tests/test_cart.py::test_a"])
+
+
+def test_every_worker_writes_its_own_reports():
+    options = ["--html=reports/report.html", "--junitxml", "junit.xml", "-k", "cart", "--self-contained-html"]
+    assert worker_options(options, "gw1") == [
+        "--html=reports/report.gw1.html", "--junitxml", "junit.gw1.xml", "-k", "cart", "--self-contained-html"]
+
+
+def test_workers_get_options_and_their_own_tests_only(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "tests").mkdir()
+    monkeypatch.setattr(config, "DURATIONS_FILE", str(tmp_path / "durations.json"))
+    collected, commands = [], []
+    monkeypatch.setattr(parallel, "collect", lambda args: collected.append(args) or ["t.py::a", "t.py::b"])
+
+    class FakeProc:
+        def __init__(self, cmd, **kwargs):
+            commands.append(cmd[3:])
+
+        def wait(self):
+            return 0
+
+    monkeypatch.setattr(parallel.subprocess, "Popen", FakeProc)
+    assert parallel.main(["-n", "2", "tests", "-x"]) == 0
+    assert collected == [["tests", "-x"]]
+    assert sorted(commands) == [["-x", "t.py::a"], ["-x", "t.py::b"]]
+
+
+def test_contexts_workers_attach_to_one_shared_browser(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(config, "DURATIONS_FILE", str(tmp_path / "durations.json"))
+    monkeypatch.setattr(parallel, "collect", lambda args: ["t.py::a", "t.py::b"])
+    shared, envs = [], []
+
+    class FakeBrowser:
+        def quit(self):
+            shared.append("quit")
+
+    monkeypatch.setattr(parallel, "launch_shared_chrome", lambda: shared.append("launch") or (FakeBrowser(), "127.0.0.1:9222"))
+
+    class FakeProc:
+        def __init__(self, cmd, env, **kwargs):
+            envs.append(env)
+
+        def wait(self):
+            return 0
+
+    monkeypatch.setattr(parallel.subprocess, "Popen", FakeProc)
+    assert parallel.main(["-n", "2", "--contexts"]) == 0
+    assert shared == ["launch", "quit"]
+    assert [(e["BROWSER_CONTEXTS"], e["SHARED_BROWSER"]) for e in envs] == [("True", "127.0.0.1:9222")] * 2
@@ -0,0 +1,45 @@
+from utils.perf_timing import PerfRecorder, compare, load_series, medians
+
+
+class TimingDriver:
+    def __init__(self, url="http://store/cart", origin=1000.0, load=0):
+        self.timing = {"url": url, "origin": origin, "ttfb": 42.4, "dcl": 180.0, "load": load,
+                       "bytes": 5120, "resources": 3,
+                       "largest": [{"name": "http://store/image/a.png", "type": "img", "ms": 90, "bytes": 4000}]}
+
+    def execute_script(self, script, *args):
+        return self.timing
+
+
+def test_capture_records_each_document_once_and_appends_to_series(tmp_path):
+    path = str(tmp_path / "timing.jsonl")
+    rec = PerfRecorder(path=path, enabled=True)
+    d = TimingDriver()
+    first = rec.capture(d, "cart")
+    assert first["ttfb_ms"] == 42.4 and first["load_ms"] is None   # load not finished yet
+    assert rec.capture(d, "cart") is None
+    assert rec.harvest(d) is None and rec.records == []            # still loading: stays pending
+    d.timing["load"] = 700.0
+    assert rec.harvest(d)["load_ms"] == 700.0
+    rec.capture(TimingDriver(origin=2000.0, load=600.0), "cart")
+
+    rec.save()
+    rec.save()   # nothing new, nothing written twice
+    series = load_series(path)
+    assert [r["page"] for r in series] == ["cart", "cart"]
+    assert medians(series)["cart"] == {"ttfb_ms": 42.4, "dcl_ms": 180.0, "load_ms": 650.0}
+
+
+def test_document_left_before_load_keeps_the_capture_time_reading(tmp_path):
+    rec = PerfRecorder(path=str(tmp_path / "timing.jsonl"), enabled=True)
+    d = TimingDriver()
+    rec.capture(d, "cart")
+    d.timing = dict(d.timing, url="http://store/checkout", origin=3000.0)
+    assert rec.harvest(d)["url"] == "http://store/cart"
+    assert rec.harvest(d) is None
+
+
+def test_compare_flags_metrics_over_budget():
+    baseline = {"cart": {"ttfb_ms": 40.0, "load_ms": 500.0}}
+    current = {"cart": {"ttfb_ms": 45.0, "load_ms": 800.0}, "login": {"ttfb_ms": 99.0}}
+    assert compare(current, baseline, budget_pct=30) == ["cart: load_ms 800.0 > baseline 500.0 (+30% budget)"]
@@ -0,0 +1,49 @@
+from pages.cart_page import CartPage
+from utils.profiler import CommandProfiler, OUTSIDE_PAGES
+
+
+class FakeExecutor:
+    def execute(self, command, params):
+        # An empty cart: no rows found, the snapshot script finds nothing either
+        return {"value": None if command == "executeScript" else []}
+
+
+class FakeDriver:
+    """The WebDriver calls CartPage uses, each sent through the (profiled) command executor."""
+
+    def __init__(self):
+        self.command_executor = FakeExecutor()
+
+    def find_elements(self, by, value):
+        return self.command_executor.execute("findElements", {"using": by, "value": value})["value"]
+
+    def execute_script(self, script, *args):
+        return self.command_executor.execute("executeScript", {"script": script, "args": list(args)})["value"]
+
+
+def test_commands_are_attributed_to_page_methods(tmp_path):
+    d = FakeDriver()
+    profiler = CommandProfiler()
+    profiler.attach(d)
+
+    CartPage(d, screenshot_dir=str(tmp_path)).get_quantities()
+    d.find_elements("css selector", "body")
+
+    summary = profiler.summary()
+    # snapshot() script, then the get_quantities fallback lookup, then the test's own lookup
+    assert summary["commands"] == 3
+    assert list(summary["methods"]["CartPage.snapshot"]["by_command"]) == ["executeScript"]
+    assert summary["methods"]["CartPage.snapshot"]["commands"] == 1
+    assert summary["methods"]["CartPage.get_quantities"]["commands"] == 1
+    assert summary["methods"]["CartPage.get_quantities"]["by_command"]["findElements"]["count"] == 1
+    assert summary["methods"][OUTSIDE_PAGES]["commands"] == 1
+
+
+def test_attach_twice_does_not_double_count():
+    d = FakeDriver()
+    first, second = CommandProfiler(), CommandProfiler(measure_bytes=True)
+    first.attach(d)
+    second.attach(d)
+    d.find_elements("css selector", "body")
+    assert (first.commands, second.commands) == (0, 1)
+    assert second.bytes > 0
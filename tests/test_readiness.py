@@ -0,0 +1,62 @@
+from selenium.webdriver.common.by import By
+import pytest
+from utils import readiness
+from utils.locator_cache import locator_cache
+from utils.perf_timing import perf_recorder
+from utils.readiness import ReadinessStats, open_ready
+
+
+class FakeDriver:
+    def __init__(self, ready=True, load_ms=900.0):
+        self.ready = ready
+        self.load_ms = load_ms
+        self.visited = []
+
+    def get(self, url):
+        self.visited.append(url)
+
+    def set_script_timeout(self, seconds):
+        pass
+
+    def execute_async_script(self, script, *args):
+        return ["element", 0] if self.ready else None
+
+    def execute_script(self, script, *args):
+        return {"url": self.visited[-1], "load": self.load_ms}
+
+
+@pytest.fixture(autouse=True)
+def isolated(monkeypatch):
+    monkeypatch.setattr(locator_cache, "enabled", False)
+    monkeypatch.setattr(perf_recorder, "enabled", False)
+    monkeypatch.setattr(readiness, "readiness_stats", ReadinessStats())
+
+
+class DemoPage:
+    READY = [(By.ID, "ready")]
+    timeout = 1
+
+    def __init__(self, driver):
+        self.driver = driver
+
+
+def test_open_ready_returns_contract_element_and_books_load_time():
+    d = FakeDriver()
+    assert open_ready(DemoPage(d), "http://store/page") == "element"
+    readiness.readiness_stats.harvest(d)
+    row = readiness.readiness_stats.summary()["DemoPage"]
+    assert row["load_ms"] == 900.0
+    assert row["saved_ms"] == round(900.0 - row["ready_ms"], 1)
+
+
+def test_open_ready_gives_up_quietly_when_contract_never_holds():
+    assert open_ready(DemoPage(FakeDriver(ready=False)), "http://store/page", timeout=0.2) is None
+
+
+def test_load_time_of_another_url_is_ignored():
+    stats = ReadinessStats()
+    d = FakeDriver()
+    d.visited.append("http://store/other")
+    stats.record_ready(d, "DemoPage", "http://store/page", 100.0)
+    stats.harvest(d)
+    assert "load_ms" not in stats.summary()["DemoPage"]
@@ -1,5 +1,6 @@
 import time
 from utils import config
+from utils.account_pool import AccountPool
 from pages.register_page import RegisterPage
 
 def test_register_success(driver):
@@ -24,3 +25,6 @@ def test_register_success(driver):
 
     print(" Verifying registration success...")
     assert register_page.is_registered(), "Registration failed — success message not found"
+
+    # The new account can serve later login tests
+    AccountPool().add({"loginname": loginname, "password": "Password123", "email": email})
@@ -0,0 +1,107 @@
+import json
+import os
+import subprocess
+import sys
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from utils import resource_usage
+from utils.resource_usage import ResourceMonitor, check_budgets, summarize
+
+
+class FakeDriver:
+    """Chrome stand-in: its 'chromedriver' is this process, so the browser is our child process."""
+
+    def __init__(self):
+        self.service = SimpleNamespace(process=SimpleNamespace(pid=os.getpid()))
+        self.nodes = 100
+
+    def execute_cdp_cmd(self, cmd, params):
+        if cmd == "Performance.getMetrics":
+            self.nodes += 400
+            return {"metrics": [
+                {"name": "JSHeapUsedSize", "value": 8 * 1024 * 1024},
+                {"name": "Nodes", "value": self.nodes},
+                {"name": "LayoutCount", "value": 3},
+                {"name": "Documents", "value": 1},
+            ]}
+        return {}
+
+
+@pytest.fixture
+def browser_process():
+    child = subprocess.Popen(["sleep", "30"])
+    yield child
+    child.kill()
+    child.wait()
+
+
+def test_budgets_name_the_step_where_the_peak_happened():
+    summary = summarize([
+        {"step": "start", "t_ms": 0, "rss_mb": 200.0, "cpu_s": 0.0, "dom_nodes": 300},
+        {"step": "checkout_payment", "t_ms": 1500, "rss_mb": 420.5, "cpu_s": 1.2, "dom_nodes": 2500},
+        {"step": "end", "t_ms": 2000, "rss_mb": 380.0, "cpu_s": 1.5, "dom_nodes": 900},
+    ])
+    assert summary["peak"] == {"rss_mb": 420.5, "js_heap_mb": None, "dom_nodes": 2500, "layouts": None}
+    assert summary["cpu_s"] == 1.5 and summary["cpu_pct"] == 75.0
+    assert check_budgets(summary, {"rss_mb": 400, "dom_nodes": 5000, "cpu_s": 1, "js_heap_mb": 50}) == [
+        "rss_mb 420.5 > budget 400 (at checkout_payment)",
+        "cpu_s 1.5 > budget 1 (at end)",
+    ]
+
+
+@pytest.mark.skipif(not os.path.isdir("/proc"), reason="/proc fallback is Linux only")
+def test_monitor_samples_processes_and_page_metrics(browser_process, monkeypatch, tmp_path):
+    monkeypatch.setattr(resource_usage, "psutil", None)
+    monkeypatch.setattr(resource_usage, "budgets", lambda: {"dom_nodes": 1000})
+    monitor = ResourceMonitor(enabled=True, path=str(tmp_path / "usage.jsonl"))
+    d = FakeDriver()
+
+    monitor.begin(d)
+    assert browser_process.pid in monitor._cpu_base
+    monitor.step(d, "cart")
+    monitor.step(FakeDriver(), "not this test")
+    usage = monitor.end(d, "t.py::test_checkout")
+
+    assert [s["step"] for s in usage["samples"]] == ["start", "cart", "end"]
+    assert usage["peak"]["rss_mb"] > 0 and usage["peak"]["js_heap_mb"] == 8.0
+    assert usage["peak"]["dom_nodes"] == 1300 and usage["peak"]["layouts"] == 3
+    assert usage["over_budget"] == ["dom_nodes 1300 > budget 1000 (at end)"]
+    assert monitor.over_budget == ["t.py::test_checkout: dom_nodes 1300 > budget 1000 (at end)"]
+    assert monitor.end(d, "again") is None
+
+    monitor.save()
+    record = json.loads((tmp_path / "usage.jsonl").read_text())
+    assert record["test"] == "t.py::test_checkout" and record["dom_nodes"] == 1300
+    assert monitor.totals()["dom_nodes"] == {"max": 1300, "avg": 1300, "tests": 1}
+
+
+def test_browserless_drivers_are_not_accounted():
+    monitor = ResourceMonitor(enabled=True)
+    d = SimpleNamespace(is_browserless=True)
+    monitor.begin(d)
+    assert monitor.step(d, "cart") is None and monitor.end(d, "t") is None
+
+
+@pytest.mark.skipif(not os.path.isdir("/proc"), reason="/proc fallback is Linux only")
+def test_processes_started_and_exited_during_the_test_are_counted(browser_process, monkeypatch):
+    monkeypatch.setattr(resource_usage, "psutil", None)
+    monitor = ResourceMonitor(enabled=True)
+    d = FakeDriver()
+    monitor.begin(d)
+
+    # The tab navigates: the old process exits, a new busy renderer starts
+    browser_process.kill()
+    browser_process.wait()
+    renderer = subprocess.Popen([sys.executable, "-c", "import time\nend = time.time() + 10\nwhile time.time() < end: pass"])
+    try:
+        time.sleep(0.5)
+        cart = monitor.step(d, "cart")
+        assert renderer.pid in monitor._cpu_last and cart["cpu_s"] > 0
+    finally:
+        renderer.kill()
+        renderer.wait()
+    usage = monitor.end(d, "t.py::test_navigate")
+    assert usage["cpu_s"] >= cart["cpu_s"]
@@ -0,0 +1,64 @@
+import pytest
+from utils.seeding import StoreSession, SeedingError
+
+
+def test_login_sets_up_logged_in_session(local_store):
+    local_store.add_account("seed_login", "secret")
+    session = StoreSession(base_url=local_store.url)
+    assert session.login("seed_login", "secret")
+    assert session.is_logged_in()
+
+
+def test_login_failure_raises(local_store):
+    with pytest.raises(SeedingError):
+        StoreSession(base_url=local_store.url).login("nobody", "wrong")
+
+
+def test_register_creates_account(local_store):
+    StoreSession(base_url=local_store.url).register("Test", "User", "seed@example.com", "seed_user", "pw")
+    assert local_store.accounts["seed_user"]["password"] == "pw"
+
+
+def test_add_to_cart_picks_required_option(local_store):
+    session = StoreSession(base_url=local_store.url)
+    session.add_to_cart(50, quantity=3)
+    sid = next(c.value for c in session.cookies)
+    (line,) = local_store.sessions[sid]["cart"].values()
+    assert line["product_id"] == 50 and line["quantity"] == 3
+    assert line["options"] == {"1": "7"}
+
+
+def test_add_to_cart_rejected_by_store_raises(local_store):
+    session = StoreSession(base_url=local_store.url)
+    with pytest.raises(SeedingError, match="did not add product 50"):
+        session.add_to_cart(50, options={"option[1]": ""})
+
+
+def test_rejected_add_of_a_product_already_in_the_cart_raises(local_store):
+    session = StoreSession(base_url=local_store.url)
+    session.add_to_cart(50)
+    session.add_to_cart(50, quantity=2)
+    assert session.cart_quantities() == {50: 3}
+    with pytest.raises(SeedingError, match="did not add product 50"):
+        session.add_to_cart(50, options={"option[1]": ""})
+
+
+def test_inject_into_sets_session_cookie(local_store):
+    class CdpDriver:
+        def __init__(self):
+            self.cookies = []
+            self.visited = []
+
+        def execute_cdp_cmd(self, cmd, params):
+            self.cookies.append(params)
+
+        def get(self, url):
+            self.visited.append(url)
+
+    session = StoreSession(base_url=local_store.url)
+    session.add_to_cart(51)
+    d = CdpDriver()
+    session.inject_into(d, f"{local_store.url}/index.php?rt=checkout/cart")
+    assert [c["name"] for c in d.cookies] == ["store_session"]
+    assert d.cookies[0]["httpOnly"] is True
+    assert d.visited == [f"{local_store.url}/index.php?rt=checkout/cart"]
@@ -0,0 +1,124 @@
+import importlib.util
+import json
+import subprocess
+
+from utils.test_selection import DepsRecorder, affected_tests, changed_symbols, load_map, merge_maps
+
+PAGE_V1 = '''
+class DemoPage:
+    READY = [("id", "ready")]
+    BUTTONS = [("id", "go")]
+    UNUSED = [("id", "nope")]
+
+    def open(self):
+        return getattr(self, "READY")
+
+    def click(self):
+        return self.BUTTONS
+'''
+
+CONFTEST = '''
+import pytest
+
+def pytest_configure():
+    pass
+
+@pytest.fixture
+def page():
+    return 1
+'''
+
+
+def test_only_edited_symbols_count_as_changed():
+    reformatted = PAGE_V1.replace('[("id", "go")]', "[('id',  'go')]  # same value") + "\n\n"
+    assert changed_symbols(PAGE_V1, reformatted) == set()
+    edited = PAGE_V1.replace('"go"', '"go-now"')
+    assert changed_symbols(PAGE_V1, edited) == {"DemoPage.BUTTONS"}
+    assert changed_symbols(PAGE_V1, "import os\n" + PAGE_V1) == {"<module>"}
+    assert changed_symbols(PAGE_V1, "class (") is None
+
+
+def test_recorder_books_called_methods_and_the_constants_they_use(tmp_path):
+    (tmp_path / "demo.py").write_text(PAGE_V1)
+    spec = importlib.util.spec_from_file_location("demo_page_module", tmp_path / "demo.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    rec = DepsRecorder(root=tmp_path)
+    rec.start()
+    try:
+        rec.begin()
+        module.DemoPage().open()
+        rec.end("test_open", ["page"])
+        rec.begin()
+        module.DemoPage().click()
+        rec.end("test_click")
+    finally:
+        rec.stop()
+    assert rec.tests["test_open"]["deps"] == ["demo.py::DemoPage.READY", "demo.py::DemoPage.open"]
+    assert rec.tests["test_open"]["fixtures"] == ["page"]
+    assert rec.tests["test_click"]["deps"] == ["demo.py::DemoPage.BUTTONS", "demo.py::DemoPage.click"]
+
+
+def _git(root, *args):
+    subprocess.run(["git", "-c", "user.name=qa", "-c", "user.email=qa@example.com", *args],
+                   cwd=root, check=True, capture_output=True)
+
+
+def _repo(tmp_path):
+    (tmp_path / "pages").mkdir()
+    (tmp_path / "pages" / "demo.py").write_text(PAGE_V1)
+    (tmp_path / "conftest.py").write_text(CONFTEST)
+    _git(tmp_path, "init", "-q")
+    _git(tmp_path, "add", ".")
+    _git(tmp_path, "commit", "-q", "-m", "base")
+    head = subprocess.run(["git", "rev-parse", "HEAD"], cwd=tmp_path, capture_output=True, text=True).stdout.strip()
+    deps = {"version": 1, "commit": head, "session": [], "tests": {
+        "t.py::test_open": {"deps": ["pages/demo.py::DemoPage.READY", "pages/demo.py::DemoPage.open"],
+                            "fixtures": ["page"]},
+        "t.py::test_click": {"deps": ["pages/demo.py::DemoPage.BUTTONS", "pages/demo.py::DemoPage.click"],
+                             "fixtures": []},
+    }}
+    return deps
+
+
+def test_changed_locator_selects_only_its_tests(tmp_path):
+    deps = _repo(tmp_path)
+    nodeids = ["t.py::test_open", "t.py::test_click", "t.py::test_new"]
+    assert affected_tests(nodeids, deps, root=tmp_path)[0] == {"t.py::test_new"}
+
+    (tmp_path / "pages" / "demo.py").write_text(PAGE_V1.replace('"go"', '"go-now"'))
+    selected, _ = affected_tests(nodeids, deps, root=tmp_path)
+    assert selected == {"t.py::test_click", "t.py::test_new"}
+
+    (tmp_path / "conftest.py").write_text(CONFTEST.replace("return 1", "return 2"))
+    assert affected_tests(nodeids, deps, root=tmp_path)[0] == {"t.py::test_click", "t.py::test_open", "t.py::test_new"}
+
+
+def test_full_suite_when_change_cannot_be_attributed(tmp_path):
+    deps = _repo(tmp_path)
+    nodeids = ["t.py::test_open", "t.py::test_click"]
+    assert affected_tests(nodeids, {}, root=tmp_path)[0] is None
+    assert affected_tests(nodeids, {**deps, "commit": "0" * 40}, root=tmp_path)[0] is None
+
+    (tmp_path / "conftest.py").write_text(CONFTEST.replace("pass", "print('hi')"))
+    selected, reason = affected_tests(nodeids, deps, root=tmp_path)
+    assert selected is None and "pytest_configure" in reason
+
+
+def test_worker_maps_are_merged_into_the_main_map(tmp_path):
+    main = tmp_path / "deps.json"
+    main.write_text(json.dumps({"version": 1, "commit": "old", "session": ["a.py::setup"], "tests": {
+        "t.py::test_a": {"deps": ["old"], "fixtures": []}}}))
+    for worker, nodeid in (("gw0", "t.py::test_a"), ("gw1", "t.py::test_b")):
+        (tmp_path / f"deps.json.{worker}").write_text(json.dumps({
+            "version": 1, "commit": "new", "session": [f"{worker}.py::setup"],
+            "tests": {nodeid: {"deps": [f"{worker}.py::f"], "fixtures": []}}}))
+
+    merge_maps([str(tmp_path / "deps.json.gw0"), str(tmp_path / "deps.json.gw1")], path=str(main))
+    data = load_map(str(main))
+    assert data["commit"] == "new"
+    assert data["tests"] == {"t.py::test_a": {"deps": ["gw0.py::f"], "fixtures": []},
+                             "t.py::test_b": {"deps": ["gw1.py::f"], "fixtures": []}}
+    assert data["session"] == ["a.py::setup", "gw0.py::setup", "gw1.py::setup"]
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["deps.json"]
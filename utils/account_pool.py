@@ -0,0 +1,225 @@
+"""Pool of pre-registered accounts, leased to one test (or worker) at a time.
+
+    python -m utils.account_pool provision -n 10          # over HTTP
+    python -m utils.account_pool provision -n 2 --via ui  # through RegisterPage
+    python -m utils.account_pool status
+
+Accounts are stored in ACCOUNT_POOL_FILE per base URL. A lease marks an
+account as taken until it is released or ACCOUNT_LEASE_MINUTES pass, so a
+crashed worker cannot hold one forever. All reads and writes happen under
+a lock file (created with O_EXCL, so it works the same on every platform).
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import uuid
+from contextlib import contextmanager
+from utils import config
+from utils.seeding import SeedingError, StoreSession
+
+
+class AccountPoolError(Exception):
+    pass
+
+
+class AccountPool:
+    def __init__(self, path=None, base_url=None, lease_minutes=None, password=None):
+        self.path = path or config.ACCOUNT_POOL_FILE
+        self.lock_path = f"{self.path}.lock"
+        self.base_url = (base_url or config.BASE_URL).rstrip("/")
+        self.lease_seconds = (config.ACCOUNT_LEASE_MINUTES if lease_minutes is None else lease_minutes) * 60
+        self.password = password or config.ACCOUNT_POOL_PASSWORD
+
+    # -------------------------------
+    # LOCKED FILE ACCESS
+    # -------------------------------
+    @contextmanager
+    def _locked(self, timeout=30, stale_after=60):
+        end = time.monotonic() + timeout
+        while True:
+            try:
+                fd = os.open(self.lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                break
+            except FileExistsError:
+                try:
+                    # A lock left behind by a killed process
+                    if time.time() - os.path.getmtime(self.lock_path) > stale_after:
+                        os.remove(self.lock_path)
+                        continue
+                except OSError:
+                    continue
+                if time.monotonic() > end:
+                    raise AccountPoolError(f"Could not lock {self.lock_path}")
+                time.sleep(0.05)
+        try:
+            os.write(fd, str(os.getpid()).encode("ascii"))
+            os.close(fd)
+            data = self._load()
+            yield data
+            self._save(data)
+        finally:
+            try:
+                os.remove(self.lock_path)
+            except OSError:
+                pass
+
+    def _load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self, data):
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, sort_keys=True)
+        os.replace(tmp, self.path)
+
+    def _accounts(self, data):
+        return data.setdefault(self.base_url, [])
+
+    # -------------------------------
+    # PROVISION
+    # -------------------------------
+    def new_identity(self):
+        tag = f"{int(time.time())}{uuid.uuid4().hex[:6]}"
+        return {"loginname": f"qa{tag}", "email": f"qa{tag}@example.com", "password": self.password}
+
+    def provision(self, count, via="http", driver=None):
+        """Register `count` new accounts and add them to the pool. Returns the new accounts."""
+        created = []
+        for _ in range(count):
+            identity = self.new_identity()
+            if via == "ui":
+                self._register_ui(driver, identity)
+            else:
+                self._register_http(identity)
+            created.append(identity)
+        self.add(*created)
+        return created
+
+    def _register_http(self, identity):
+        StoreSession(base_url=self.base_url).register(
+            firstname="Pool", lastname="User", email=identity["email"],
+            loginname=identity["loginname"], password=identity["password"],
+        )
+
+    def _register_ui(self, driver, identity):
+        from pages.register_page import RegisterPage
+        page = RegisterPage(driver, timeout=config.DEFAULT_TIMEOUT)
+        page.open_register(self.base_url)
+        page.register("Pool", "User", identity["email"], identity["loginname"], identity["password"])
+        if not page.is_registered():
+            raise SeedingError(f"UI registration failed for {identity['loginname']}")
+        # Log out so the next registration starts clean
+        driver.delete_all_cookies()
+
+    def add(self, *accounts):
+        """Add already registered accounts (e.g. from the registration test)."""
+        now = time.time()
+        with self._locked() as data:
+            pool = self._accounts(data)
+            known = {a["loginname"] for a in pool}
+            for a in accounts:
+                if a["loginname"] not in known:
+                    pool.append({**a, "created": now, "lease": None})
+
+    # -------------------------------
+    # LEASE / RELEASE
+    # -------------------------------
+    def lease(self, owner, provision_missing=True):
+        """Take a free account for `owner`; registers one over HTTP if the pool is dry."""
+        now = time.time()
+        with self._locked() as data:
+            for account in self._accounts(data):
+                lease = account.get("lease")
+                if not lease or lease["until"] < now:
+                    account["lease"] = {"owner": owner, "until": now + self.lease_seconds}
+                    return _public(account)
+        if not provision_missing:
+            return None
+        # Register outside the lock, then add the account already leased: nobody else can take it
+        identity = self.new_identity()
+        self._register_http(identity)
+        now = time.time()
+        with self._locked() as data:
+            self._accounts(data).append({**identity, "created": now,
+                                         "lease": {"owner": owner, "until": now + self.lease_seconds}})
+        return _public(identity)
+
+    def release(self, account, broken=False):
+        """Hand the account back; broken=True drops it from the pool (e.g. it can no longer log in)."""
+        with self._locked() as data:
+            pool = self._accounts(data)
+            for i, a in enumerate(pool):
+                if a["loginname"] == account["loginname"]:
+                    if broken:
+                        del pool[i]
+                    else:
+                        a["lease"] = None
+                    return
+
+    def cleanup(self, max_age_days=None):
+        """Clear expired leases and drop accounts older than max_age_days."""
+        now = time.time()
+        with self._locked() as data:
+            pool = self._accounts(data)
+            if max_age_days is not None:
+                pool[:] = [a for a in pool if now - a.get("created", now) <= max_age_days * 86400]
+            for a in pool:
+                if a.get("lease") and a["lease"]["until"] < now:
+                    a["lease"] = None
+
+    def forget(self):
+        """Drop every account for this base URL (e.g. a local store that is shutting down)."""
+        with self._locked() as data:
+            data.pop(self.base_url, None)
+
+    def status(self):
+        now = time.time()
+        pool = self._accounts(self._load())
+        leased = sum(1 for a in pool if a.get("lease") and a["lease"]["until"] >= now)
+        return {"accounts": len(pool), "leased": leased, "free": len(pool) - leased}
+
+
+def _public(account):
+    return {k: account[k] for k in ("loginname", "password", "email")}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("provision")
+    p.add_argument("-n", "--count", type=int, default=5)
+    p.add_argument("--via", choices=("http", "ui"), default="http")
+    sub.add_parser("status")
+    c = sub.add_parser("cleanup")
+    c.add_argument("--max-age-days", type=float)
+    parser.add_argument("--base-url")
+    args = parser.parse_args(argv)
+
+    pool = AccountPool(base_url=args.base_url)
+    if args.command == "provision":
+        driver = None
+        if args.via == "ui":
+            from utils.browser_startup import new_fast_chrome
+            from utils.driver_pool import remove_profile
+            driver = new_fast_chrome()
+        try:
+            created = pool.provision(args.count, via=args.via, driver=driver)
+        finally:
+            if driver:
+                driver.quit()
+                remove_profile(driver)
+        print(f" Provisioned {len(created)} accounts for {pool.base_url}")
+    elif args.command == "cleanup":
+        pool.cleanup(args.max_age_days)
+    print(f" {pool.status()}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
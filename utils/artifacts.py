@@ -0,0 +1,153 @@
+"""Background writer for debug screenshots and page dumps.
+
+Capturing still has to talk to the browser, but decoding, compression and
+disk I/O happen on a worker thread. Identical captures are stored once
+(content hash), and the directory is kept under a size and age limit.
+"""
+import atexit
+import base64
+import gzip
+import hashlib
+import os
+import queue
+import threading
+import time
+from utils import config
+
+# File types this writer owns (and may evict)
+OWNED_SUFFIXES = (".jpg", ".png", ".html.gz")
+
+
+class ArtifactWriter:
+    def __init__(self, directory, max_mb=None, max_age_hours=None):
+        self.directory = directory
+        self.max_bytes = (config.ARTIFACT_MAX_MB if max_mb is None else max_mb) * 1024 * 1024
+        self.max_age = (config.ARTIFACT_MAX_AGE_HOURS if max_age_hours is None else max_age_hours) * 3600
+        self._queue = queue.Queue()
+        self._seen = {}
+        self._thread = None
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        self._files = self._scan()
+        for _, path, _ in self._files:
+            self._seen[_digest_of(path)] = path
+
+    # -------------------------------
+    # CAPTURE (caller thread)
+    # -------------------------------
+    def screenshot(self, driver, name):
+        """Queue a screenshot; returns the path it will be written to (None if capture failed)."""
+        try:
+            # JPEG straight from Chrome is several times smaller than the PNG
+            data = driver.execute_cdp_cmd("Page.captureScreenshot", {
+                "format": "jpeg", "quality": config.SCREENSHOT_JPEG_QUALITY,
+            })["data"]
+            suffix = ".jpg"
+        except Exception:
+            try:
+                data = driver.get_screenshot_as_base64()
+            except Exception:
+                return None
+            suffix = ".png"
+        return self._submit(name, suffix, data, _decode_b64)
+
+    def page_source(self, driver, name):
+        """Queue a gzip-compressed page dump; returns its future path (None if capture failed)."""
+        try:
+            data = driver.page_source
+        except Exception:
+            return None
+        return self._submit(name, ".html.gz", data, _gzip_text)
+
+    def _submit(self, name, suffix, data, encode):
+        digest = hashlib.sha1(data.encode("utf-8")).hexdigest()[:12]
+        with self._lock:
+            if digest in self._seen:
+                return self._seen[digest]
+            path = os.path.join(self.directory, f"{name}_{int(time.time() * 1000)}_{digest}{suffix}")
+            self._seen[digest] = path
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="artifact-writer", daemon=True)
+                self._thread.start()
+        self._queue.put((path, data, encode))
+        return path
+
+    # -------------------------------
+    # WRITE + EVICT (worker thread)
+    # -------------------------------
+    def _run(self):
+        while True:
+            path, data, encode = self._queue.get()
+            try:
+                blob = encode(data)
+                with open(path, "wb") as f:
+                    f.write(blob)
+                self._files.append((time.time(), path, len(blob)))
+                self._evict()
+            except Exception as e:
+                print(f" Could not write artifact {path}: {e}")
+            finally:
+                self._queue.task_done()
+
+    def _evict(self):
+        now = time.time()
+        self._files.sort()
+        total = sum(size for _, _, size in self._files)
+        while self._files and (total > self.max_bytes or now - self._files[0][0] > self.max_age):
+            _, path, size = self._files.pop(0)
+            total -= size
+            with self._lock:
+                if self._seen.get(_digest_of(path)) == path:
+                    del self._seen[_digest_of(path)]
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _scan(self):
+        files = []
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and entry.name.endswith(OWNED_SUFFIXES):
+                st = entry.stat()
+                files.append((st.st_mtime, entry.path, st.st_size))
+        return files
+
+    def flush(self):
+        self._queue.join()
+
+
+def _digest_of(path):
+    name = os.path.basename(path)
+    for suffix in OWNED_SUFFIXES:
+        if name.endswith(suffix):
+            name = name[:-len(suffix)]
+    return name.rsplit("_", 1)[-1]
+
+
+def _decode_b64(data):
+    return base64.b64decode(data)
+
+
+def _gzip_text(data):
+    return gzip.compress(data.encode("utf-8"), compresslevel=6)
+
+
+_writers = {}
+_writers_lock = threading.Lock()
+
+
+def artifact_writer(directory=None):
+    """Shared writer for a directory (defaults to this worker's artifact directory)."""
+    directory = os.path.abspath(directory or config.ARTIFACT_DIR)
+    with _writers_lock:
+        if directory not in _writers:
+            _writers[directory] = ArtifactWriter(directory)
+        return _writers[directory]
+
+
+def flush_all():
+    for writer in list(_writers.values()):
+        writer.flush()
+
+
+atexit.register(flush_all)
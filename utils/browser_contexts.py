@@ -0,0 +1,236 @@
+"""Many isolated sessions in one Chrome: a browser context per test instead of a browser.
+
+    pool = ContextPool()
+    d = pool.acquire()        # ContextDriver: a WebDriver bound to its own context's tab
+    LoginPage(d).open_login(config.BASE_URL)
+    pool.release(d)           # the context (cookies, storage, cache) is thrown away
+
+Contexts come from DevTools (Target.createBrowserContext / createTarget), so
+they share the browser process but nothing else, like separate incognito
+profiles. Handles made from one chromedriver session share its "current
+window": every command takes that session's lock and switches to the
+handle's tab first, so they take turns. In-page waits (utils/locators.py)
+run in short slices (`wait_slice`) to keep the turns short.
+
+To run sessions side by side, start the browser with launch_shared_chrome()
+and attach one chromedriver session per worker (attach_chrome, or
+ContextPool(address=...)): utils.parallel --contexts runs its pytest
+workers that way, utils.loadgen --contexts its threads.
+"""
+import socket
+import threading
+import time
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.chrome.webdriver import WebDriver as ChromeDriver
+from selenium.webdriver.remote.command import Command
+from selenium.webdriver.remote.mobile import Mobile
+from selenium.webdriver.remote.switch_to import SwitchTo
+from utils import config
+from utils.browser_startup import clone_profile, fast_options, new_fast_chrome
+from utils.driver_pool import enable_network_log, remove_profile
+
+
+# -------------------------------
+# SHARED BROWSER
+# -------------------------------
+def launch_shared_chrome():
+    """Chrome that other processes can attach to; returns (driver, "127.0.0.1:<port>")."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    profile_dir = clone_profile()
+    options = fast_options(profile_dir)
+    options.add_argument(f"--remote-debugging-port={port}")
+    d = webdriver.Chrome(options=options)
+    d._qa_profile_dir = profile_dir
+    return d, f"127.0.0.1:{port}"
+
+
+def attach_chrome(address=None):
+    """A chromedriver session of its own on an already running Chrome (its own current window)."""
+    options = webdriver.ChromeOptions()
+    options.debugger_address = address or config.SHARED_BROWSER
+    options.page_load_strategy = config.PAGE_LOAD_STRATEGY
+    if config.BLOCK_RESOURCES:
+        enable_network_log(options)
+    d = webdriver.Chrome(options=options)
+    d._qa_attached = True
+    return d
+
+
+class ContextDriver(ChromeDriver):
+    """A Chrome WebDriver whose commands run in one browser context's tab."""
+
+    # Seconds per in-page wait script, so other handles get the session in between
+    wait_slice = 0.25
+
+    def __init__(self, browser, context_id, handle):
+        # No new session: share the browser's, with our own SwitchTo/Mobile bound to this handle
+        self.__dict__.update(browser.driver.__dict__)
+        self.__dict__.pop("_qa_profile_dir", None)
+        self._switch_to = SwitchTo(self)
+        self._mobile = Mobile(self)
+        self._browser = browser
+        self.context_id = context_id
+        self.handle = handle
+
+    def execute(self, driver_command, params=None):
+        with self._browser.lock:
+            if driver_command == Command.SWITCH_TO_WINDOW:
+                response = super().execute(driver_command, params)
+                self.handle = self._browser.current = params["handle"]
+                return response
+            self._browser.activate(self.handle)
+            return super().execute(driver_command, params)
+
+    @property
+    def window_handles(self):
+        """Tabs of this context only (the session itself sees every context's tabs)."""
+        with self._browser.lock:
+            mine = self._browser.targets(self.context_id)
+            return [h for h in super().window_handles if h in mine]
+
+    def quit(self):
+        # The browser belongs to the pool; quitting a handle ends its context
+        self._browser.dispose(self.context_id)
+
+
+class ContextBrowser:
+    """One Chrome handing out ContextDriver handles; its first tab stays open to keep the session."""
+
+    def __init__(self, factory=new_fast_chrome):
+        self.driver = factory()
+        self.lock = threading.RLock()
+        self.home = self.current = self.driver.current_window_handle
+        self.stats = {"created": 0, "disposed": 0}
+
+    def activate(self, handle):
+        with self.lock:
+            if self.current != handle:
+                self.driver.switch_to.window(handle)
+                self.current = handle
+
+    def cdp(self, cmd, params=None):
+        """Browser-level DevTools command, sent from the home tab."""
+        with self.lock:
+            self.activate(self.home)
+            return self.driver.execute_cdp_cmd(cmd, params or {})
+
+    def targets(self, context_id):
+        infos = self.cdp("Target.getTargets", {})["targetInfos"]
+        return {t["targetId"] for t in infos if t["type"] == "page" and t.get("browserContextId") == context_id}
+
+    # -------------------------------
+    # CONTEXTS
+    # -------------------------------
+    def _open(self, timeout=5):
+        with self.lock:
+            context_id = self.cdp("Target.createBrowserContext", {})["browserContextId"]
+            target_id = self.cdp("Target.createTarget", {
+                "url": "about:blank", "browserContextId": context_id,
+            })["targetId"]
+            # chromedriver names windows by target id; give it a moment to notice the new one
+            end = time.monotonic() + timeout
+            while target_id not in self.driver.window_handles:
+                if time.monotonic() > end:
+                    self.cdp("Target.disposeBrowserContext", {"browserContextId": context_id})
+                    raise WebDriverException(f"New context tab {target_id} never showed up as a window")
+                time.sleep(0.05)
+            self.stats["created"] += 1
+            return context_id, target_id
+
+    def new_context(self):
+        return ContextDriver(self, *self._open())
+
+    def dispose(self, context_id):
+        """Close the context and every tab in it."""
+        with self.lock:
+            try:
+                self.cdp("Target.disposeBrowserContext", {"browserContextId": context_id})
+                self.stats["disposed"] += 1
+            except WebDriverException as e:
+                print(f" Could not dispose browser context {context_id}: {e}")
+
+    def renew(self, d):
+        """Swap the handle over to a fresh, empty context."""
+        old = d.context_id
+        d.context_id, d.handle = self._open()
+        self.dispose(old)
+
+    def is_alive(self):
+        try:
+            self.cdp("Target.getTargets", {})
+            return True
+        except Exception:
+            return False
+
+    def close(self):
+        if getattr(self.driver, "_qa_attached", False):
+            # The browser belongs to whoever launched it: only stop our chromedriver
+            service = getattr(self.driver, "service", None)
+            if service:
+                service.stop()
+            return
+        try:
+            self.driver.quit()
+        except Exception:
+            pass
+        remove_profile(self.driver)
+
+
+class ContextPool:
+    """DriverPool's interface over one shared browser: every acquire gets a new isolated context.
+
+    With `address` (a browser from launch_shared_chrome), every acquire also gets a
+    chromedriver session of its own, so handles used from different threads do not
+    take turns on one session.
+    """
+
+    def __init__(self, factory=new_fast_chrome, address=None):
+        self.factory = factory
+        self.address = address
+        self._browser = None
+        self._lock = threading.Lock()
+
+    def browser(self):
+        with self._lock:
+            if self._browser is not None and not self._browser.is_alive():
+                print(" Shared browser is gone. Starting a new one.")
+                self._browser.close()
+                self._browser = None
+            if self._browser is None:
+                self._browser = ContextBrowser(self.factory)
+            return self._browser
+
+    def acquire(self):
+        if self.address:
+            return ContextBrowser(lambda: attach_chrome(self.address)).new_context()
+        return self.browser().new_context()
+
+    def release(self, d):
+        try:
+            d.quit()
+        finally:
+            if self.address:
+                d._browser.close()
+
+    def reset(self, d):
+        try:
+            d._browser.renew(d)
+            return True
+        except Exception:
+            return False
+
+    def _discard(self, d):
+        try:
+            self.release(d)
+        except Exception:
+            pass
+
+    def close_all(self):
+        with self._lock:
+            browser, self._browser = self._browser, None
+        if browser:
+            print(f" Browser contexts: {browser.stats['created']} created, {browser.stats['disposed']} disposed")
+            browser.close()
@@ -0,0 +1,230 @@
+"""Faster Chrome startup.
+
+A trimmed user-data-dir (first run done, no sync, no extensions, no component
+updates) is built once and copied for every browser, with reflinks where the
+filesystem supports them. WarmPool keeps a few browsers launched in the
+background so a test usually takes one that is already up.
+"""
+import atexit
+import hashlib
+import json
+import os
+import queue
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from selenium import webdriver
+from utils import config
+from utils.driver_pool import build_options, remove_profile
+
+# Chrome switches that skip work a test never needs
+FAST_FLAGS = [
+    "--no-first-run",
+    "--no-default-browser-check",
+    "--disable-sync",
+    "--disable-extensions",
+    "--disable-component-update",
+    "--disable-background-networking",
+    "--disable-default-apps",
+    "--disable-features=Translate,OptimizationHints,MediaRouter",
+    "--metrics-recording-only",
+    "--password-store=basic",
+]
+
+# Written into Default/Preferences of the template
+PROFILE_PREFS = {
+    "credentials_enable_service": False,
+    "profile": {"password_manager_enabled": False},
+    "browser": {"has_seen_welcome_page": True, "check_default_browser": False},
+    "translate": {"enabled": False},
+    "signin": {"allowed": False},
+}
+
+
+# -------------------------------
+# PROFILE TEMPLATE
+# -------------------------------
+def template_path(base=None):
+    """Template directory; the name changes whenever the prefs do, so stale templates are never reused."""
+    digest = hashlib.sha1(json.dumps(PROFILE_PREFS, sort_keys=True).encode("utf-8")).hexdigest()[:8]
+    return f"{base or config.PROFILE_TEMPLATE_DIR}-{digest}"
+
+
+def build_template(path=None):
+    path = path or template_path()
+    if os.path.isdir(path):
+        return path
+    # Build next to the target and rename, so parallel workers never see a half-written template
+    tmp = tempfile.mkdtemp(prefix=os.path.basename(path) + ".", dir=os.path.dirname(os.path.abspath(path)))
+    os.makedirs(os.path.join(tmp, "Default"))
+    open(os.path.join(tmp, "First Run"), "w").close()
+    with open(os.path.join(tmp, "Default", "Preferences"), "w", encoding="utf-8") as f:
+        json.dump(PROFILE_PREFS, f)
+    with open(os.path.join(tmp, "Local State"), "w", encoding="utf-8") as f:
+        json.dump({"browser": {"enabled_labs_experiments": []}}, f)
+    try:
+        os.rename(tmp, path)
+    except OSError:
+        shutil.rmtree(tmp, ignore_errors=True)   # another worker won the race
+    return path
+
+
+def clone_profile(template=None):
+    """Copy of the template for one browser (copy-on-write where supported)."""
+    template = template or build_template()
+    target = tempfile.mkdtemp(prefix="qa-chrome-")
+    if sys.platform.startswith("linux") and shutil.which("cp"):
+        done = subprocess.run(["cp", "-a", "--reflink=auto", template + "/.", target],
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        if done.returncode == 0:
+            return target
+    shutil.copytree(template, target, dirs_exist_ok=True)
+    return target
+
+
+# -------------------------------
+# LAUNCH
+# -------------------------------
+class StartupStats:
+    """Launch times (cold: launched on demand) and wait times (warm: taken from the warm pool)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples = {"cold": [], "warm": []}
+
+    def add(self, kind, seconds):
+        with self._lock:
+            self.samples[kind].append(seconds * 1000)
+
+    def summary(self):
+        out = {}
+        for kind, values in self.samples.items():
+            if values:
+                out[kind] = {"count": len(values), "avg_ms": round(sum(values) / len(values), 1),
+                             "max_ms": round(max(values), 1)}
+        return out
+
+
+startup_stats = StartupStats()
+
+
+def fast_options(profile_dir):
+    options = build_options()
+    for flag in FAST_FLAGS:
+        options.add_argument(flag)
+    options.add_argument(f"--user-data-dir={profile_dir}")
+    return options
+
+
+def new_fast_chrome():
+    """Chrome on a fresh copy of the trimmed template profile."""
+    profile_dir = clone_profile()
+    try:
+        d = webdriver.Chrome(options=fast_options(profile_dir))
+    except Exception:
+        shutil.rmtree(profile_dir, ignore_errors=True)
+        raise
+    d._qa_profile_dir = profile_dir
+    return d
+
+
+def _timed_launch(factory):
+    start = time.perf_counter()
+    d = factory()
+    return d, time.perf_counter() - start
+
+
+# -------------------------------
+# WARM POOL
+# -------------------------------
+class WarmPool:
+    """Launches `size` browsers in the background; take() is the DriverPool factory.
+
+    Browsers are launched up front and again on prime(), which DriverPool calls
+    before it recycles one, so no spare sits idle while pooled browsers are reused.
+    """
+
+    launch_timeout = 60
+
+    def __init__(self, factory=new_fast_chrome, size=None, stats=None):
+        self.factory = factory
+        self.size = config.WARM_BROWSERS if size is None else size
+        self.stats = stats or startup_stats
+        self._ready = queue.Queue()
+        self._pending = 0
+        self._closed = False
+        self._lock = threading.Lock()
+        self._fill()
+        atexit.register(self.close)
+
+    def take(self):
+        start = time.perf_counter()
+        with self._lock:
+            pending = self._pending
+        try:
+            # A launch already under way finishes sooner than a new one would
+            d = self._ready.get(timeout=self.launch_timeout) if pending else self._ready.get_nowait()
+        except queue.Empty:
+            d = None
+        if d is None or isinstance(d, Exception):
+            # Nothing warm, or the background launch failed: launch here (and raise if it fails again)
+            d, seconds = _timed_launch(self.factory)
+            self.stats.add("cold", seconds)
+        else:
+            self.stats.add("warm", time.perf_counter() - start)
+        return d
+
+    __call__ = take
+
+    def prime(self):
+        """Start launching the next browser(s) now, ahead of a take()."""
+        self._fill()
+
+    def _fill(self):
+        with self._lock:
+            missing = self.size - self._ready.qsize() - self._pending
+            if self._closed or missing <= 0:
+                return
+            self._pending += missing
+        for _ in range(missing):
+            threading.Thread(target=self._launch, name="warm-browser", daemon=True).start()
+
+    def _launch(self):
+        try:
+            d, seconds = _timed_launch(self.factory)
+        except Exception as e:
+            print(f" Warm browser failed to start: {e}")
+            with self._lock:
+                self._pending -= 1
+            # Wake a take() waiting on this launch instead of leaving it to time out
+            self._ready.put(e)
+            return
+        with self._lock:
+            self._pending -= 1
+            closed = self._closed
+        if closed:
+            _quit(d)
+        else:
+            self._ready.put(d)
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+        while True:
+            try:
+                d = self._ready.get_nowait()
+            except queue.Empty:
+                return
+            if not isinstance(d, Exception):
+                _quit(d)
+
+
+def _quit(d):
+    try:
+        d.quit()
+    except Exception:
+        pass
+    remove_profile(d)
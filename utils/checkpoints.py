@@ -0,0 +1,168 @@
+"""Checkpoints: browser state saved after an expensive step and restored later.
+
+    state = checkpoints.ensure(driver, "cart_with_product", [ProductPage, CartPage],
+                               build=add_product_through_ui,
+                               validate=lambda d: CartPage(d).snapshot().lines)
+
+The first caller runs `build` and captures cookies, local/session storage and
+the URL. Later callers get that state restored into their browser instead.
+The key covers the checkpoint name, the base URL and the source of the page
+objects involved, so editing those classes or switching sites invalidates
+it. A restored checkpoint that fails `validate` (e.g. the server session has
+expired) is dropped and rebuilt.
+"""
+import hashlib
+import inspect
+import json
+import os
+import threading
+import time
+from urllib.parse import urlsplit
+from utils import config
+
+_STORAGE_JS = """
+var dump = function (s) { var o = {}; for (var i = 0; i < s.length; i++) o[s.key(i)] = s.getItem(s.key(i)); return o; };
+return {url: location.href, local: dump(localStorage), session: dump(sessionStorage)};
+"""
+
+# Runs before the page's own scripts, and only on the checkpoint's origin
+_RESTORE_STORAGE_JS = """
+(function (origin, local, session) {
+    if (location.origin !== origin) return;
+    for (var k in local) localStorage.setItem(k, local[k]);
+    for (var k in session) sessionStorage.setItem(k, session[k]);
+})(%s, %s, %s);
+"""
+
+
+def checkpoint_key(name, page_classes, base_url=None):
+    h = hashlib.sha1()
+    h.update(json.dumps([name, (base_url or config.BASE_URL).rstrip("/")]).encode("utf-8"))
+    for cls in page_classes:
+        try:
+            h.update(inspect.getsource(cls).encode("utf-8"))
+        except (OSError, TypeError):
+            h.update(cls.__qualname__.encode("utf-8"))
+    return f"{name}-{h.hexdigest()[:16]}"
+
+
+class CheckpointStore:
+    def __init__(self, directory=None, ttl_minutes=None, enabled=None):
+        self.directory = directory or config.CHECKPOINT_DIR
+        self.ttl = (config.CHECKPOINT_TTL_MINUTES if ttl_minutes is None else ttl_minutes) * 60
+        self.enabled = config.CHECKPOINTS if enabled is None else enabled
+        self.stats = {"restored": 0, "built": 0, "invalid": 0}
+        self._lock = threading.Lock()
+
+    # -------------------------------
+    # CAPTURE / RESTORE
+    # -------------------------------
+    def capture(self, driver, key):
+        try:
+            cookies = driver.execute_cdp_cmd("Network.getAllCookies", {})["cookies"]
+        except Exception:
+            cookies = driver.get_cookies()
+        if getattr(driver, "is_browserless", False):
+            # No scripts run, so there is no web storage to save
+            state = {"url": driver.current_url, "local": {}, "session": {}}
+        else:
+            state = driver.execute_script(_STORAGE_JS)
+        state.update({"cookies": cookies, "created": time.time()})
+        self._write(key, state)
+        return state
+
+    def restore(self, driver, state):
+        """Load cookies and storage into the browser and open the checkpoint URL."""
+        url = state["url"]
+        parts = urlsplit(url)
+        origin = f"{parts.scheme}://{parts.netloc}"
+        script_id = None
+        try:
+            driver.execute_cdp_cmd("Network.setCookies", {"cookies": [_cdp_cookie(c) for c in state["cookies"]]})
+            if state["local"] or state["session"]:
+                script_id = driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {
+                    "source": _RESTORE_STORAGE_JS % (json.dumps(origin), json.dumps(state["local"]),
+                                                     json.dumps(state["session"])),
+                })["identifier"]
+            driver.get(url)
+        except Exception:
+            # No CDP: cookies and storage can only be set on an open document of the origin
+            driver.get(f"{origin}/robots.txt")
+            for c in state["cookies"]:
+                driver.add_cookie({k: c[k] for k in ("name", "value", "path", "domain", "secure") if k in c})
+            if state["local"] or state["session"]:
+                driver.execute_script(_RESTORE_STORAGE_JS % (json.dumps(origin), json.dumps(state["local"]),
+                                                             json.dumps(state["session"])))
+            driver.get(url)
+        finally:
+            if script_id:
+                # Pooled browsers must not carry the script into later tests
+                try:
+                    driver.execute_cdp_cmd("Page.removeScriptToEvaluateOnNewDocument", {"identifier": script_id})
+                except Exception:
+                    pass
+
+    def ensure(self, driver, name, page_classes, build, validate=None):
+        """Restore checkpoint `name` or run build(driver) and capture it. Returns "restored" or "built"."""
+        key = checkpoint_key(name, page_classes)
+        state = self._read(key) if self.enabled else None
+        if state:
+            self.restore(driver, state)
+            if validate is None or validate(driver):
+                print(f" Checkpoint '{name}' restored.")
+                self._count("restored")
+                return "restored"
+            print(f" Checkpoint '{name}' no longer valid. Rebuilding.")
+            self._count("invalid")
+            self.discard(key)
+        build(driver)
+        if self.enabled:
+            self.capture(driver, key)
+        self._count("built")
+        return "built"
+
+    # -------------------------------
+    # STORAGE
+    # -------------------------------
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _read(self, key):
+        try:
+            with open(self._path(key), encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if time.time() - state.get("created", 0) > self.ttl:
+            self.discard(key)
+            return None
+        return state
+
+    def _write(self, key, state):
+        os.makedirs(self.directory, exist_ok=True)
+        tmp = f"{self._path(key)}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp, self._path(key))
+
+    def discard(self, key):
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def _count(self, what):
+        with self._lock:
+            self.stats[what] += 1
+
+
+def _cdp_cookie(c):
+    cookie = {k: c[k] for k in ("name", "value", "domain", "path", "secure", "httpOnly", "sameSite") if k in c}
+    if c.get("expires", -1) > 0:
+        cookie["expires"] = c["expires"]
+    elif c.get("expiry"):
+        cookie["expires"] = c["expiry"]
+    return cookie
+
+
+checkpoints = CheckpointStore()
@@ -16,3 +16,96 @@ HEADLESS = os.getenv("HEADLESS", "False") == "True"
 
 # Default timeout for waits
 DEFAULT_TIMEOUT = 15
+
+# Recycle a pooled browser after this many tests (0 = a new browser for every test)
+POOL_MAX_USES = int(os.getenv("POOL_MAX_USES", "20"))
+
+# Parallel runs: each worker gets its own id and artifact directory
+WORKER_ID = os.getenv("WORKER_ID", "")
+ARTIFACT_DIR = os.path.join("reports_screenshots", WORKER_ID) if WORKER_ID else "reports_screenshots"
+
+# Per-test durations from previous runs (used to schedule parallel runs)
+DURATIONS_FILE = os.getenv("DURATIONS_FILE", ".test_durations.json")
+
+# Remember which fallback locator won last time and try it first
+LOCATOR_CACHE = os.getenv("LOCATOR_CACHE", "True") == "True"
+LOCATOR_CACHE_FILE = os.getenv("LOCATOR_CACHE_FILE", ".locator_cache.json")
+LOCATOR_CACHE_TTL_DAYS = float(os.getenv("LOCATOR_CACHE_TTL_DAYS", "7"))
+
+# Local stand-in store (utils/local_store.py) instead of the public site
+LOCAL_SITE = os.getenv("LOCAL_SITE", "False") == "True"
+LOCAL_SITE_PORT = int(os.getenv("LOCAL_SITE_PORT", "0"))
+LOCAL_SITE_LATENCY_MS = int(os.getenv("LOCAL_SITE_LATENCY_MS", "0"))
+
+# Benchmark regression budgets (percent over the stored baseline)
+BENCH_TIME_BUDGET_PCT = float(os.getenv("BENCH_TIME_BUDGET_PCT", "25"))
+BENCH_COMMAND_BUDGET_PCT = float(os.getenv("BENCH_COMMAND_BUDGET_PCT", "0"))
+BENCH_BYTES_BUDGET_PCT = float(os.getenv("BENCH_BYTES_BUDGET_PCT", "25"))
+
+# Time and count WebDriver commands per page-object method (per-test JSON + HTML report)
+PROFILE_COMMANDS = os.getenv("PROFILE_COMMANDS", "True") == "True"
+
+# Debug artifacts: JPEG screenshot quality and directory limits (oldest evicted first)
+SCREENSHOT_JPEG_QUALITY = int(os.getenv("SCREENSHOT_JPEG_QUALITY", "70"))
+ARTIFACT_MAX_MB = float(os.getenv("ARTIFACT_MAX_MB", "200"))
+ARTIFACT_MAX_AGE_HOURS = float(os.getenv("ARTIFACT_MAX_AGE_HOURS", "72"))
+
+# Browser startup: trimmed profile template (copied per browser) and browsers kept pre-launched
+PROFILE_TEMPLATE_DIR = os.getenv("PROFILE_TEMPLATE_DIR", ".chrome_profile_template")
+WARM_BROWSERS = int(os.getenv("WARM_BROWSERS", "1"))
+
+# Drop requests no page object looks at (Chrome network blocking); types and hosts are comma-separated
+BLOCK_RESOURCES = os.getenv("BLOCK_RESOURCES", "True") == "True"
+BLOCK_RESOURCE_TYPES = os.getenv("BLOCK_RESOURCE_TYPES", "image,font,media")
+BLOCK_HOSTS = os.getenv("BLOCK_HOSTS", "googletagmanager.com,google-analytics.com,doubleclick.net,facebook.net,hotjar.com")
+RESOURCE_SIZES_FILE = os.getenv("RESOURCE_SIZES_FILE", ".resource_sizes.json")
+
+# Navigation returns at DOMContentLoaded ("eager") and page objects wait for their own READY contract
+PAGE_LOAD_STRATEGY = os.getenv("PAGE_LOAD_STRATEGY", "eager")
+READINESS_STATS = os.getenv("READINESS_STATS", "True") == "True"
+
+# Browser-side page timings per run (JSONL time series) and the baseline they are compared with
+PERF_TIMING = os.getenv("PERF_TIMING", "True") == "True"
+PERF_TIMING_FILE = os.getenv("PERF_TIMING_FILE", ".perf_timing.jsonl")
+PERF_BASELINE_FILE = os.getenv("PERF_BASELINE_FILE", "perf_baseline.json")
+PERF_BUDGET_PCT = float(os.getenv("PERF_BUDGET_PCT", "30"))
+
+# Browser memory/CPU and page metrics per test (samples at page-object steps and test end),
+# per-test peaks appended to RESOURCE_USAGE_FILE. Budgets apply to the peaks (0 = none);
+# RESOURCE_BUDGET_ACTION "warn" reports tests over budget, "fail" fails them
+RESOURCE_USAGE = os.getenv("RESOURCE_USAGE", "True") == "True"
+RESOURCE_USAGE_FILE = os.getenv("RESOURCE_USAGE_FILE", ".resource_usage.jsonl")
+RESOURCE_BUDGET_RSS_MB = float(os.getenv("RESOURCE_BUDGET_RSS_MB", "0"))
+RESOURCE_BUDGET_CPU_S = float(os.getenv("RESOURCE_BUDGET_CPU_S", "0"))
+RESOURCE_BUDGET_JS_HEAP_MB = float(os.getenv("RESOURCE_BUDGET_JS_HEAP_MB", "0"))
+RESOURCE_BUDGET_DOM_NODES = int(os.getenv("RESOURCE_BUDGET_DOM_NODES", "0"))
+RESOURCE_BUDGET_LAYOUTS = int(os.getenv("RESOURCE_BUDGET_LAYOUTS", "0"))
+RESOURCE_BUDGET_ACTION = os.getenv("RESOURCE_BUDGET_ACTION", "warn")
+
+# Checkpoints of browser state after expensive steps (server sessions expire, so keep the TTL short)
+CHECKPOINTS = os.getenv("CHECKPOINTS", "True") == "True"
+CHECKPOINT_DIR = os.getenv("CHECKPOINT_DIR", ".checkpoints")
+CHECKPOINT_TTL_MINUTES = float(os.getenv("CHECKPOINT_TTL_MINUTES", "30"))
+
+# Pool of pre-registered accounts leased to tests (utils/account_pool.py)
+ACCOUNT_POOL_FILE = os.getenv("ACCOUNT_POOL_FILE", ".accounts.json")
+ACCOUNT_LEASE_MINUTES = float(os.getenv("ACCOUNT_LEASE_MINUTES", "30"))
+ACCOUNT_POOL_PASSWORD = os.getenv("ACCOUNT_POOL_PASSWORD", "Password123")
+
+# Overall time budget per test; every wait gets only what is left (0 = no limit)
+TEST_DEADLINE_SECONDS = float(os.getenv("TEST_DEADLINE_SECONDS", "180"))
+
+# Smoke mode: page objects drive utils/html_driver.py (HTTP client + HTML parser) instead of Chrome
+BROWSERLESS = os.getenv("BROWSERLESS", "False") == "True"
+
+# One Chrome for the whole session, each test in its own isolated browser context (utils/browser_contexts.py)
+BROWSER_CONTEXTS = os.getenv("BROWSER_CONTEXTS", "False") == "True"
+# host:port of a Chrome started by utils.parallel --contexts; the contexts attach to it instead of launching one
+SHARED_BROWSER = os.getenv("SHARED_BROWSER", "")
+
+# Change-aware test selection: dependencies recorded per test, and the git ref to select against
+# (CHANGED_SINCE empty = the commit the map was recorded at). Recording profiles every call: off unless asked for
+RECORD_DEPS = os.getenv("RECORD_DEPS", "False") == "True"
+DEPS_FILE = os.getenv("DEPS_FILE", ".test_deps.json")
+SELECT_CHANGED = os.getenv("SELECT_CHANGED", "False") == "True"
+CHANGED_SINCE = os.getenv("CHANGED_SINCE", "")
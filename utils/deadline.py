@@ -0,0 +1,75 @@
+"""One time budget for a whole test or flow, shared by every wait in it.
+
+    with deadline_scope(60):
+        cart.go_to_cart()
+        checkout.continue_payment()   # each wait gets min(its own timeout, what is left)
+
+Page objects ask budget(cap) for their wait time instead of using a fixed
+timeout, so a slow step eats into the next one rather than stacking on top.
+Asking once the budget is gone raises DeadlineExceeded.
+Page objects can also be given their own Deadline.
+"""
+import threading
+import time
+from contextlib import contextmanager
+from selenium.common.exceptions import TimeoutException
+
+
+class DeadlineExceeded(TimeoutException):
+    pass
+
+
+class Deadline:
+    def __init__(self, seconds=None):
+        self.seconds = seconds
+        self.end = time.monotonic() + seconds if seconds else None
+
+    def remaining(self, cap=None):
+        """Seconds left, capped at `cap` (never negative). Without an end, just `cap`."""
+        if self.end is None:
+            return cap
+        left = max(0.0, self.end - time.monotonic())
+        return left if cap is None else min(cap, left)
+
+    @property
+    def expired(self):
+        return self.end is not None and time.monotonic() >= self.end
+
+    def check(self, what="flow"):
+        if self.expired:
+            raise DeadlineExceeded(f"{what}: {self.seconds:g}s budget used up")
+
+
+_UNLIMITED = Deadline()
+_local = threading.local()
+
+
+def current():
+    """The deadline of the innermost deadline_scope on this thread (unlimited outside one)."""
+    stack = getattr(_local, "stack", None)
+    return stack[-1] if stack else _UNLIMITED
+
+
+@contextmanager
+def deadline_scope(seconds):
+    """Run the block under a budget; nested scopes can only shorten it."""
+    outer = current()
+    scope = Deadline(seconds)
+    if outer.end is not None and (scope.end is None or outer.end < scope.end):
+        scope = outer
+    _local.stack = getattr(_local, "stack", []) + [scope]
+    try:
+        yield scope
+    finally:
+        _local.stack = _local.stack[:-1]
+
+
+def budget(cap, deadline=None):
+    """Timeout for the next wait: `cap`, or less if the deadline is closer.
+
+    Raises DeadlineExceeded once the budget is used up, so the test reports
+    the deadline rather than whichever element it was about to wait for.
+    """
+    deadline = deadline or current()
+    deadline.check("deadline")
+    return deadline.remaining(cap)
@@ -0,0 +1,163 @@
+import shutil
+import threading
+from urllib.parse import urlsplit
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from utils import config
+from utils.locators import restore_script_timeout
+
+
+def build_options():
+    options = Options()
+    options.page_load_strategy = config.PAGE_LOAD_STRATEGY
+    if config.HEADLESS:
+        options.add_argument("--headless=new")
+    options.add_argument("--start-maximized")
+
+    # Disable autofill and password manager
+    prefs = {
+        "credentials_enable_service": False,
+        "profile.password_manager_enabled": False
+    }
+    options.add_experimental_option("prefs", prefs)
+
+    if config.BLOCK_RESOURCES:
+        enable_network_log(options)
+    return options
+
+
+def enable_network_log(options):
+    """Network events for utils/network_blocking.py (blocked requests per test), nothing else."""
+    options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    options.add_experimental_option("perfLoggingPrefs", {"enableNetwork": True, "enablePage": False})
+
+
+def new_chrome():
+    return webdriver.Chrome(options=build_options())
+
+
+def remove_profile(d):
+    """Delete the throwaway user-data-dir a browser was started with, if any."""
+    path = getattr(d, "_qa_profile_dir", None)
+    if path:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def visited_origins(d):
+    """http(s) origins in the current tab's history (DevTools Page.getNavigationHistory)."""
+    try:
+        entries = d.execute_cdp_cmd("Page.getNavigationHistory", {})["entries"]
+    except Exception:
+        entries = [{"url": d.current_url}]
+    origins = set()
+    for entry in entries:
+        parts = urlsplit(entry.get("url", ""))
+        if parts.scheme in ("http", "https") and parts.netloc:
+            origins.add(f"{parts.scheme}://{parts.netloc}")
+    return origins
+
+
+class DriverPool:
+    """Keeps browsers alive across tests and hands them out with a clean state."""
+
+    def __init__(self, factory=new_chrome, max_uses=None):
+        self.factory = factory
+        self.max_uses = config.POOL_MAX_USES if max_uses is None else max_uses
+        self._idle = []
+        self._uses = {}
+        self._lock = threading.Lock()
+
+    # -------------------------------
+    # ACQUIRE / RELEASE
+    # -------------------------------
+    def acquire(self):
+        while True:
+            with self._lock:
+                d = self._idle.pop() if self._idle else None
+            if d is None:
+                d = self.factory()
+                self._uses[id(d)] = 0
+                return d
+            if self._is_alive(d):
+                return d
+            # Browser crashed while idle — replace it
+            self._discard(d)
+
+    def release(self, d):
+        self._uses[id(d)] = self._uses.get(id(d), 0) + 1
+        if self._uses[id(d)] >= self.max_uses:
+            print(f" Recycling browser after {self.max_uses} uses.")
+            self._discard(d)
+            return
+        if not self.reset(d):
+            print(" Browser could not be reset. Recycling it.")
+            self._discard(d)
+            return
+        if self._uses[id(d)] == self.max_uses - 1:
+            # Last use coming up: a warm factory (utils/browser_startup.py) launches the replacement meanwhile
+            prime = getattr(self.factory, "prime", None)
+            if prime:
+                prime()
+        with self._lock:
+            self._idle.append(d)
+
+    def close_all(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for d in idle:
+            self._discard(d)
+
+    # -------------------------------
+    # STATE RESET
+    # -------------------------------
+    def reset(self, d):
+        """Swap to a fresh tab, wipe cookies and storage. Returns False if the browser is unusable."""
+        try:
+            # Every origin the test's tabs went through, read before the tabs go
+            handles = d.window_handles
+            origins = set()
+            for h in handles:
+                d.switch_to.window(h)
+                origins |= visited_origins(d)
+
+            # sessionStorage belongs to a tab (per origin), so a new tab starts without any
+            d.switch_to.new_window("tab")
+            fresh = d.current_window_handle
+            for h in handles:
+                d.switch_to.window(h)
+                d.close()
+            d.switch_to.window(fresh)
+
+            # Cart contents live in the server-side session, so dropping the
+            # session cookie empties the cart as well.
+            try:
+                d.execute_cdp_cmd("Network.clearBrowserCookies", {})
+                for origin in sorted(origins):
+                    d.execute_cdp_cmd("Storage.clearDataForOrigin", {
+                        "origin": origin,
+                        "storage_types": "local_storage,indexeddb,cache_storage,service_workers",
+                    })
+            except Exception:
+                d.delete_all_cookies()
+
+            d.implicitly_wait(0)
+            restore_script_timeout(d)
+            d.get("about:blank")
+            return True
+        except Exception:
+            return False
+
+    def _is_alive(self, d):
+        try:
+            d.current_url
+            return True
+        except Exception:
+            return False
+
+    def _discard(self, d):
+        self._uses.pop(id(d), None)
+        try:
+            d.quit()
+        except Exception:
+            pass
+        remove_profile(d)
@@ -0,0 +1,157 @@
+"""Fill whole forms in one script call.
+
+    fill_fields(driver, {
+        "email": ([(By.ID, "email"), (By.NAME, "email")], "a@b.com"),
+        "country": ([(By.NAME, "country_id")], "Sri Lanka"),   # <select>: by visible text
+    })
+
+Every field gets its value, selects are matched by visible text, and the
+input/change events a user would trigger are dispatched. Fields listed in
+`type_keys` are only located in the page and then typed with send_keys, for
+widgets that react to individual keystrokes.
+"""
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.common.by import By
+from utils.locators import LOCATOR_JS, as_pairs, first_static
+
+_FILL_JS = LOCATOR_JS + r"""
+var fields = arguments[0], verify = arguments[1], out = {};
+function setNative(el, value) {
+    var proto = el.tagName === 'TEXTAREA' ? HTMLTextAreaElement.prototype : HTMLInputElement.prototype;
+    var desc = Object.getOwnPropertyDescriptor(proto, 'value');
+    if (desc && desc.set) desc.set.call(el, value); else el.value = value;
+}
+function pickOption(sel, text) {
+    var want = String(text).trim().toLowerCase(), fallback = null;
+    for (var i = 0; i < sel.options.length; i++) {
+        var o = sel.options[i], label = o.text.trim().toLowerCase();
+        if (label === want || o.value === String(text)) return o;
+        if (!fallback && want && label.indexOf(want) !== -1) fallback = o;
+    }
+    return fallback;
+}
+function readBack(el) {
+    if (el.tagName === 'SELECT') return el.selectedIndex >= 0 ? el.options[el.selectedIndex].text.trim() : '';
+    if (el.type === 'checkbox' || el.type === 'radio') return el.checked;
+    return el.value;
+}
+for (var key in fields) {
+    var f = fields[key], found = qaFirst(f.candidates, true, true, false);
+    if (!found) { out[key] = {found: false}; continue; }
+    var el = found[0], res = {found: true, index: found[1]};
+    if (f.type_keys) { res.element = el; out[key] = res; continue; }
+    if (el.tagName === 'SELECT') {
+        var opt = pickOption(el, f.value);
+        if (!opt) { res.found = false; res.error = 'no option ' + f.value; out[key] = res; continue; }
+        el.value = opt.value;
+    } else if (el.type === 'checkbox' || el.type === 'radio') {
+        el.checked = !!f.value;
+    } else {
+        el.focus();
+        setNative(el, f.value);
+    }
+    el.dispatchEvent(new Event('input', {bubbles: true}));
+    el.dispatchEvent(new Event('change', {bubbles: true}));
+    if (el.blur) el.blur();
+    if (verify) res.value = readBack(el);
+    out[key] = res;
+}
+return out;
+"""
+
+
+def fill_fields(driver, fields, verify=False, type_keys=()):
+    """Fill {key: (candidates, value)} in one call; returns {key: True/False}.
+
+    With verify=True each field's value is read back and compared (selects by
+    option text), and a mismatch counts as a failure.
+    """
+    payload = {
+        key: {"candidates": as_pairs(candidates), "value": value, "type_keys": key in type_keys}
+        for key, (candidates, value) in fields.items()
+    }
+    try:
+        if getattr(driver, "is_browserless", False):
+            found = _fill_static(driver, payload, verify)
+        else:
+            found = driver.execute_script(_FILL_JS, payload, verify) or {}
+    except WebDriverException as e:
+        print(f" Bulk fill failed: {e}")
+        return {key: False for key in fields}
+
+    results = {}
+    for key, (candidates, value) in fields.items():
+        res = found.get(key) or {}
+        ok = bool(res.get("found"))
+        if ok and key in type_keys:
+            el = res["element"]
+            el.clear()
+            el.send_keys(str(value))
+            if verify:
+                res["value"] = el.get_attribute("value")
+        if ok and verify and not _matches(res.get("value"), value):
+            print(f" Field '{key}' reads back {res.get('value')!r}, expected {value!r}")
+            ok = False
+        if not ok:
+            print(f" Field '{key}' could not be filled. {res.get('error', '')}".rstrip())
+        results[key] = ok
+    return results
+
+
+def _fill_static(driver, payload, verify):
+    """_FILL_JS through the element API, for drivers without JavaScript (utils/html_driver.py)."""
+    out = {}
+    for key, f in payload.items():
+        found = first_static(driver, f["candidates"], True, True)
+        if not found:
+            out[key] = {"found": False}
+            continue
+        el, index = found
+        res = out[key] = {"found": True, "index": index}
+        kind = (el.get_attribute("type") or "").lower()
+        if f["type_keys"]:
+            res["element"] = el
+            continue
+        if el.tag_name == "select":
+            option = _pick_option(el, f["value"])
+            if option is None:
+                res.update(found=False, error=f"no option {f['value']}")
+                continue
+            option.click()
+        elif kind in ("checkbox", "radio"):
+            if el.is_selected() != bool(f["value"]):
+                el.click()
+        else:
+            el.clear()
+            el.send_keys(str(f["value"]))
+        if verify:
+            res["value"] = _read_back(el, kind)
+    return out
+
+
+def _pick_option(select, text):
+    # Same rule as pickOption: exact label or value, else the first label containing the text
+    want, fallback = str(text).strip().lower(), None
+    for option in select.find_elements(By.TAG_NAME, "option"):
+        label = option.text.strip().lower()
+        if label == want or option.get_attribute("value") == str(text):
+            return option
+        if fallback is None and want and want in label:
+            fallback = option
+    return fallback
+
+
+def _read_back(el, kind):
+    if el.tag_name == "select":
+        chosen = [o for o in el.find_elements(By.TAG_NAME, "option") if o.is_selected()]
+        return chosen[0].text.strip() if chosen else ""
+    if kind in ("checkbox", "radio"):
+        return el.is_selected()
+    return el.get_attribute("value")
+
+
+def _matches(actual, expected):
+    if isinstance(actual, bool):
+        return actual == bool(expected)
+    actual, expected = str(actual or "").strip().lower(), str(expected).strip().lower()
+    return actual == expected or (bool(expected) and expected in actual)
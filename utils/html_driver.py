@@ -0,0 +1,996 @@
+"""Browserless driver: the part of the WebDriver API the page objects use, over HTTP.
+
+    driver = HtmlDriver()
+    LoginPage(driver).open_login(config.BASE_URL)
+
+Pages are fetched with urllib (one cookie jar per driver) and parsed with
+html.parser; no JavaScript runs and no images, styles or scripts are
+downloaded. Elements support find_element(s) by CSS/XPath/ID/NAME/tag,
+.text, get_attribute, send_keys, clear and click (links navigate, submit
+buttons post their form, radios/checkboxes/options change state).
+Helpers that normally run a script in the page (utils/locators.py,
+utils/forms.py, CartPage.snapshot) check `is_browserless` and use the
+element API instead. Anything that needs a real browser raises
+WebDriverException, like a driver without that capability would.
+"""
+import re
+import urllib.error
+import urllib.parse
+import urllib.request
+from html.parser import HTMLParser
+from http.cookiejar import Cookie, CookieJar
+from selenium.common.exceptions import (
+    InvalidSelectorException, NoSuchElementException, StaleElementReferenceException,
+    WebDriverException,
+)
+from selenium.webdriver.common.by import By
+
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta",
+             "param", "source", "track", "wbr"}
+# Never rendered, so never displayed and no part of .text
+HIDDEN_TAGS = {"head", "script", "style", "title", "meta", "link", "template", "noscript"}
+BLOCK_TAGS = {"address", "article", "aside", "blockquote", "div", "dl", "dt", "dd", "fieldset",
+              "footer", "form", "h1", "h2", "h3", "h4", "h5", "h6", "header", "hr", "li", "main",
+              "nav", "ol", "p", "pre", "section", "table", "tbody", "thead", "tfoot", "tr", "ul"}
+SUBMIT_TYPES = {"submit", "image"}
+USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64) qa-html-driver"
+
+
+# -------------------------------
+# DOCUMENT
+# -------------------------------
+class Node:
+    def __init__(self, tag, attrs=None, parent=None):
+        self.tag = tag
+        self.attrs = attrs or {}
+        self.parent = parent
+        self.children = []   # Node or str
+        self.state = {}      # value / checked / selected changed by the test
+
+    def elements(self):
+        return [c for c in self.children if isinstance(c, Node)]
+
+    def descendants(self):
+        for c in self.children:
+            if isinstance(c, Node):
+                yield c
+                yield from c.descendants()
+
+    def ancestors(self):
+        node = self.parent
+        while node is not None:
+            yield node
+            node = node.parent
+
+    def root(self):
+        node = self
+        while node.parent is not None:
+            node = node.parent
+        return node
+
+    def text_content(self):
+        return "".join(c if isinstance(c, str) else c.text_content() for c in self.children)
+
+    def classes(self):
+        return self.attrs.get("class", "").split()
+
+
+class _TreeBuilder(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.document = Node("#document")
+        self._open = [self.document]
+
+    def handle_starttag(self, tag, attrs):
+        node = Node(tag, {k: (v if v is not None else "") for k, v in attrs}, self._open[-1])
+        self._open[-1].children.append(node)
+        if tag not in VOID_TAGS:
+            self._open.append(node)
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS:
+            self._open.pop()
+
+    def handle_endtag(self, tag):
+        # Pop to the matching open tag; stray end tags are ignored
+        for i in range(len(self._open) - 1, 0, -1):
+            if self._open[i].tag == tag:
+                del self._open[i:]
+                return
+
+    def handle_data(self, data):
+        self._open[-1].children.append(data)
+
+
+def parse_html(html):
+    builder = _TreeBuilder()
+    builder.feed(html)
+    builder.close()
+    return builder.document
+
+
+def _collapse(text):
+    return re.sub(r"\s+", " ", text).strip()
+
+
+def visible_text(node):
+    """Rendered text like WebDriver's .text: hidden parts skipped, one line per block."""
+    parts = []
+
+    def walk(n):
+        for c in n.children:
+            if isinstance(c, str):
+                parts.append(c)
+            elif c.tag == "br":
+                parts.append("\n")
+            elif is_displayed(c, check_ancestors=False):
+                if c.tag in BLOCK_TAGS:
+                    parts.append("\n")
+                walk(c)
+                if c.tag in BLOCK_TAGS:
+                    parts.append("\n")
+                elif c.tag in ("td", "th"):
+                    parts.append(" ")
+
+    if not is_displayed(node):
+        return ""
+    walk(node)
+    lines = (_collapse(line) for line in "".join(parts).split("\n"))
+    return "\n".join(line for line in lines if line)
+
+
+def _style_hides(node):
+    style = node.attrs.get("style", "").replace(" ", "").lower()
+    return "display:none" in style or "visibility:hidden" in style
+
+
+def is_displayed(node, check_ancestors=True):
+    nodes = [node] + (list(node.ancestors()) if check_ancestors else [])
+    for n in nodes:
+        if n.tag in HIDDEN_TAGS or "hidden" in n.attrs or _style_hides(n):
+            return False
+    if node.tag == "input" and node.attrs.get("type", "").lower() == "hidden":
+        return False
+    return True
+
+
+# -------------------------------
+# CSS SELECTORS (the subset the page objects use)
+# -------------------------------
+_CSS_TOKEN = re.compile(r"""
+    (?P<tag>\*|[a-zA-Z][\w-]*)
+  | \#(?P<id>[\w-]+)
+  | \.(?P<cls>[\w-]+)
+  | \[\s*(?P<attr>[\w-]+)\s*(?:(?P<op>[*^$~|]?=)\s*(?P<val>"[^"]*"|'[^']*'|[^\]\s]+)\s*)?\]
+  | :(?P<pseudo>[\w-]+)(?:\((?P<arg>[^)]*)\))?
+""", re.X)
+
+
+def _split_top(text, sep):
+    """Split on `sep` outside brackets, parentheses and quotes."""
+    out, depth, quote, start = [], 0, None, 0
+    for i, ch in enumerate(text):
+        if quote:
+            quote = None if ch == quote else quote
+        elif ch in "'\"":
+            quote = ch
+        elif ch in "[(":
+            depth += 1
+        elif ch in "])":
+            depth -= 1
+        elif ch == sep and depth == 0:
+            out.append(text[start:i])
+            start = i + 1
+    out.append(text[start:])
+    return out
+
+
+def _parse_compound(text, selector):
+    parts, pos = [], 0
+    while pos < len(text):
+        m = _CSS_TOKEN.match(text, pos)
+        if not m or m.end() == pos:
+            raise InvalidSelectorException(f"Unsupported CSS selector: {selector}")
+        if m.group("tag") and pos:
+            raise InvalidSelectorException(f"Unsupported CSS selector: {selector}")
+        parts.append(m.groupdict())
+        pos = m.end()
+    return parts
+
+
+def parse_css(selector):
+    """[[(combinator, compound), ...], ...]: one chain per comma-separated group."""
+    groups = []
+    for group in _split_top(selector, ","):
+        spaced = re.sub(r"\s*>\s*", " > ", group.strip())
+        tokens = [t for t in _split_top(spaced, " ") if t]
+        if not tokens:
+            raise InvalidSelectorException(f"Empty CSS selector: {selector}")
+        chain, combinator = [], " "
+        for token in tokens:
+            if token == ">":
+                combinator = ">"
+                continue
+            chain.append((combinator, _parse_compound(token, selector)))
+            combinator = " "
+        groups.append(chain)
+    return groups
+
+
+def _match_part(node, p):
+    if p["tag"]:
+        return p["tag"] == "*" or node.tag == p["tag"].lower()
+    if p["id"]:
+        return node.attrs.get("id") == p["id"]
+    if p["cls"]:
+        return p["cls"] in node.classes()
+    if p["attr"]:
+        name = p["attr"].lower()
+        if name not in node.attrs:
+            return False
+        if not p["op"]:
+            return True
+        actual, want = node.attrs[name], p["val"].strip("'\"")
+        op = p["op"]
+        if op == "=":
+            return actual == want
+        if op == "*=":
+            return bool(want) and want in actual
+        if op == "^=":
+            return bool(want) and actual.startswith(want)
+        if op == "$=":
+            return bool(want) and actual.endswith(want)
+        if op == "~=":
+            return want in actual.split()
+        return actual == want or actual.startswith(want + "-")
+    pseudo = p["pseudo"]
+    siblings = node.parent.elements() if node.parent else [node]
+    if pseudo == "nth-child":
+        return siblings.index(node) + 1 == int(p["arg"])
+    if pseudo == "first-child":
+        return siblings[0] is node
+    if pseudo == "last-child":
+        return siblings[-1] is node
+    raise InvalidSelectorException(f"Unsupported CSS pseudo-class :{pseudo}")
+
+
+def _match_chain(node, chain):
+    combinator, compound = chain[-1]
+    if not all(_match_part(node, p) for p in compound):
+        return False
+    if len(chain) == 1:
+        return True
+    rest = chain[:-1]
+    if combinator == ">":
+        return node.parent is not None and _match_chain(node.parent, rest)
+    return any(_match_chain(a, rest) for a in node.ancestors())
+
+
+def select_css(root, selector):
+    groups = parse_css(selector)
+    return [n for n in root.descendants() if any(_match_chain(n, chain) for chain in groups)]
+
+
+# -------------------------------
+# XPATH (the subset the page objects use)
+# -------------------------------
+_XPATH_TOKEN = re.compile(r"""\s*(?:
+    (?P<str>"[^"]*"|'[^']*')
+  | (?P<num>\d+(?:\.\d+)?)
+  | (?P<op>//|/|\[|\]|\(|\)|,|@|!=|=|\*|\.\.|\.|\|)
+  | (?P<name>[a-zA-Z_][\w.-]*)
+)""", re.X)
+
+
+def _tokenize_xpath(expr):
+    tokens, pos = [], 0
+    expr = expr.strip()
+    while pos < len(expr):
+        m = _XPATH_TOKEN.match(expr, pos)
+        if not m or m.end() == pos:
+            raise InvalidSelectorException(f"Unsupported XPath: {expr}")
+        kind = m.lastgroup
+        tokens.append((kind, m.group(kind)))
+        pos = m.end()
+    return tokens
+
+
+class _XPathParser:
+    def __init__(self, expr):
+        self.expr = expr
+        self.tokens = _tokenize_xpath(expr)
+        self.pos = 0
+
+    def peek(self, offset=0):
+        i = self.pos + offset
+        return self.tokens[i] if i < len(self.tokens) else (None, None)
+
+    def take(self, value=None):
+        tok = self.peek()
+        if tok[0] is None or (value is not None and tok[1] != value):
+            raise InvalidSelectorException(f"Unsupported XPath: {self.expr}")
+        self.pos += 1
+        return tok
+
+    def parse(self):
+        path = self.path()
+        if self.peek()[0] is not None:
+            raise InvalidSelectorException(f"Unsupported XPath: {self.expr}")
+        return path
+
+    def path(self):
+        """('path', absolute, [(axis, test, [predicates]), ...])"""
+        absolute, steps, axis = False, [], "/"
+        if self.peek()[1] in ("/", "//"):
+            absolute, axis = True, self.take()[1]
+        while True:
+            steps.append(self.step(axis))
+            if self.peek()[1] not in ("/", "//"):
+                return ("path", absolute, steps)
+            axis = self.take()[1]
+
+    def step(self, axis):
+        kind, value = self.take()
+        if value == "@":
+            return (axis, "@" + self.take()[1], [])
+        if value in (".", ".."):
+            test = value
+        elif value == "*":
+            test = "*"
+        elif kind == "name":
+            test = value.lower()
+            if self.peek()[1] == "(":
+                self.take("(")
+                self.take(")")
+                test = value + "()"
+        else:
+            raise InvalidSelectorException(f"Unsupported XPath: {self.expr}")
+        predicates = []
+        while self.peek()[1] == "[":
+            self.take("[")
+            predicates.append(self.or_expr())
+            self.take("]")
+        return (axis, test, predicates)
+
+    def or_expr(self):
+        left = self.and_expr()
+        while self.peek() == ("name", "or"):
+            self.take()
+            left = ("or", left, self.and_expr())
+        return left
+
+    def and_expr(self):
+        left = self.eq_expr()
+        while self.peek() == ("name", "and"):
+            self.take()
+            left = ("and", left, self.eq_expr())
+        return left
+
+    def eq_expr(self):
+        left = self.primary()
+        while self.peek()[1] in ("=", "!="):
+            op = self.take()[1]
+            left = (op, left, self.primary())
+        return left
+
+    def primary(self):
+        kind, value = self.peek()
+        if kind == "str":
+            self.take()
+            return ("lit", value[1:-1])
+        if kind == "num":
+            self.take()
+            return ("num", float(value))
+        if value == "(":
+            self.take()
+            inner = self.or_expr()
+            self.take(")")
+            return inner
+        if kind == "name" and self.peek(1)[1] == "(" and value not in ("text", "node"):
+            self.take()
+            self.take("(")
+            args = []
+            while self.peek()[1] != ")":
+                args.append(self.or_expr())
+                if self.peek()[1] == ",":
+                    self.take()
+            self.take(")")
+            return ("fn", value, args)
+        return self.path()
+
+
+def _string(value):
+    if isinstance(value, list):
+        if not value:
+            return ""
+        first = value[0]
+        return first if isinstance(first, str) else first.text_content()
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, float):
+        return str(int(value)) if value.is_integer() else str(value)
+    return value
+
+
+def _step(node, axis, test):
+    """Candidate groups for one location step; positions in predicates count within a group."""
+    if test == ".":
+        return [[node]]
+    if test == "..":
+        return [[node.parent] if node.parent is not None else []]
+    if test.startswith("@"):
+        name = test[1:].lower()
+        return [[node.attrs[name]] if name in node.attrs else []]
+    # a//b is a/descendant-or-self::node()/b: one group per element on the way down
+    holders = [node] + list(node.descendants()) if axis == "//" else [node]
+    groups = []
+    for h in holders:
+        if test == "text()":
+            groups.append([c for c in h.children if isinstance(c, str)])
+        else:
+            groups.append([c for c in h.elements() if test in ("*", "node()") or c.tag == test])
+    return groups
+
+
+def _eval_path(path, context):
+    _, absolute, steps = path
+    nodes = [context.root()] if absolute else [context]
+    for axis, test, predicates in steps:
+        result, seen = [], set()
+        for node in nodes:
+            if not isinstance(node, Node):
+                continue
+            for group in _step(node, axis, test):
+                for predicate in predicates:
+                    group = [n for i, n in enumerate(group) if _predicate(predicate, n, i + 1, len(group))]
+                for n in group:
+                    if isinstance(n, Node):
+                        if id(n) in seen:
+                            continue
+                        seen.add(id(n))
+                    result.append(n)
+        nodes = result
+    return nodes
+
+
+def _predicate(expr, node, position, size):
+    value = _eval(expr, node, position, size)
+    if isinstance(value, float):
+        return value == position
+    return bool(value)
+
+
+def _eval(expr, node, position, size):
+    kind = expr[0]
+    if kind == "lit":
+        return expr[1]
+    if kind == "num":
+        return expr[1]
+    if kind == "path":
+        if not isinstance(node, Node):
+            # text() node as context: "." is its own string
+            return [node] if expr[2][0][1] == "." else []
+        return _eval_path(expr, node)
+    if kind in ("and", "or"):
+        left = bool(_eval(expr[1], node, position, size))
+        if kind == "and" and not left:
+            return False
+        if kind == "or" and left:
+            return True
+        return bool(_eval(expr[2], node, position, size))
+    if kind in ("=", "!="):
+        left, right = _eval(expr[1], node, position, size), _eval(expr[2], node, position, size)
+        lefts = [_string([v]) for v in left] if isinstance(left, list) else [left]
+        rights = [_string([v]) for v in right] if isinstance(right, list) else [right]
+        for a in lefts:
+            for b in rights:
+                if isinstance(a, float) or isinstance(b, float):
+                    try:
+                        equal = float(a) == float(b)
+                    except ValueError:
+                        equal = False
+                else:
+                    equal = _string(a) == _string(b)
+                if equal == (kind == "="):
+                    return True
+        return False
+    if kind == "fn":
+        return _call(expr[1], [_eval(a, node, position, size) for a in expr[2]], node, position, size)
+    raise InvalidSelectorException(f"Unsupported XPath expression {kind}")
+
+
+def _call(name, args, node, position, size):
+    s = [_string(a) for a in args]
+    if name == "contains":
+        return s[1] in s[0]
+    if name == "starts-with":
+        return s[0].startswith(s[1])
+    if name == "normalize-space":
+        return _collapse(s[0] if args else _string([node]))
+    if name == "translate":
+        table = {ord(a): (s[2][i] if i < len(s[2]) else None) for i, a in enumerate(s[1])}
+        return s[0].translate(table)
+    if name == "not":
+        return not bool(args[0])
+    if name == "string":
+        return s[0] if args else _string([node])
+    if name == "concat":
+        return "".join(s)
+    if name == "position":
+        return float(position)
+    if name == "last":
+        return float(size)
+    if name == "count":
+        return float(len(args[0]))
+    raise InvalidSelectorException(f"Unsupported XPath function {name}()")
+
+
+def select_xpath(context, expr):
+    found = {id(n) for n in _eval_path(_XPathParser(expr).parse(), context) if isinstance(n, Node)}
+    # Results come back in document order, like a browser's
+    return [n for n in context.root().descendants() if id(n) in found]
+
+
+def find_all(root, by, value):
+    if by == By.CSS_SELECTOR:
+        return select_css(root, value)
+    if by == By.XPATH:
+        return select_xpath(root, value)
+    if by == By.ID:
+        return [n for n in root.descendants() if n.attrs.get("id") == value]
+    if by == By.NAME:
+        return [n for n in root.descendants() if n.attrs.get("name") == value]
+    if by == By.TAG_NAME:
+        return [n for n in root.descendants() if n.tag == value.lower()]
+    if by == By.CLASS_NAME:
+        return [n for n in root.descendants() if value in n.classes()]
+    if by in (By.LINK_TEXT, By.PARTIAL_LINK_TEXT):
+        links = [n for n in root.descendants() if n.tag == "a"]
+        if by == By.LINK_TEXT:
+            return [n for n in links if visible_text(n) == value]
+        return [n for n in links if value in visible_text(n)]
+    raise InvalidSelectorException(f"Unsupported locator strategy: {by}")
+
+
+# -------------------------------
+# ELEMENTS
+# -------------------------------
+class HtmlElement:
+    def __init__(self, driver, node):
+        self._driver = driver
+        self._node = node
+
+    def __eq__(self, other):
+        return isinstance(other, HtmlElement) and other._node is self._node
+
+    def __hash__(self):
+        return id(self._node)
+
+    def __repr__(self):
+        return f"<HtmlElement {self._node.tag} {self._node.attrs}>"
+
+    @property
+    def id(self):
+        return str(id(self._node))
+
+    @property
+    def parent(self):
+        return self._driver
+
+    def _live(self):
+        if self._node.root() is not self._driver._document:
+            raise StaleElementReferenceException("Element is not attached to the current page")
+        return self._node
+
+    # -------------------------------
+    # READ
+    # -------------------------------
+    @property
+    def tag_name(self):
+        return self._node.tag
+
+    @property
+    def text(self):
+        return visible_text(self._live())
+
+    def _type(self):
+        return self._node.attrs.get("type", "text" if self._node.tag == "input" else "").lower()
+
+    def _value(self):
+        node = self._node
+        if "value" in node.state:
+            return node.state["value"]
+        if node.tag == "textarea":
+            return node.text_content()
+        if node.tag == "select":
+            selected = _selected_options(node)
+            return _option_value(selected[0]) if selected else ""
+        if node.tag == "option":
+            return _option_value(node)
+        if self._type() in ("checkbox", "radio"):
+            return node.attrs.get("value", "on")
+        return node.attrs.get("value", "")
+
+    def get_attribute(self, name):
+        node = self._node
+        if name == "value":
+            return self._value()
+        if name in ("checked", "selected"):
+            return "true" if self.is_selected() else None
+        if name in ("innerText", "textContent"):
+            return self.text if name == "innerText" else node.text_content()
+        if name in ("href", "src", "action") and name in node.attrs:
+            return urllib.parse.urljoin(self._driver.current_url, node.attrs[name])
+        if name == "disabled":
+            return "true" if "disabled" in node.attrs else None
+        return node.attrs.get(name.lower())
+
+    def get_dom_attribute(self, name):
+        return self._node.attrs.get(name.lower())
+
+    def get_property(self, name):
+        return self.get_attribute(name)
+
+    def is_displayed(self):
+        return is_displayed(self._live())
+
+    def is_enabled(self):
+        node = self._node
+        if "disabled" in node.attrs:
+            return False
+        return not any(a.tag == "fieldset" and "disabled" in a.attrs for a in node.ancestors())
+
+    def is_selected(self):
+        node = self._node
+        if node.tag == "option":
+            return node in _selected_options(_owner_select(node)) if _owner_select(node) else False
+        if "checked" in node.state:
+            return node.state["checked"]
+        return "checked" in node.attrs
+
+    # -------------------------------
+    # FIND
+    # -------------------------------
+    def find_elements(self, by=By.ID, value=None):
+        return [HtmlElement(self._driver, n) for n in find_all(self._live(), by, value)]
+
+    def find_element(self, by=By.ID, value=None):
+        found = self.find_elements(by, value)
+        if not found:
+            raise NoSuchElementException(f"No element for {by}={value!r}")
+        return found[0]
+
+    # -------------------------------
+    # INTERACT
+    # -------------------------------
+    def clear(self):
+        self._live().state["value"] = ""
+
+    def send_keys(self, *values):
+        node = self._live()
+        if node.tag not in ("input", "textarea") or self._type() in ("checkbox", "radio", "submit", "button"):
+            raise WebDriverException(f"Element <{node.tag}> does not accept text")
+        node.state["value"] = self._value() + "".join(str(v) for v in values)
+
+    def click(self):
+        node = self._live()
+        kind = self._type()
+        if node.tag == "option":
+            select = _owner_select(node)
+            if select is not None:
+                multiple = "multiple" in select.attrs
+                for o in _options(select):
+                    if o is node:
+                        o.state["selected"] = not o.state.get("selected", "selected" in o.attrs) if multiple else True
+                    elif not multiple:
+                        o.state["selected"] = False
+            return
+        if node.tag == "input" and kind == "checkbox":
+            node.state["checked"] = not self.is_selected()
+            return
+        if node.tag == "input" and kind == "radio":
+            form = _owner_form(node)
+            scope = form if form is not None else node.root()
+            for other in scope.descendants():
+                if other.tag == "input" and other.attrs.get("name") == node.attrs.get("name") \
+                        and other.attrs.get("type", "").lower() == "radio":
+                    other.state["checked"] = other is node
+            return
+        if node.tag == "label":
+            target = _label_target(node)
+            if target is not None:
+                HtmlElement(self._driver, target).click()
+            return
+        if (node.tag == "button" and kind in ("", "submit")) or (node.tag == "input" and kind in SUBMIT_TYPES):
+            form = _owner_form(node)
+            if form is not None:
+                self._driver._submit(form, node)
+            return
+        link = node if node.tag == "a" else next((a for a in node.ancestors() if a.tag == "a"), None)
+        if link is not None:
+            href = link.attrs.get("href", "")
+            if href and not href.startswith(("#", "javascript:")):
+                self._driver.get(urllib.parse.urljoin(self._driver.current_url, href))
+
+    def submit(self):
+        node = self._live()
+        form = node if node.tag == "form" else _owner_form(node)
+        if form is None:
+            raise WebDriverException("Element is not in a form")
+        self._driver._submit(form, None)
+
+
+def _owner_form(node):
+    form_id = node.attrs.get("form")
+    if form_id:
+        return next((n for n in node.root().descendants() if n.tag == "form" and n.attrs.get("id") == form_id), None)
+    return next((a for a in node.ancestors() if a.tag == "form"), None)
+
+
+def _owner_select(option):
+    return next((a for a in option.ancestors() if a.tag == "select"), None)
+
+
+def _options(select):
+    return [n for n in select.descendants() if n.tag == "option"]
+
+
+def _option_value(option):
+    return option.attrs["value"] if "value" in option.attrs else _collapse(option.text_content())
+
+
+def _selected_options(select):
+    options = _options(select)
+    chosen = [o for o in options if o.state.get("selected", "selected" in o.attrs)]
+    if chosen or "multiple" in select.attrs:
+        return chosen if "multiple" in select.attrs else chosen[-1:]
+    # A single select with nothing marked shows its first option
+    return options[:1]
+
+
+def _label_target(label):
+    target_id = label.attrs.get("for")
+    if target_id:
+        return next((n for n in label.root().descendants() if n.attrs.get("id") == target_id), None)
+    return next((n for n in label.descendants() if n.tag in ("input", "select", "textarea", "button")), None)
+
+
+def form_data(form, submitter=None):
+    """(name, value) pairs a browser would send for `form`."""
+    data = []
+    for node in form.root().descendants():
+        if node.tag not in ("input", "select", "textarea", "button") or _owner_form(node) is not form:
+            continue
+        name = node.attrs.get("name")
+        if not name or "disabled" in node.attrs:
+            continue
+        el = HtmlElement(None, node)
+        kind = el._type()
+        if node.tag == "button" or kind in SUBMIT_TYPES | {"button", "reset"}:
+            if node is submitter and kind not in ("button", "reset"):
+                data.append((name, node.attrs.get("value", "")))
+        elif kind in ("checkbox", "radio"):
+            if el.is_selected():
+                data.append((name, node.attrs.get("value", "on")))
+        elif kind == "file":
+            continue
+        elif node.tag == "select":
+            data += [(name, _option_value(o)) for o in _selected_options(node)]
+        else:
+            data.append((name, el._value()))
+    return data
+
+
+# -------------------------------
+# DRIVER
+# -------------------------------
+class _SwitchTo:
+    def __init__(self, driver):
+        self._driver = driver
+
+    def window(self, handle):
+        if handle not in self._driver.window_handles:
+            raise WebDriverException(f"No such window: {handle}")
+
+    def new_window(self, type_hint=None):
+        # Single window: a "new" one is the same window, blank
+        self._driver._load("about:blank", "")
+
+    def default_content(self):
+        pass
+
+    @property
+    def active_element(self):
+        return HtmlElement(self._driver, self._driver._body())
+
+
+class HtmlDriver:
+    """WebDriver-shaped client for server-rendered pages. One instance = one cookie jar."""
+
+    is_browserless = True
+    name = "html"
+
+    def __init__(self, timeout=30):
+        self.timeout = timeout
+        self.session_id = "html"
+        self.cookie_jar = CookieJar()
+        self._opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(self.cookie_jar))
+        self._opener.addheaders = [("User-Agent", USER_AGENT)]
+        self._url = "about:blank"
+        self._html = ""
+        self._document = parse_html("")
+        self.switch_to = _SwitchTo(self)
+        self.requests = 0
+
+    # -------------------------------
+    # NAVIGATION
+    # -------------------------------
+    def get(self, url):
+        if url.startswith("about:"):
+            self._load(url, "<html><head></head><body></body></html>")
+            return
+        self._request(urllib.request.Request(url))
+
+    def refresh(self):
+        if self._url.startswith("http"):
+            self.get(self._url)
+
+    def _submit(self, form, submitter):
+        action = (submitter.attrs.get("formaction") if submitter is not None else None) or form.attrs.get("action", "")
+        url = urllib.parse.urljoin(self._url, action) if action else self._url
+        method = ((submitter.attrs.get("formmethod") if submitter is not None else None)
+                  or form.attrs.get("method", "get")).lower()
+        body = urllib.parse.urlencode(form_data(form, submitter))
+        if method == "post":
+            self._request(urllib.request.Request(url, data=body.encode("utf-8"), headers={
+                "Content-Type": "application/x-www-form-urlencoded",
+            }))
+        else:
+            # GET forms replace the action's query string
+            self._request(urllib.request.Request(urllib.parse.urlsplit(url)._replace(query=body).geturl()))
+
+    def _request(self, req):
+        if self._url.startswith("http"):
+            req.add_header("Referer", self._url)
+        try:
+            with self._opener.open(req, timeout=self.timeout) as resp:
+                url, body, ctype = resp.geturl(), resp.read(), resp.headers.get("Content-Type", "")
+        except urllib.error.HTTPError as e:
+            # Error pages are still pages
+            url, body, ctype = e.geturl(), e.read(), e.headers.get("Content-Type", "")
+        except (urllib.error.URLError, OSError) as e:
+            raise WebDriverException(f"Could not load {req.full_url}: {e}")
+        self.requests += 1
+        charset = re.search(r"charset=([\w-]+)", ctype)
+        text = body.decode(charset.group(1) if charset else "utf-8", errors="replace")
+        if "html" not in ctype and ctype:
+            text = f"<html><head></head><body><pre>{_escape(text)}</pre></body></html>"
+        self._load(url, text)
+
+    def _load(self, url, html):
+        self._url = url
+        self._html = html
+        self._document = parse_html(html)
+
+    def _body(self):
+        return next((n for n in self._document.descendants() if n.tag == "body"), self._document)
+
+    @property
+    def current_url(self):
+        return self._url
+
+    @property
+    def page_source(self):
+        return self._html
+
+    @property
+    def title(self):
+        node = next((n for n in self._document.descendants() if n.tag == "title"), None)
+        return _collapse(node.text_content()) if node else ""
+
+    # -------------------------------
+    # FIND
+    # -------------------------------
+    def find_elements(self, by=By.ID, value=None):
+        return [HtmlElement(self, n) for n in find_all(self._document, by, value)]
+
+    def find_element(self, by=By.ID, value=None):
+        found = self.find_elements(by, value)
+        if not found:
+            raise NoSuchElementException(f"No element for {by}={value!r}")
+        return found[0]
+
+    # -------------------------------
+    # SCRIPTS (a few no-JS equivalents; everything else is unsupported)
+    # -------------------------------
+    def execute_script(self, script, *args):
+        s = re.sub(r"\s+", "", script)
+        if "scrollIntoView" in s or s.startswith("try{localStorage.clear()"):
+            return None
+        if s.rstrip(";") == "arguments[0].click()":
+            return args[0].click()
+        if s.rstrip(";") in ("arguments[0].value=''", 'arguments[0].value=""'):
+            return args[0].clear()
+        if s.rstrip(";") == "returnlocation.origin":
+            parts = urllib.parse.urlsplit(self._url)
+            return f"{parts.scheme}://{parts.netloc}" if parts.netloc else "null"
+        if s.rstrip(";") == "returndocument.readyState":
+            return "complete"
+        raise WebDriverException("HtmlDriver does not run JavaScript")
+
+    def execute_async_script(self, script, *args):
+        raise WebDriverException("HtmlDriver does not run JavaScript")
+
+    def execute_cdp_cmd(self, cmd, cmd_args):
+        raise WebDriverException("HtmlDriver has no DevTools protocol")
+
+    def get_log(self, log_type):
+        raise WebDriverException("HtmlDriver keeps no browser logs")
+
+    def get_screenshot_as_base64(self):
+        raise WebDriverException("HtmlDriver cannot take screenshots")
+
+    # -------------------------------
+    # COOKIES
+    # -------------------------------
+    def get_cookies(self):
+        return [{
+            "name": c.name, "value": c.value, "domain": c.domain, "path": c.path,
+            "secure": bool(c.secure), "httpOnly": bool(c.has_nonstandard_attr("HttpOnly")),
+            **({"expiry": int(c.expires)} if c.expires else {}),
+        } for c in self.cookie_jar]
+
+    def get_cookie(self, name):
+        return next((c for c in self.get_cookies() if c["name"] == name), None)
+
+    def add_cookie(self, cookie):
+        host = urllib.parse.urlsplit(self._url).hostname
+        domain = cookie.get("domain") or host
+        if not domain:
+            raise WebDriverException("Cookies can only be added on an open page")
+        expiry = cookie.get("expiry")
+        self.cookie_jar.set_cookie(Cookie(
+            0, cookie["name"], str(cookie["value"]), None, False, domain, bool(cookie.get("domain")),
+            domain.startswith("."), cookie.get("path", "/"), True, bool(cookie.get("secure")),
+            int(expiry) if expiry else None, expiry is None, None, None,
+            {"HttpOnly": None} if cookie.get("httpOnly") else {},
+        ))
+
+    def delete_cookie(self, name):
+        for c in [c for c in self.cookie_jar if c.name == name]:
+            self.cookie_jar.clear(c.domain, c.path, c.name)
+
+    def delete_all_cookies(self):
+        self.cookie_jar.clear()
+
+    # -------------------------------
+    # SESSION (single window, nothing to tune)
+    # -------------------------------
+    @property
+    def window_handles(self):
+        return ["html"]
+
+    @property
+    def current_window_handle(self):
+        return "html"
+
+    def implicitly_wait(self, seconds):
+        pass
+
+    def set_script_timeout(self, seconds):
+        pass
+
+    def set_page_load_timeout(self, seconds):
+        pass
+
+    def close(self):
+        self._load("about:blank", "")
+
+    def quit(self):
+        self._load("about:blank", "")
+        self._opener.close()
+
+
+def _escape(text):
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
@@ -0,0 +1,233 @@
+"""Put load on a store by running the guest checkout flow in many browsers.
+
+    python -m utils.loadgen -n 4 --duration 120 --ramp-up 20 --base-url https://staging.example.com
+    python -m utils.loadgen -n 2 --iterations 10 --local-site --latency-ms 50
+    python -m utils.loadgen -n 20 --duration 60 --contexts     # 20 sessions, one Chrome
+
+Every browser repeats ProductPage -> CartPage -> CheckoutPage -> OrderSuccessPage
+with the same page objects the tests use. Each step's latency and failures
+are collected; the report gives p50/p95/p99 and the error rate per step.
+"""
+import argparse
+import json
+import math
+import os
+import sys
+import threading
+import time
+
+from pages.cart_page import CartPage
+from pages.checkout_page import CheckoutPage
+from pages.order_success_page import OrderSuccessPage
+from pages.product_page import ProductPage
+from utils import config
+from utils.browser_contexts import ContextPool, launch_shared_chrome
+from utils.browser_startup import new_fast_chrome
+from utils.deadline import deadline_scope
+from utils.driver_pool import DriverPool, remove_profile
+from utils.local_store import LocalStore
+
+
+class Flow:
+    """Page objects for one browser; steps are its methods."""
+
+    def __init__(self, driver, product_id=50):
+        self.product_id = product_id
+        self.product = ProductPage(driver)
+        self.cart = CartPage(driver)
+        self.checkout = CheckoutPage(driver)
+        self.success = OrderSuccessPage(driver)
+
+
+# (step name, call) in flow order; a step fails if it raises or returns False
+STEPS = [
+    ("open_product", lambda f: f.product.open_product(f.product_id) is not None),
+    ("click_add_to_cart", lambda f: f.product.click_add_to_cart()),
+    ("go_to_cart", lambda f: f.cart.go_to_cart()),
+    ("click_checkout", lambda f: f.cart.click_checkout()),
+    ("choose_guest_checkout", lambda f: f.checkout.choose_guest_checkout()),
+    ("fill_billing", lambda f: f.checkout.fill_billing()),
+    ("continue_shipping", lambda f: f.checkout.continue_shipping()),
+    ("continue_payment", lambda f: f.checkout.continue_payment()),
+    ("confirm_order", lambda f: f.checkout.confirm_order()),
+    ("is_success", lambda f: f.success.is_success()),
+]
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of an unsorted list."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[rank - 1]
+
+
+class LoadStats:
+    def __init__(self, step_names):
+        self._lock = threading.Lock()
+        self.steps = {name: {"ms": [], "errors": 0} for name in step_names}
+        self.flows = {"ms": [], "errors": 0}
+
+    def record(self, name, ms, ok):
+        with self._lock:
+            entry = self.flows if name is None else self.steps[name]
+            if ok:
+                entry["ms"].append(ms)
+            else:
+                entry["errors"] += 1
+
+    def report(self):
+        out = {}
+        with self._lock:
+            rows = list(self.steps.items()) + [("flow", self.flows)]
+            for name, e in rows:
+                total = len(e["ms"]) + e["errors"]
+                if not total:
+                    continue
+                out[name] = {
+                    "count": total,
+                    "errors": e["errors"],
+                    "error_rate": round(e["errors"] / total, 4),
+                    "p50_ms": _round(percentile(e["ms"], 50)),
+                    "p95_ms": _round(percentile(e["ms"], 95)),
+                    "p99_ms": _round(percentile(e["ms"], 99)),
+                }
+        return out
+
+
+def _round(value):
+    return None if value is None else round(value, 1)
+
+
+# -------------------------------
+# RUNNING
+# -------------------------------
+def run_flow(flow, steps, stats, budget=None):
+    """One pass through the steps, all sharing `budget` seconds; stops at the first failing step."""
+    flow_start = time.perf_counter()
+    with deadline_scope(budget):
+        for name, call in steps:
+            start = time.perf_counter()
+            try:
+                ok = call(flow) is not False
+            except Exception as e:
+                print(f" Step {name} failed: {str(e).splitlines()[0] if str(e) else type(e).__name__}")
+                ok = False
+            stats.record(name, (time.perf_counter() - start) * 1000, ok)
+            if not ok:
+                stats.record(None, 0, False)
+                return False
+    stats.record(None, (time.perf_counter() - flow_start) * 1000, True)
+    return True
+
+
+def run_load(workers, iterations=None, duration=None, ramp_up=0.0, factory=new_fast_chrome,
+             steps=STEPS, make_flow=Flow, flow_budget=None, contexts=False):
+    """Run the flow in `workers` browsers until `iterations` flows are done or `duration` seconds pass.
+
+    With `contexts`, the workers are isolated browser contexts inside a single browser,
+    each driven through its own chromedriver session so they do not wait for one another.
+    """
+    stats = LoadStats([name for name, _ in steps])
+    shared = None
+    if contexts:
+        shared, address = launch_shared_chrome()
+        pool = ContextPool(address=address)
+    else:
+        pool = DriverPool(factory=factory, max_uses=10 ** 9)
+    deadline = time.monotonic() + duration if duration else None
+    remaining = [iterations]
+    lock = threading.Lock()
+
+    def take_iteration():
+        if deadline and time.monotonic() >= deadline:
+            return False
+        with lock:
+            if remaining[0] is None:
+                return True
+            if remaining[0] <= 0:
+                return False
+            remaining[0] -= 1
+            return True
+
+    def worker(index):
+        # Ramp-up: browsers join one after another over `ramp_up` seconds
+        time.sleep(ramp_up * index / workers)
+        try:
+            driver = pool.acquire()
+        except Exception as e:
+            print(f" [browser {index}] could not start: {e}")
+            return
+        try:
+            while take_iteration():
+                run_flow(make_flow(driver), steps, stats, flow_budget)
+                if not pool.reset(driver):
+                    print(f" [browser {index}] could not be reset, stopping it.")
+                    return
+        finally:
+            pool._discard(driver)
+
+    threads = [threading.Thread(target=worker, args=(i,), name=f"load-{i}") for i in range(workers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    pool.close_all()
+    if shared:
+        shared.quit()
+        remove_profile(shared)
+    return stats.report()
+
+
+def print_report(report):
+    print(f" {'step':<24}{'count':>7}{'errors':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for name, r in report.items():
+        cells = [f"{r[k]:>10.1f}" if r[k] is not None else f"{'-':>10}" for k in ("p50_ms", "p95_ms", "p99_ms")]
+        print(f" {name:<24}{r['count']:>7}{r['errors']:>8}{''.join(cells)}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--browsers", type=int, default=2)
+    parser.add_argument("--iterations", type=int, help="total checkout flows to run")
+    parser.add_argument("--duration", type=float, help="seconds to keep the load up")
+    parser.add_argument("--ramp-up", type=float, default=0.0, help="seconds over which browsers join")
+    parser.add_argument("--flow-budget", type=float, help="seconds one checkout flow may take in total")
+    parser.add_argument("--base-url", help="store to load (default: config BASE_URL)")
+    parser.add_argument("--local-site", action="store_true", help="run against the local stand-in store")
+    parser.add_argument("--latency-ms", type=int, default=0, help="latency for the local store")
+    parser.add_argument("--contexts", action="store_true",
+                        help="one browser; each of the -n sessions gets its own browser context")
+    parser.add_argument("--output", default=os.path.join(config.ARTIFACT_DIR, "loadgen.json"))
+    args = parser.parse_args(argv)
+    if not args.iterations and not args.duration:
+        args.iterations = args.browsers
+
+    store = None
+    if args.local_site:
+        store = LocalStore(port=0, latency_ms=args.latency_ms).start()
+        config.BASE_URL = store.url
+    elif args.base_url:
+        config.BASE_URL = args.base_url.rstrip("/")
+
+    print(f" Load: {args.browsers} {'contexts in one browser' if args.contexts else 'browsers'} against {config.BASE_URL} "
+          f"({f'{args.iterations} flows' if args.iterations else f'{args.duration:g}s'}, "
+          f"ramp-up {args.ramp_up:g}s)")
+    try:
+        report = run_load(args.browsers, iterations=args.iterations, duration=args.duration,
+                          ramp_up=args.ramp_up, flow_budget=args.flow_budget, contexts=args.contexts)
+    finally:
+        if store:
+            store.stop()
+
+    print_report(report)
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f" Report written to {args.output}")
+    return 1 if report.get("flow", {}).get("errors") else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,575 @@
+"""Local stand-in for automationteststore.com.
+
+Reproduces the pages, forms and flows the page objects touch: login, account
+creation, product pages with options, the cart, the guest checkout steps and
+the order success page. Markup follows the live store closely enough for the
+page-object locators to match.
+
+    python -m utils.local_store --port 8000 --latency-ms 50
+"""
+import argparse
+import hashlib
+import html
+import secrets
+import struct
+import threading
+import time
+import urllib.parse
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from utils import config
+
+PRODUCTS = {
+    50: {"name": "Skinsheen Bronzer Stick", "model": "SBS-50", "price": 29.50,
+         "options": {"1": ("Color", [("7", "Light Bronze"), ("8", "Dark Bronze")])}},
+    51: {"name": "BeneFit Girl Meets Pearl", "model": "BGMP-51", "price": 30.00, "options": {}},
+    52: {"name": "Benefit Bella Bamba", "model": "BBB-52", "price": 28.00, "options": {}},
+}
+
+COUNTRIES = [("222", "United Kingdom"), ("223", "United States"), ("195", "Sri Lanka")]
+ZONES = [("3513", "Aberdeen"), ("3613", "California"), ("2932", "Western")]
+
+STYLE_CSS = b"""
+body { font-family: sans-serif; margin: 0; }
+#header { background: #333; color: #fff; padding: 10px; }
+#header a { color: #fff; }
+#content { padding: 20px; }
+.alert-danger { color: #b00; }
+.alert-success { color: #080; }
+"""
+
+
+def _noise_png(size=64):
+    """Deterministic noisy PNG so the product image costs real bytes to fetch."""
+    rows = b""
+    seed = b"product"
+    for y in range(size):
+        line = b""
+        while len(line) < size * 3:
+            seed = hashlib.sha256(seed).digest()
+            line += seed
+        rows += b"\x00" + line[:size * 3]
+
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    return (b"\x89PNG\r\n\x1a\n"
+            + chunk(b"IHDR", struct.pack(">IIBBBBB", size, size, 8, 2, 0, 0, 0))
+            + chunk(b"IDAT", zlib.compress(rows, 9))
+            + chunk(b"IEND", b""))
+
+
+PRODUCT_PNG = _noise_png()
+
+
+def _e(value):
+    return html.escape(str(value), quote=True)
+
+
+def _money(value):
+    return f"${value:,.2f}"
+
+
+class LocalStore:
+    """Threaded in-memory store server. Use as a context manager or start()/stop()."""
+
+    SESSION_COOKIE = "store_session"
+
+    def __init__(self, host="127.0.0.1", port=None, latency_ms=None):
+        self.host = host
+        self.port = config.LOCAL_SITE_PORT if port is None else port
+        self.latency = (config.LOCAL_SITE_LATENCY_MS if latency_ms is None else latency_ms) / 1000.0
+        self.accounts = {}
+        self.sessions = {}
+        self.orders = []
+        self.lock = threading.Lock()
+        self._server = None
+        self.add_account(config.USERNAME, config.PASSWORD)
+
+    @property
+    def url(self):
+        return f"http://{self.host}:{self._server.server_port}"
+
+    def add_account(self, loginname, password, firstname="Test", lastname="User", email=None):
+        self.accounts[loginname] = {
+            "loginname": loginname, "password": password, "firstname": firstname,
+            "lastname": lastname, "email": email or f"{loginname}@example.com",
+        }
+
+    # -------------------------------
+    # LIFECYCLE
+    # -------------------------------
+    def start(self):
+        store = self
+
+        class Handler(_StoreHandler):
+            pass
+
+        Handler.store = store
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        print(f" Local store running at {self.url} (latency {self.latency * 1000:.0f}ms)")
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+class _StoreHandler(BaseHTTPRequestHandler):
+    store = None
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    # -------------------------------
+    # REQUEST PLUMBING
+    # -------------------------------
+    def do_GET(self):
+        self._handle({})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length).decode("utf-8", "replace")
+        self._handle(dict(urllib.parse.parse_qsl(body, keep_blank_values=True)))
+
+    def _handle(self, form):
+        self.new_cookie = None
+        if self.store.latency:
+            time.sleep(self.store.latency)
+        parsed = urllib.parse.urlparse(self.path)
+        if parsed.path == "/static/style.css":
+            return self._send(200, STYLE_CSS, "text/css")
+        if parsed.path.startswith("/image/"):
+            return self._send(200, PRODUCT_PNG, "image/png")
+        if parsed.path == "/robots.txt":
+            return self._send(200, b"User-agent: *\n", "text/plain")
+        if parsed.path not in ("/", "/index.php"):
+            return self._send(404, b"Not found", "text/plain")
+
+        self.query = dict(urllib.parse.parse_qsl(parsed.query))
+        self.form = form
+        self.method = self.command
+        route = self.query.get("rt", "")
+        handler = getattr(self, "route_" + route.replace("/", "_"), None) or self.route_home
+        with self.store.lock:
+            self.session = self._load_session()
+            result = handler()
+        if isinstance(result, tuple) and result[0] == "error":
+            self._send(result[1], result[2].encode("utf-8"), "text/html; charset=utf-8")
+        elif isinstance(result, tuple):
+            self._redirect(result[1])
+        else:
+            self._send(200, result.encode("utf-8"), "text/html; charset=utf-8")
+
+    def _load_session(self):
+        cookies = {}
+        for part in (self.headers.get("Cookie") or "").split(";"):
+            if "=" in part:
+                k, v = part.strip().split("=", 1)
+                cookies[k] = v
+        sid = cookies.get(LocalStore.SESSION_COOKIE)
+        if sid not in self.store.sessions:
+            sid = secrets.token_hex(16)
+            self.store.sessions[sid] = {"cart": {}, "token": secrets.token_hex(8)}
+            self.new_cookie = sid
+        return self.store.sessions[sid]
+
+    def _headers(self, status, content_type=None, length=0):
+        self.send_response(status)
+        if content_type:
+            self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(length))
+        if self.new_cookie:
+            self.send_header("Set-Cookie", f"{LocalStore.SESSION_COOKIE}={self.new_cookie}; Path=/; HttpOnly")
+        self.end_headers()
+
+    def _send(self, status, body, content_type):
+        self._headers(status, content_type, len(body))
+        self.wfile.write(body)
+
+    def _redirect(self, route):
+        self.send_response(302)
+        self.send_header("Location", f"/index.php?rt={route}")
+        self.send_header("Content-Length", "0")
+        if self.new_cookie:
+            self.send_header("Set-Cookie", f"{LocalStore.SESSION_COOKIE}={self.new_cookie}; Path=/; HttpOnly")
+        self.end_headers()
+
+    def _token_ok(self):
+        return self.form.get("csrftoken") == self.session["token"]
+
+    # -------------------------------
+    # LAYOUT
+    # -------------------------------
+    def _cart_summary(self):
+        items = sum(line["quantity"] for line in self.session["cart"].values())
+        return items, sum(line["quantity"] * line["price"] for line in self.session["cart"].values())
+
+    def _error(self, status, title):
+        return ("error", status, self._page(title, self._heading(title)))
+
+    def _page(self, title, body):
+        items, total = self._cart_summary()
+        if self.session.get("customer"):
+            account_links = ('<li><a href="/index.php?rt=account/account">Account</a></li>'
+                             '<li><a href="/index.php?rt=account/logout">Logoff</a></li>')
+        else:
+            account_links = '<li><a href="/index.php?rt=account/login">Login or register</a></li>'
+        return f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{_e(title)}</title>
+<link rel="stylesheet" href="/static/style.css"></head>
+<body>
+<div id="header">
+  <a class="logo" href="/index.php?rt=">Automation Test Store</a>
+  <ul class="nav topcart">{account_links}</ul>
+  <div id="cart"><a href="/index.php?rt=checkout/cart">
+    <span class="label" id="cart_total">{items} items - {_money(total)}</span></a></div>
+</div>
+<div id="content">
+{body}
+</div>
+</body></html>"""
+
+    def _heading(self, text):
+        return f'<h1 class="heading1"><span class="maintext">{_e(text)}</span></h1>'
+
+    def _alert(self, message):
+        return f'<div class="alert alert-error alert-danger">{_e(message)}</div>' if message else ""
+
+    def _continue(self):
+        return '<button type="submit" class="btn btn-orange pull-right" title="Continue">Continue</button>'
+
+    def _input(self, form_id, name, value="", kind="text"):
+        return (f'<label for="{form_id}_{name}">{_e(name)}</label>'
+                f'<input type="{kind}" id="{form_id}_{name}" name="{name}" value="{_e(value)}" class="form-control">')
+
+    def _select(self, form_id, name, choices, selected=None):
+        opts = "".join(
+            f'<option value="{v}"{" selected" if v == selected else ""}>{_e(label)}</option>'
+            for v, label in choices
+        )
+        return f'<select id="{form_id}_{name}" name="{name}" class="form-control">{opts}</select>'
+
+    # -------------------------------
+    # HOME / ACCOUNT
+    # -------------------------------
+    def route_home(self):
+        links = "".join(
+            f'<li><a href="/index.php?rt=product/product&product_id={pid}">{_e(p["name"])}</a></li>'
+            for pid, p in PRODUCTS.items()
+        )
+        return self._page("Automation Test Store", f"<h2>Featured</h2><ul class=\"products\">{links}</ul>")
+
+    def route_account_login(self):
+        error = ""
+        if self.method == "POST":
+            account = self.store.accounts.get(self.form.get("loginname", ""))
+            if self._token_ok() and account and account["password"] == self.form.get("password"):
+                self.session["customer"] = account["loginname"]
+                return ("redirect", "account/account")
+            error = "Error: Incorrect login or password provided."
+        token = self.session["token"]
+        return self._page("Account Login", f"""
+<h1 class="heading2">Account Login</h1>
+{self._alert(error)}
+<form id="accountFrm" action="/index.php?rt=account/create" method="get">
+  <input type="hidden" name="rt" value="account/create">
+  <label><input type="radio" id="accountFrm_accountregister" name="account" value="register" checked>
+  Register Account</label>
+  <button type="submit" class="btn btn-orange" title="Continue">Continue</button>
+</form>
+<form id="loginFrm" action="/index.php?rt=account/login" method="post">
+  <input type="hidden" name="csrftoken" value="{token}">
+  {self._input("loginFrm", "loginname")}
+  {self._input("loginFrm", "password", kind="password")}
+  <button type="submit" class="btn btn-orange" title="Login">Login</button>
+</form>""")
+
+    def route_account_logout(self):
+        self.session.pop("customer", None)
+        self.session["cart"] = {}
+        return self._page("Account Logout", self._heading("Account Logout"))
+
+    def route_account_account(self):
+        if not self.session.get("customer"):
+            return ("redirect", "account/login")
+        account = self.store.accounts[self.session["customer"]]
+        return self._page("My Account", self._heading("My Account")
+                          + f'<div class="welcome">Welcome back {_e(account["firstname"])}</div>')
+
+    def route_account_create(self):
+        f, error = self.form, ""
+        if self.method == "POST":
+            required = ("firstname", "lastname", "email", "loginname", "password")
+            if not self._token_ok():
+                error = "Error: Invalid form token."
+            elif any(not f.get(k) for k in required):
+                error = "Error: Please fill in all required fields."
+            elif f["password"] != f.get("confirm"):
+                error = "Error: Password confirmation does not match password!"
+            elif f["loginname"] in self.store.accounts:
+                error = "Error: This login name is not available!"
+            else:
+                self.store.add_account(f["loginname"], f["password"], f["firstname"],
+                                       f["lastname"], f["email"])
+                self.session["customer"] = f["loginname"]
+                return ("redirect", "account/success")
+        fields = "".join(
+            self._input("AccountFrm", name, f.get(name, ""), "password" if name in ("password", "confirm") else "text")
+            for name in ("firstname", "lastname", "email", "loginname", "password", "confirm")
+        )
+        return self._page("Create Account", f"""
+<h1 class="heading2">Create Account</h1>
+{self._alert(error)}
+<form id="AccountFrm" action="/index.php?rt=account/create" method="post">
+  <input type="hidden" name="csrftoken" value="{self.session["token"]}">
+  {fields}
+  {self._continue()}
+</form>""")
+
+    def route_account_success(self):
+        return self._page("Your Account Has Been Created!", self._heading("Your Account Has Been Created!")
+                          + "<p>Congratulations! Your new account has been successfully created!</p>")
+
+    # -------------------------------
+    # PRODUCT / CART
+    # -------------------------------
+    def route_product_product(self):
+        try:
+            pid = int(self.query.get("product_id", ""))
+            product = PRODUCTS[pid]
+        except (ValueError, KeyError):
+            return self._page("Product not found!", self._heading("Product not found!"))
+        options = "".join(
+            f'<label>{_e(label)}</label>'
+            + self._select("option", f"option[{oid}]", [("", "-- Please Select --")] + choices)
+            for oid, (label, choices) in product["options"].items()
+        )
+        return self._page(product["name"], f"""
+{self._heading(product["name"])}
+<img class="product-image" src="/image/product_{pid}.png" width="64" height="64" alt="">
+<div class="productfilneprice">{_money(product["price"])}</div>
+<form id="product" action="/index.php?rt=checkout/cart" method="post">
+  <input type="hidden" name="product_id" value="{pid}">
+  {options}
+  <label for="product_quantity">Qty</label>
+  <input type="text" id="product_quantity" name="quantity" value="1" class="form-control">
+  <button type="submit" class="cart btn btn-orange" title="Add to Cart">Add to Cart</button>
+</form>""")
+
+    def route_checkout_cart(self):
+        cart = self.session["cart"]
+        if self.method == "POST" and "product_id" in self.form:
+            try:
+                pid = int(self.form["product_id"])
+                product = PRODUCTS[pid]
+            except (ValueError, KeyError):
+                return self._error(404, "Product not found!")
+            chosen = {oid: self.form.get(f"option[{oid}]", "") for oid in product["options"]}
+            if any(not v for v in chosen.values()):
+                return ("redirect", f"product/product&product_id={pid}")
+            key = f"{pid}:" + ",".join(f"{k}={v}" for k, v in sorted(chosen.items()))
+            try:
+                qty = max(1, int(self.form.get("quantity") or 1))
+            except ValueError:
+                return self._error(400, "Invalid quantity!")
+            line = cart.setdefault(key, {"product_id": pid, "options": chosen, "quantity": 0,
+                                         "price": product["price"]})
+            line["quantity"] += qty
+            return ("redirect", "checkout/cart")
+        if self.method == "POST":
+            for name, value in self.form.items():
+                if name.startswith("quantity[") and name[9:-1] in cart:
+                    try:
+                        qty = int(value or 0)
+                    except ValueError:
+                        return self._error(400, "Invalid quantity!")
+                    if qty > 0:
+                        cart[name[9:-1]]["quantity"] = qty
+                    else:
+                        del cart[name[9:-1]]
+            return ("redirect", "checkout/cart")
+        if "remove" in self.query:
+            cart.pop(self.query["remove"], None)
+            return ("redirect", "checkout/cart")
+
+        if not cart:
+            return self._page("Shopping Cart", self._heading("Shopping Cart")
+                              + '<div class="contentpanel">Your shopping cart is empty!</div>'
+                              + '<a href="/index.php?rt=" class="btn btn-default" title="Continue">Continue</a>')
+        rows = ""
+        for key, line in cart.items():
+            product = PRODUCTS[line["product_id"]]
+            opts = "".join(
+                f'<br><small> - {_e(product["options"][oid][0])} '
+                f'{_e(dict(product["options"][oid][1])[v])}</small>'
+                for oid, v in line["options"].items()
+            )
+            rows += f"""
+<tr>
+  <td class="align_center image"><img src="/image/product_{line["product_id"]}.png" width="32" height="32" alt=""></td>
+  <td class="align_left name"><a href="/index.php?rt=product/product&product_id={line["product_id"]}">{_e(product["name"])}</a>{opts}</td>
+  <td class="align_left model">{_e(product["model"])}</td>
+  <td class="align_right price">{_money(line["price"])}</td>
+  <td class="align_center quantity"><input type="text" name="quantity[{_e(key)}]" value="{line["quantity"]}" class="form-control short"></td>
+  <td class="align_right total">{_money(line["price"] * line["quantity"])}</td>
+  <td class="align_center remove"><a href="/index.php?rt=checkout/cart&remove={urllib.parse.quote(key)}" class="btn btn-sm btn-default">Remove</a></td>
+</tr>"""
+        _, subtotal = self._cart_summary()
+        return self._page("Shopping Cart", f"""
+{self._heading("Shopping Cart")}
+<form id="cart" action="/index.php?rt=checkout/cart" method="post">
+<table class="table table-striped table-bordered cart">
+  <thead><tr><th>Image</th><th>Name</th><th>Model</th><th>Unit Price</th><th>Quantity</th><th>Total</th><th>Remove</th></tr></thead>
+  <tbody>{rows}</tbody>
+</table>
+<button type="submit" class="btn btn-default" title="Update" id="cart_update">Update</button>
+</form>
+<table id="totals_table" class="table totals">
+  <tr><td><span class="extra bold">Sub-Total:</span></td><td><span class="bold">{_money(subtotal)}</span></td></tr>
+  <tr><td><span class="extra bold totalamout">Total:</span></td><td><span class="bold totalamout">{_money(subtotal)}</span></td></tr>
+</table>
+<a href="/index.php?rt=checkout/checkout" id="cart_checkout2" class="btn btn-orange pull-right" title="Checkout">Checkout</a>""")
+
+    # -------------------------------
+    # GUEST CHECKOUT
+    # -------------------------------
+    def route_checkout_checkout(self):
+        if not self.session["cart"]:
+            return ("redirect", "checkout/cart")
+        if self.session.get("customer"):
+            return ("redirect", "checkout/guest_step_2")
+        if self.method == "POST":
+            if self.form.get("account") == "guest":
+                return ("redirect", "checkout/guest_step_1")
+            return ("redirect", "account/create")
+        return self._page("Account Login", f"""
+<h1 class="heading1"><span class="maintext">Account Login</span></h1>
+<form id="accountFrm" action="/index.php?rt=checkout/checkout" method="post">
+  <label><input type="radio" id="accountFrm_accountregister" name="account" value="register" checked> Register Account</label>
+  <label><input type="radio" id="accountFrm_accountguest" name="account" value="guest"> Guest Checkout</label>
+  {self._continue()}
+</form>""")
+
+    def route_checkout_guest_step_1(self):
+        if not self.session["cart"]:
+            return ("redirect", "checkout/cart")
+        f, error = self.form, ""
+        required = ("firstname", "lastname", "email", "address_1", "city", "postcode", "country_id", "zone_id")
+        if self.method == "POST":
+            if any(not f.get(k) for k in required):
+                error = "Error: Please fill in all required fields."
+            else:
+                self.session["guest"] = {k: f[k] for k in required}
+                return ("redirect", "checkout/guest_step_2")
+        fields = "".join(
+            self._input("guestFrm", name, f.get(name, ""))
+            for name in ("firstname", "lastname", "email", "telephone", "address_1", "city", "postcode")
+        )
+        return self._page("Guest Checkout - Step 1", f"""
+{self._heading("Guest Checkout - Step 1")}
+{self._alert(error)}
+<form id="guestFrm" action="/index.php?rt=checkout/guest_step_1" method="post">
+  {fields}
+  {self._select("guestFrm", "country_id", [("", " --- Please Select --- ")] + COUNTRIES, f.get("country_id"))}
+  {self._select("guestFrm", "zone_id", ZONES, f.get("zone_id") or ZONES[0][0])}
+  {self._continue()}
+</form>""")
+
+    def _buyer(self):
+        return self.session.get("guest") or self.session.get("customer")
+
+    def route_checkout_guest_step_2(self):
+        if not self.session["cart"] or not self._buyer():
+            return ("redirect", "checkout/checkout")
+        if self.method == "POST":
+            self.session["shipping_method"] = self.form.get("shipping_method") or "flat.flat"
+            return ("redirect", "checkout/guest_step_3")
+        return self._page("Delivery Method", f"""
+{self._heading("Delivery Method")}
+<form id="shippingFrm" action="/index.php?rt=checkout/guest_step_2" method="post">
+  <div id="shipping-method" class="checkout-shipping">
+    <label><input type="radio" name="shipping_method" value="flat.flat" checked> Flat Shipping Rate $2.00</label>
+  </div>
+  {self._continue()}
+</form>""")
+
+    def route_checkout_guest_step_3(self):
+        if not self.session.get("shipping_method"):
+            return ("redirect", "checkout/guest_step_2")
+        error = ""
+        if self.method == "POST":
+            if not self.form.get("payment_method"):
+                error = "Error: Please select a payment method!"
+            elif not self.form.get("agree"):
+                error = "Error: You must agree to the Terms & Conditions!"
+            else:
+                self.session["payment_method"] = self.form["payment_method"]
+                return ("redirect", "checkout/confirm")
+        return self._page("Payment Method", f"""
+{self._heading("Payment Method")}
+{self._alert(error)}
+<form id="paymentFrm" action="/index.php?rt=checkout/guest_step_3" method="post">
+  <div id="payment-method" class="checkout-payment">
+    <label><input type="radio" id="payment_method_cod" name="payment_method" value="cod"> Cash On Delivery</label>
+  </div>
+  <label><input type="checkbox" id="agree" name="agree" value="1"> I have read and agree to the Terms &amp; Conditions</label>
+  {self._continue()}
+</form>""")
+
+    def route_checkout_confirm(self):
+        if not self.session.get("payment_method"):
+            return ("redirect", "checkout/guest_step_3")
+        if self.method == "POST":
+            items, total = self._cart_summary()
+            self.store.orders.append({
+                "buyer": self._buyer(), "lines": list(self.session["cart"].values()),
+                "items": items, "total": total + 2.0,
+                "shipping_method": self.session["shipping_method"],
+                "payment_method": self.session["payment_method"],
+            })
+            self.session["cart"] = {}
+            for key in ("guest", "shipping_method", "payment_method"):
+                self.session.pop(key, None)
+            return ("redirect", "checkout/success")
+        _, subtotal = self._cart_summary()
+        return self._page("Checkout Confirmation", f"""
+{self._heading("Checkout Confirmation")}
+<table class="table confirm_total"><tr><td>Total:</td><td>{_money(subtotal + 2.0)}</td></tr></table>
+<form id="confirmFrm" action="/index.php?rt=checkout/confirm" method="post">
+  <button type="submit" id="checkout_confirm" class="btn btn-orange pull-right" title="Confirm Order">Confirm Order</button>
+</form>""")
+
+    def route_checkout_success(self):
+        return self._page("Your Order Has Been Processed!", self._heading("Your Order Has Been Processed!")
+                          + f"<p>Your order #{len(self.store.orders)} has been successfully processed!</p>"
+                          + "<p>Thank you for your order!</p>")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the local stand-in store.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=config.LOCAL_SITE_PORT or 8000)
+    parser.add_argument("--latency-ms", type=int, default=config.LOCAL_SITE_LATENCY_MS)
+    args = parser.parse_args(argv)
+    store = LocalStore(args.host, args.port, args.latency_ms).start()
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        store.stop()
+
+
+if __name__ == "__main__":
+    main()
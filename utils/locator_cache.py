@@ -0,0 +1,119 @@
+"""On-disk cache of the locator that won each page-object fallback chain.
+
+Entries are keyed by page class, the candidate list and the site URL, so
+editing a locator list or switching sites never reuses an old answer.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from utils import config
+
+
+class LocatorCache:
+    def __init__(self, path=None, ttl_days=None, enabled=None):
+        self.path = path or config.LOCATOR_CACHE_FILE
+        self.ttl = (config.LOCATOR_CACHE_TTL_DAYS if ttl_days is None else ttl_days) * 86400
+        self.enabled = config.LOCATOR_CACHE if enabled is None else enabled
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self._dirty = set()
+        self._lock = threading.Lock()
+        self.entries = self._load() if self.enabled else {}
+
+    @staticmethod
+    def key(page, candidates, base_url=None):
+        name = page if isinstance(page, str) else type(page).__name__
+        raw = json.dumps([name, [list(c) for c in candidates], base_url or config.BASE_URL])
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    # -------------------------------
+    # LOOKUP / RECORD
+    # -------------------------------
+    def hint(self, key, candidates):
+        """Index of the remembered winner in candidates, or None.
+
+        Callers check it first but keep list order as the priority
+        (utils/locators.py first_in_order), so a catch-all late in a list
+        never outranks an earlier candidate that also matches.
+        """
+        if not self.enabled:
+            return None
+        candidates = [tuple(c) for c in candidates]
+        with self._lock:
+            entry = self.entries.get(key)
+            if not entry:
+                return None
+            winner = tuple(entry["locator"])
+            if winner not in candidates or self._expired(entry):
+                self._invalidate(key)
+                return None
+        return candidates.index(winner)
+
+    def record(self, key, locator):
+        """Note which locator matched; counts a hit if it was already the cached winner."""
+        if not self.enabled:
+            return
+        locator = list(locator)
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry and entry["locator"] == locator:
+                self.hits += 1
+                # Refresh at most hourly so steady hits do not rewrite the file every run
+                if time.time() - entry["confirmed"] < 3600:
+                    return
+            else:
+                self.misses += 1
+            self.entries[key] = {"locator": locator, "confirmed": time.time()}
+            self._dirty.add(key)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale": self.stale,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "entries": len(self.entries),
+        }
+
+    # -------------------------------
+    # PERSISTENCE
+    # -------------------------------
+    def save(self):
+        if not self.enabled or not self._dirty:
+            return
+        with self._lock:
+            # Merge with what other workers wrote since we loaded
+            on_disk = self._load()
+            for key in self._dirty:
+                if key in self.entries:
+                    on_disk[key] = self.entries[key]
+                else:
+                    on_disk.pop(key, None)
+            tmp = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(on_disk, f, indent=1, sort_keys=True)
+            os.replace(tmp, self.path)
+            self._dirty.clear()
+
+    def _load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return {k: v for k, v in entries.items() if not self._expired(v)}
+
+    def _expired(self, entry):
+        return time.time() - entry.get("confirmed", 0) > self.ttl
+
+    def _invalidate(self, key):
+        self.stale += 1
+        self.entries.pop(key, None)
+        self._dirty.add(key)
+
+
+locator_cache = LocatorCache()
@@ -0,0 +1,262 @@
+"""Resolve ordered fallback locator lists inside the browser.
+
+Page objects keep lists of (By, value) candidates. Checking them one by one
+costs a find_elements plus is_displayed/is_enabled round trip per element;
+here the whole list is evaluated by a single execute_script call.
+"""
+import time
+from selenium.common.exceptions import JavascriptException, TimeoutException, WebDriverException
+from utils.locator_cache import locator_cache
+
+# Shared in-page helpers: locate elements for a (by, value) pair and approximate
+# Selenium's is_displayed / is_enabled checks.
+LOCATOR_JS = r"""
+function qaFindAll(by, value, root) {
+    root = root || document;
+    switch (by) {
+        case 'css selector':
+            return Array.prototype.slice.call(root.querySelectorAll(value));
+        case 'id':
+            return Array.prototype.slice.call(root.querySelectorAll('[id="' + CSS.escape(value) + '"]'));
+        case 'name':
+            return Array.prototype.slice.call(root.querySelectorAll('[name="' + CSS.escape(value) + '"]'));
+        case 'class name':
+            return Array.prototype.slice.call(root.querySelectorAll('.' + CSS.escape(value)));
+        case 'tag name':
+            return Array.prototype.slice.call(root.getElementsByTagName(value));
+        case 'link text':
+        case 'partial link text':
+            return Array.prototype.slice.call(root.querySelectorAll('a')).filter(function (a) {
+                var t = (a.innerText || '').trim();
+                return by === 'link text' ? t === value : t.indexOf(value) !== -1;
+            });
+        case 'xpath':
+            var snap = document.evaluate(value, root, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+            var out = [];
+            for (var i = 0; i < snap.snapshotLength; i++) {
+                if (snap.snapshotItem(i).nodeType === 1) out.push(snap.snapshotItem(i));
+            }
+            return out;
+    }
+    return [];
+}
+function qaIsVisible(el) {
+    if (!el.isConnected) return false;
+    if (el.tagName === 'INPUT' && el.type === 'hidden') return false;
+    if (el.tagName === 'OPTION') { var sel = el.closest('select'); return !sel || qaIsVisible(sel); }
+    for (var n = el; n && n.nodeType === 1; n = n.parentElement) {
+        var s = getComputedStyle(n);
+        if (s.display === 'none' || s.opacity === '0') return false;
+    }
+    var st = getComputedStyle(el);
+    if (st.visibility === 'hidden' || st.visibility === 'collapse') return false;
+    var r = el.getBoundingClientRect();
+    return r.width > 0 && r.height > 0;
+}
+function qaIsEnabled(el) {
+    return !(el.matches && el.matches(':disabled'));
+}
+function qaIsUnobscured(el) {
+    var r = el.getBoundingClientRect();
+    var x = r.left + r.width / 2, y = r.top + r.height / 2;
+    if (x < 0 || y < 0 || x > innerWidth || y > innerHeight) return true;
+    var top = document.elementFromPoint(x, y);
+    return !top || el === top || el.contains(top);
+}
+function qaMatch(candidate, requireVisible, requireEnabled, requireUnobscured) {
+    var found;
+    try { found = qaFindAll(candidate[0], candidate[1]); } catch (e) { return null; }
+    for (var j = 0; j < found.length; j++) {
+        var el = found[j];
+        if (requireVisible && !qaIsVisible(el)) continue;
+        if (requireEnabled && !qaIsEnabled(el)) continue;
+        if (requireUnobscured && !qaIsUnobscured(el)) continue;
+        return el;
+    }
+    return null;
+}
+function qaFirst(candidates, requireVisible, requireEnabled, requireUnobscured, hint) {
+    // `hint`: last run's winner. It is checked first, but an earlier candidate that matches still wins
+    var end = candidates.length, hit = null;
+    if (hint !== undefined && hint !== null && hint < candidates.length) {
+        var el = qaMatch(candidates[hint], requireVisible, requireEnabled, requireUnobscured);
+        if (el) { hit = [el, hint]; end = hint; }
+    }
+    for (var i = 0; i < end; i++) {
+        var found = qaMatch(candidates[i], requireVisible, requireEnabled, requireUnobscured);
+        if (found) return [found, i];
+    }
+    return hit;
+}
+"""
+
+# WebDriver's own default for the session script timeout (seconds)
+DEFAULT_SCRIPT_TIMEOUT = 30
+
+_RESOLVE_JS = LOCATOR_JS + "return qaFirst(arguments[0], arguments[1], arguments[2], false, arguments[3]);"
+
+# Resolves as soon as a candidate qualifies. A MutationObserver re-checks on DOM
+# changes; a slow in-page interval covers CSS transitions, which fire no mutations.
+_WAIT_JS = LOCATOR_JS + r"""
+var candidates = arguments[0], vis = arguments[1], en = arguments[2], unob = arguments[3];
+var timeoutMs = arguments[4], hint = arguments[5], done = arguments[arguments.length - 1];
+var first = qaFirst(candidates, vis, en, unob, hint);
+if (first) { done(first); return; }
+var finished = false, scheduled = false, observer, timer, poll;
+function finish(result) {
+    if (finished) return;
+    finished = true;
+    observer.disconnect();
+    clearTimeout(timer);
+    clearInterval(poll);
+    done(result);
+}
+function check() {
+    scheduled = false;
+    var r = qaFirst(candidates, vis, en, unob, hint);
+    if (r) finish(r);
+}
+observer = new MutationObserver(function () {
+    if (!scheduled) { scheduled = true; setTimeout(check, 0); }
+});
+observer.observe(document.documentElement, {childList: true, subtree: true, attributes: true});
+poll = setInterval(check, 250);
+timer = setTimeout(function () { finish(null); }, timeoutMs);
+"""
+
+
+def as_pairs(candidates):
+    return [[by, value] for by, value in candidates]
+
+
+def first_in_order(candidates, match, hint=None):
+    """[result, index] for the first candidate `match` returns something for, or None.
+
+    The cached winner `hint` is tried first, but the answer is always the one
+    plain list order gives: candidates before it are still checked (qaFirst does the same).
+    """
+    end, hit = len(candidates), None
+    if hint is not None and hint < len(candidates):
+        result = match(candidates[hint])
+        if result:
+            end, hit = hint, [result, hint]
+    for index in range(end):
+        result = match(candidates[index])
+        if result:
+            return [result, index]
+    return hit
+
+
+def first_static(driver, candidates, require_visible=True, require_enabled=False, hint=None):
+    """qaFirst through the element API, for drivers without JavaScript (utils/html_driver.py)."""
+    def match(candidate):
+        try:
+            found = driver.find_elements(*candidate)
+        except WebDriverException:
+            return None
+        for el in found:
+            if require_visible and not el.is_displayed():
+                continue
+            if require_enabled and not el.is_enabled():
+                continue
+            return el
+        return None
+
+    return first_in_order(candidates, match, hint)
+
+
+def resolve_first(driver, candidates, require_visible=True, require_enabled=False, page=None):
+    """Return (element, locator) for the first candidate with a qualifying element.
+
+    Candidates are tried in order; (None, None) when nothing qualifies. When
+    `page` is given, the locator that won last time for that page is checked first
+    (an earlier candidate that also qualifies still wins).
+    """
+    key = hint = None
+    if page is not None:
+        key = locator_cache.key(page, candidates)
+        hint = locator_cache.hint(key, candidates)
+    try:
+        if getattr(driver, "is_browserless", False):
+            result = first_static(driver, candidates, require_visible, require_enabled, hint)
+        else:
+            result = driver.execute_script(_RESOLVE_JS, as_pairs(candidates),
+                                           require_visible, require_enabled, hint)
+    except WebDriverException:
+        return None, None
+    if not result:
+        return None, None
+    el, index = result
+    if key:
+        locator_cache.record(key, candidates[index])
+    return el, candidates[index]
+
+
+def wait_for_any(driver, candidates, timeout, require_visible=True, require_enabled=False,
+                 require_unobscured=False, page=None):
+    """Block until a candidate qualifies and return (element, locator), or (None, None).
+
+    The waiting happens in the page, so chromedriver sees one command per page
+    instead of one per poll. A navigation mid-wait aborts the script; the wait
+    is then re-armed on the new document with whatever time is left.
+    """
+    key = hint = None
+    if page is not None:
+        key = locator_cache.key(page, candidates)
+        hint = locator_cache.hint(key, candidates)
+    if getattr(driver, "is_browserless", False):
+        # A page without scripts cannot change while we wait: one look decides
+        result = first_static(driver, candidates, require_visible, require_enabled, hint)
+    else:
+        result = _wait_in_page(driver, as_pairs(candidates), timeout,
+                               require_visible, require_enabled, require_unobscured, hint)
+    if not result:
+        return None, None
+    el, index = result
+    if key:
+        locator_cache.record(key, candidates[index])
+    return el, candidates[index]
+
+
+def _wait_in_page(driver, pairs, timeout, require_visible, require_enabled, require_unobscured, hint=None):
+    end = time.monotonic() + timeout
+    # Handles sharing one session (utils/browser_contexts.py) wait in slices so the others get a turn
+    wait_slice = getattr(driver, "wait_slice", None)
+    checked = False
+    while True:
+        remaining = end - time.monotonic()
+        if remaining <= 0 and checked:
+            return None
+        checked = True
+        # An exhausted budget still gets one look (the script checks before it waits)
+        remaining = max(remaining, 0)
+        chunk = min(remaining, wait_slice) if wait_slice else remaining
+        _ensure_script_timeout(driver, chunk)
+        try:
+            result = driver.execute_async_script(
+                _WAIT_JS, pairs, require_visible, require_enabled, require_unobscured,
+                int(chunk * 1000), hint
+            )
+        except (JavascriptException, TimeoutException):
+            # Document unloaded (navigation) or script timeout — retry on the new page.
+            # Anything else (dead session, crashed browser) will not get better: let it raise
+            time.sleep(0.05)
+            continue
+        if result or not wait_slice:
+            return result
+        time.sleep(0.01)
+
+
+def _ensure_script_timeout(driver, seconds):
+    # The async script must be allowed to outlive its own in-page timer
+    needed = seconds + 5
+    if getattr(driver, "_qa_script_timeout", 0) < needed:
+        driver.set_script_timeout(max(needed, DEFAULT_SCRIPT_TIMEOUT))
+        driver._qa_script_timeout = max(needed, DEFAULT_SCRIPT_TIMEOUT)
+
+
+def restore_script_timeout(driver):
+    """Put the session's script timeout back to the default after waits raised it (DriverPool.reset)."""
+    if getattr(driver, "_qa_script_timeout", None):
+        driver.set_script_timeout(DEFAULT_SCRIPT_TIMEOUT)
+        del driver._qa_script_timeout
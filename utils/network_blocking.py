@@ -0,0 +1,154 @@
+"""Block images, fonts and third-party hosts the page objects never look at.
+
+Chrome's Network.setBlockedURLs takes URL patterns, so resource types are
+expressed as file extensions at the end of the path (with or without a query
+string: "*.js" and "*.js?*" block app.js?v=2 but not data.json). Tests that
+need something back use
+
+    @pytest.mark.allow_resources("image", "facebook.net")
+
+Blocked requests are counted from the performance log; bytes saved are
+estimated from sizes seen when the same URL was allowed (kept in
+RESOURCE_SIZES_FILE), or a typical size for the type.
+"""
+import json
+import os
+import threading
+from urllib.parse import urlsplit
+from utils import config
+
+TYPE_PATTERNS = {
+    "image": ["png", "jpg", "jpeg", "gif", "webp", "svg", "ico"],
+    "font": ["woff", "woff2", "ttf", "otf", "eot"],
+    "media": ["mp4", "webm", "mp3", "ogg"],
+    "stylesheet": ["css"],
+    "script": ["js"],
+}
+
+# Used when a blocked URL has never been downloaded
+TYPICAL_BYTES = {"image": 30000, "font": 40000, "media": 500000, "stylesheet": 20000, "script": 60000}
+OTHER_BYTES = 20000
+
+_EVENTS = ("Network.requestWillBeSent", "Network.loadingFinished", "Network.loadingFailed")
+
+
+def _split(value):
+    if isinstance(value, str):
+        value = value.split(",")
+    return [v.strip() for v in value if v.strip()]
+
+
+def _size_key(url):
+    parts = urlsplit(url)
+    return f"{parts.netloc}{parts.path}"
+
+
+class NetworkBlocker:
+    def __init__(self, types=None, hosts=None, enabled=None, sizes_file=None):
+        self.types = _split(config.BLOCK_RESOURCE_TYPES if types is None else types)
+        self.hosts = _split(config.BLOCK_HOSTS if hosts is None else hosts)
+        self.enabled = config.BLOCK_RESOURCES if enabled is None else enabled
+        self.sizes_file = sizes_file or config.RESOURCE_SIZES_FILE
+        self._lock = threading.Lock()
+        self.sizes = self._load()
+        self.totals = {"requests": 0, "bytes": 0}
+
+    # -------------------------------
+    # PATTERNS
+    # -------------------------------
+    def patterns(self, allow=()):
+        allow = set(allow)
+        urls = []
+        for t in self.types:
+            if t not in allow:
+                for ext in TYPE_PATTERNS.get(t, []):
+                    urls += [f"*.{ext}", f"*.{ext}?*", f"*.{ext}#*"]
+        for host in self.hosts:
+            if host not in allow:
+                urls += [f"*://{host}/*", f"*.{host}/*"]
+        return urls
+
+    def apply(self, driver, allow=()):
+        """Install the blocking profile for the next test (clears the previous one)."""
+        if not self.enabled:
+            return []
+        self._drain(driver)   # events from earlier tests are not this test's
+        urls = self.patterns(allow)
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": urls})
+        except Exception as e:
+            print(f" Network blocking unavailable: {e}")
+            return []
+        return urls
+
+    # -------------------------------
+    # ACCOUNTING
+    # -------------------------------
+    def collect(self, driver):
+        """Requests blocked since apply(), with an estimate of the bytes they would have cost."""
+        requests, blocked = {}, {"requests": 0, "bytes": 0}
+        if not self.enabled:
+            return blocked
+        for event in self._drain(driver):
+            method, params = event.get("method"), event.get("params", {})
+            if method == "Network.requestWillBeSent":
+                requests[params["requestId"]] = (params["request"]["url"], params.get("type", ""))
+            elif method == "Network.loadingFinished":
+                url, _ = requests.get(params["requestId"], ("", ""))
+                if url and params.get("encodedDataLength"):
+                    with self._lock:
+                        self.sizes[_size_key(url)] = int(params["encodedDataLength"])
+            elif method == "Network.loadingFailed" and params.get("blockedReason"):
+                url, rtype = requests.get(params["requestId"], ("", params.get("type", "")))
+                blocked["requests"] += 1
+                blocked["bytes"] += self.estimate(url, rtype)
+        with self._lock:
+            self.totals["requests"] += blocked["requests"]
+            self.totals["bytes"] += blocked["bytes"]
+        return blocked
+
+    def estimate(self, url, rtype=""):
+        known = self.sizes.get(_size_key(url)) if url else None
+        if known:
+            return known
+        return TYPICAL_BYTES.get(str(rtype).lower(), OTHER_BYTES)
+
+    def _drain(self, driver):
+        try:
+            entries = driver.get_log("performance")
+        except Exception:
+            return []
+        events = []
+        for entry in entries:
+            # Skip the JSON parse for events collect() does not look at
+            if not any(name in entry.get("message", "") for name in _EVENTS):
+                continue
+            try:
+                events.append(json.loads(entry["message"])["message"])
+            except (KeyError, ValueError):
+                continue
+        return events
+
+    # -------------------------------
+    # LEARNED SIZES
+    # -------------------------------
+    def _load(self):
+        try:
+            with open(self.sizes_file, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def save(self):
+        with self._lock:
+            sizes = dict(self.sizes)
+        if not sizes:
+            return
+        tmp = f"{self.sizes_file}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({**self._load(), **sizes}, f)
+        os.replace(tmp, self.sizes_file)
+
+
+network_blocker = NetworkBlocker()
@@ -0,0 +1,27 @@
+"""Search the page's visible text in the browser instead of pulling page_source."""
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.common.by import By
+
+_FIND_TEXTS_JS = r"""
+var norm = function (s) { return s.replace(/\s+/g, ' ').toLowerCase(); };
+var text = norm(document.body ? document.body.innerText : '');
+return arguments[0].filter(function (p) { return text.indexOf(norm(p)) !== -1; });
+"""
+
+
+def find_texts(driver, phrases):
+    """Return the phrases present in the visible page text (case-insensitive).
+
+    Only the list of matching phrases crosses the wire, not the document.
+    """
+    try:
+        if getattr(driver, "is_browserless", False):
+            text = _norm(driver.find_element(By.TAG_NAME, "body").text)
+            return [p for p in phrases if _norm(p) in text]
+        return driver.execute_script(_FIND_TEXTS_JS, list(phrases)) or []
+    except WebDriverException:
+        return []
+
+
+def _norm(text):
+    return " ".join(text.split()).lower()
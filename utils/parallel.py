@@ -0,0 +1,188 @@
+"""Parallel runner: shards the suite across worker processes, longest tests first.
+
+    python -m utils.parallel -n 4 [extra pytest args]
+
+Each worker is a separate pytest process with its own browser pool, WORKER_ID
+and artifact directory (reports_screenshots/<worker>). Report paths get the
+worker id too: --html=report.html gives report.gw0.html, report.gw1.html, ... With --contexts the
+workers share one Chrome: each attaches its own chromedriver session to it and
+runs its tests in browser contexts (utils/browser_contexts.py).
+"""
+import argparse
+import heapq
+import json
+import os
+import subprocess
+import sys
+import time
+from utils import config
+from utils.browser_contexts import launch_shared_chrome
+from utils.driver_pool import remove_profile
+from utils.test_selection import merge_maps
+
+
+def load_durations(path=None):
+    path = path or config.DURATIONS_FILE
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_durations(durations, path=None):
+    path = path or config.DURATIONS_FILE
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(durations, f, indent=2, sort_keys=True)
+
+
+def merge_durations(old, new, weight=0.5):
+    """Blend new timings into old ones so a single slow run does not dominate."""
+    merged = dict(old)
+    for nodeid, secs in new.items():
+        prev = merged.get(nodeid)
+        merged[nodeid] = secs if prev is None else round(prev * (1 - weight) + secs * weight, 3)
+    return merged
+
+
+def schedule(nodeids, durations, workers):
+    """Longest-processing-time-first: give each test to the least loaded shard.
+
+    Tests without history are assumed to take the average known duration.
+    Returns a list of (estimated_seconds, [nodeids]) per worker.
+    """
+    known = [durations[n] for n in nodeids if n in durations]
+    default = sum(known) / len(known) if known else 1.0
+    ordered = sorted(nodeids, key=lambda n: durations.get(n, default), reverse=True)
+
+    shards = [(0.0, i, []) for i in range(max(1, workers))]
+    heapq.heapify(shards)
+    for nodeid in ordered:
+        load, i, tests = heapq.heappop(shards)
+        tests.append(nodeid)
+        heapq.heappush(shards, (load + durations.get(nodeid, default), i, tests))
+    return [(round(load, 3), tests) for load, i, tests in sorted(shards, key=lambda s: s[1])]
+
+
+# pytest options whose value is the next argument (so it is not mistaken for a test path)
+_VALUE_OPTIONS = {
+    "-k", "-m", "-p", "-c", "-o", "-W", "--html", "--junitxml", "--junit-xml", "--rootdir",
+    "--deselect", "--ignore", "--ignore-glob", "--maxfail", "--tb", "--confcutdir", "--basetemp",
+    "--durations", "--log-file", "--log-level", "--capture", "--import-mode", "--override-ini",
+}
+
+
+def split_args(pytest_args):
+    """(options, test paths): paths pick what to collect, workers only get the options."""
+    options, paths = [], []
+    takes_value = False
+    for arg in pytest_args:
+        if takes_value:
+            options.append(arg)
+            takes_value = False
+        elif arg.startswith("-"):
+            options.append(arg)
+            takes_value = arg in _VALUE_OPTIONS
+        elif "::" in arg or os.path.exists(arg):
+            paths.append(arg)
+        else:
+            options.append(arg)
+    return options, paths
+
+
+# Report options every worker would otherwise overwrite: each gets its own file
+_REPORT_OPTIONS = ("--html", "--junitxml", "--junit-xml", "--log-file")
+
+
+def worker_options(options, worker):
+    """Options for one worker, with report paths made per worker (report.html -> report.gw0.html)."""
+    def tag(path):
+        root, ext = os.path.splitext(path)
+        return f"{root}.{worker}{ext}"
+
+    out, tag_next = [], False
+    for arg in options:
+        name, eq, value = arg.partition("=")
+        if tag_next:
+            out.append(tag(arg))
+        elif eq and name in _REPORT_OPTIONS:
+            out.append(f"{name}={tag(value)}")
+        else:
+            out.append(arg)
+        tag_next = not eq and arg in _REPORT_OPTIONS
+    return out
+
+
+def collect(pytest_args):
+    out = subprocess.run(
+        [sys.executable, "-m", "pytest", "--collect-only", "-q", *pytest_args],
+        capture_output=True, text=True,
+    ).stdout
+    return [line.strip() for line in out.splitlines() if "::" in line]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("-n", "--workers", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("--contexts", action="store_true",
+                        help="one Chrome for all workers; every test gets its own browser context")
+    args, pytest_args = parser.parse_known_args(argv)
+
+    options, _ = split_args(pytest_args)
+    nodeids = collect(pytest_args)
+    if not nodeids:
+        print(" No tests collected.")
+        return 5
+
+    durations = load_durations()
+    plan = [(est, tests) for est, tests in schedule(nodeids, durations, args.workers) if tests]
+    print(f" Running {len(nodeids)} tests on {len(plan)} workers "
+          f"(estimated wall time {max(est for est, _ in plan):.1f}s)")
+
+    # One run id for all workers, so their page timings land in the same run
+    run_id = os.getenv("RUN_ID") or time.strftime("%Y%m%d-%H%M%S")
+    shared, shared_env = None, {}
+    if args.contexts:
+        shared, address = launch_shared_chrome()
+        shared_env = {"BROWSER_CONTEXTS": "True", "SHARED_BROWSER": address}
+        print(f" Shared browser at {address}")
+    procs, deps_files = [], []
+    for i, (est, tests) in enumerate(plan):
+        worker = f"gw{i}"
+        artifact_dir = os.path.join("reports_screenshots", worker)
+        os.makedirs(artifact_dir, exist_ok=True)
+        env = dict(os.environ, WORKER_ID=worker, RUN_ID=run_id,
+                   DURATIONS_FILE=f"{config.DURATIONS_FILE}.{worker}",
+                   DEPS_FILE=f"{config.DEPS_FILE}.{worker}", **shared_env)
+        log = open(os.path.join(artifact_dir, "pytest.log"), "w", encoding="utf-8")
+        print(f" [{worker}] {len(tests)} tests, ~{est:.1f}s")
+        # Only this worker's node ids: passing the paths too would run them all again
+        proc = subprocess.Popen([sys.executable, "-m", "pytest", *worker_options(options, worker), *tests],
+                                env=env, stdout=log, stderr=subprocess.STDOUT)
+        procs.append((worker, proc, log, env["DURATIONS_FILE"]))
+        deps_files.append(env["DEPS_FILE"])
+
+    exit_code = 0
+    for worker, proc, log, worker_durations in procs:
+        code = proc.wait()
+        log.close()
+        print(f" [{worker}] finished with exit code {code}")
+        if code and not exit_code:
+            exit_code = code
+        durations = merge_durations(durations, load_durations(worker_durations))
+        try:
+            os.remove(worker_durations)
+        except OSError:
+            pass
+
+    if shared:
+        shared.quit()
+        remove_profile(shared)
+    save_durations(durations)
+    # Dependency maps from a RECORD_DEPS run (no files otherwise)
+    merge_maps(deps_files)
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,203 @@
+"""Storefront timing from the browser, recorded as the tests run.
+
+Every page-object navigation and checkout step reads Navigation Timing and
+Resource Timing for the document it is on (one script call) and books it
+under a page key: login, register, product, cart, checkout_account,
+checkout_billing, checkout_shipping, checkout_payment, checkout_confirm,
+success. Records are appended to PERF_TIMING_FILE (JSONL, one line per
+capture) so runs form a time series; medians of this run are compared with
+PERF_BASELINE_FILE.
+
+    python -m utils.perf_timing                    # last run vs baseline
+    python -m utils.perf_timing --update-baseline  # last run becomes the baseline
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from utils import config
+
+METRICS = ("ttfb_ms", "dcl_ms", "load_ms")
+
+_TIMING_JS = """
+var n = performance.getEntriesByType('navigation')[0];
+if (!n) return null;
+var res = performance.getEntriesByType('resource').map(function (r) {
+    return {name: r.name, type: r.initiatorType, ms: Math.round(r.duration), bytes: r.transferSize || 0};
+});
+res.sort(function (a, b) { return b.ms - a.ms; });
+return {
+    url: n.name, origin: performance.timeOrigin,
+    ttfb: n.responseStart, dcl: n.domContentLoadedEventEnd, load: n.loadEventEnd,
+    bytes: n.transferSize || 0, resources: res.length, largest: res.slice(0, arguments[0])
+};
+"""
+
+
+class PerfRecorder:
+    def __init__(self, path=None, enabled=None, top_resources=5):
+        self.path = path or config.PERF_TIMING_FILE
+        self.enabled = config.PERF_TIMING if enabled is None else enabled
+        self.top_resources = top_resources
+        self.run_id = os.getenv("RUN_ID") or time.strftime("%Y%m%d-%H%M%S")
+        self.records = []
+        self._written = 0
+        self._seen = set()
+        self._pending = {}   # id(driver) -> ((url, timeOrigin), record read at capture)
+        self._lock = threading.Lock()
+
+    def capture(self, driver, page):
+        """Record timing for the document the driver is on (once per document).
+
+        Navigation is eager, so the load event has usually not fired yet; such a
+        document stays pending and is read again by harvest() before the browser
+        moves on (next navigation, next click in a flow, test teardown).
+        """
+        if not self.enabled:
+            return None
+        self.harvest(driver)
+        t = self._read(driver)
+        if not t or (t["url"], t["origin"]) in self._seen:
+            return None
+        record = self._record(t, page)
+        with self._lock:
+            self._seen.add((t["url"], t["origin"]))
+            if record["load_ms"] is None:
+                self._pending[id(driver)] = ((t["url"], t["origin"]), record)
+            else:
+                self.records.append(record)
+        return record
+
+    def harvest(self, driver, final=False):
+        """Book the pending document once it has loaded (or for good when it is left or `final`)."""
+        with self._lock:
+            pending = self._pending.get(id(driver))
+        if pending is None:
+            return None
+        key, record = pending
+        t = self._read(driver)
+        if t and (t["url"], t["origin"]) == key:
+            if not t["load"] and not final:
+                return None   # still loading; the next harvest tries again
+            record = self._record(t, record["page"])
+        # Otherwise the browser already moved on: keep what was read at capture time
+        with self._lock:
+            self._pending.pop(id(driver), None)
+            self.records.append(record)
+        return record
+
+    def _read(self, driver):
+        try:
+            return driver.execute_script(_TIMING_JS, self.top_resources)
+        except Exception:
+            return None
+
+    def _record(self, t, page):
+        return {
+            "run": self.run_id, "ts": round(time.time(), 3), "page": page, "url": t["url"],
+            "ttfb_ms": _ms(t["ttfb"]), "dcl_ms": _ms(t["dcl"]), "load_ms": _ms(t["load"]),
+            "bytes": t["bytes"], "resources": t["resources"], "largest": t["largest"],
+        }
+
+    def save(self):
+        """Append this run's records to the time series file."""
+        with self._lock:
+            # Documents whose driver never came back: keep the capture-time reading
+            self.records += [record for _, record in self._pending.values()]
+            self._pending.clear()
+            records, self._written = self.records[self._written:], len(self.records)
+        if not records:
+            return
+        blob = "".join(json.dumps(r) + "\n" for r in records)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(blob)
+
+    def medians(self):
+        with self._lock:
+            return medians(self.records)
+
+
+def _ms(value):
+    # 0 means the event has not happened yet (eager navigation returns before load)
+    return round(value, 1) if value else None
+
+
+def medians(records):
+    """{page: {metric: median}} over the records that have the metric."""
+    values = {}
+    for r in records:
+        for metric in METRICS:
+            if r.get(metric) is not None:
+                values.setdefault(r["page"], {}).setdefault(metric, []).append(r[metric])
+    return {page: {m: round(statistics.median(v), 1) for m, v in metrics.items()}
+            for page, metrics in values.items()}
+
+
+def compare(current, baseline, budget_pct=None):
+    """Regression messages for page metrics over baseline by more than the budget."""
+    budget_pct = config.PERF_BUDGET_PCT if budget_pct is None else budget_pct
+    regressions = []
+    for page, metrics in sorted(current.items()):
+        for metric, value in metrics.items():
+            base = baseline.get(page, {}).get(metric)
+            if base and value > base * (1 + budget_pct / 100.0):
+                regressions.append(f"{page}: {metric} {value} > baseline {base} (+{budget_pct:g}% budget)")
+    return regressions
+
+
+def load_baseline(path=None):
+    try:
+        with open(path or config.PERF_BASELINE_FILE, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def load_series(path=None):
+    records = []
+    try:
+        with open(path or config.PERF_TIMING_FILE, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    continue
+    except OSError:
+        pass
+    return records
+
+
+perf_recorder = PerfRecorder()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare the last run's page timings with the baseline.")
+    parser.add_argument("--run", help="run id (default: the latest in the series)")
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args(argv)
+
+    series = load_series()
+    if not series:
+        print(f" No timings recorded yet in {config.PERF_TIMING_FILE}.")
+        return 0
+    run = args.run or series[-1]["run"]
+    current = medians([r for r in series if r["run"] == run])
+    for page, m in sorted(current.items()):
+        print(f" {page:<20}" + "  ".join(f"{k} {v:>8.1f}" for k, v in m.items()))
+
+    if args.update_baseline:
+        with open(config.PERF_BASELINE_FILE, "w", encoding="utf-8") as f:
+            json.dump(current, f, indent=2, sort_keys=True)
+        print(f" Baseline updated from run {run}: {config.PERF_BASELINE_FILE}")
+        return 0
+    regressions = compare(current, load_baseline())
+    for line in regressions:
+        print(" REGRESSION", line)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,137 @@
+"""WebDriver command profiling, attributed to the page-object method that issued it.
+
+The driver's command executor is wrapped once; every command is timed and
+booked against the innermost page-object method on the call stack, e.g.
+CheckoutPage.continue_payment -> executeScript x 3.
+"""
+import html
+import json
+import os
+import sys
+import threading
+import time
+from utils import config
+
+PAGES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "pages") + os.sep
+OUTSIDE_PAGES = "(test code)"
+
+
+class CommandProfiler:
+    def __init__(self, measure_bytes=False):
+        self.measure_bytes = measure_bytes
+        self._lock = threading.Lock()
+        self._in_pages = {}
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            # (method, command) -> [count, seconds, bytes]
+            self.stats = {}
+
+    # -------------------------------
+    # HOOK INTO THE DRIVER
+    # -------------------------------
+    def attach(self, driver):
+        executor = driver.command_executor
+        if getattr(executor, "_qa_profiler", None) is not None:
+            executor._qa_profiler = self
+            return
+        original = executor.execute
+
+        def execute(command, params):
+            start = time.perf_counter()
+            response = original(command, params)
+            executor._qa_profiler.record(command, time.perf_counter() - start, params, response)
+            return response
+
+        executor.execute = execute
+        executor._qa_profiler = self
+
+    def record(self, command, seconds, params=None, response=None):
+        size = 0
+        if self.measure_bytes:
+            size = len(json.dumps(params or {}, default=str)) + len(json.dumps(response, default=str))
+        key = (self._caller(), command)
+        with self._lock:
+            entry = self.stats.setdefault(key, [0, 0.0, 0])
+            entry[0] += 1
+            entry[1] += seconds
+            entry[2] += size
+
+    def _caller(self):
+        frame = sys._getframe(3)
+        while frame is not None:
+            code = frame.f_code
+            in_pages = self._in_pages.get(code)
+            if in_pages is None:
+                in_pages = self._in_pages[code] = code.co_filename.startswith(PAGES_DIR)
+            if in_pages:
+                owner = frame.f_locals.get("self")
+                if owner is not None:
+                    return f"{type(owner).__name__}.{code.co_name}"
+            frame = frame.f_back
+        return OUTSIDE_PAGES
+
+    def merge(self, other):
+        """Add another profiler's counts into this one (e.g. per-test into per-session)."""
+        with self._lock:
+            for key, (count, seconds, size) in list(other.stats.items()):
+                entry = self.stats.setdefault(key, [0, 0.0, 0])
+                entry[0] += count
+                entry[1] += seconds
+                entry[2] += size
+
+    # -------------------------------
+    # REPORTING
+    # -------------------------------
+    @property
+    def commands(self):
+        return sum(e[0] for e in self.stats.values())
+
+    @property
+    def bytes(self):
+        return sum(e[2] for e in self.stats.values())
+
+    def summary(self):
+        with self._lock:
+            items = list(self.stats.items())
+        methods = {}
+        for (method, command), (count, seconds, size) in items:
+            m = methods.setdefault(method, {"commands": 0, "ms": 0.0, "by_command": {}})
+            m["commands"] += count
+            m["ms"] += seconds * 1000
+            m["by_command"][command] = {"count": count, "ms": round(seconds * 1000, 2)}
+            if self.measure_bytes:
+                m["by_command"][command]["bytes"] = size
+        for m in methods.values():
+            m["ms"] = round(m["ms"], 2)
+        ordered = dict(sorted(methods.items(), key=lambda kv: kv[1]["ms"], reverse=True))
+        return {
+            "commands": sum(m["commands"] for m in methods.values()),
+            "ms": round(sum(m["ms"] for m in methods.values()), 2),
+            "methods": ordered,
+        }
+
+    def write_json(self, name, directory=None):
+        directory = directory or os.path.join(config.ARTIFACT_DIR, "profiles")
+        os.makedirs(directory, exist_ok=True)
+        safe = "".join(c if c.isalnum() or c in "-_." else "_" for c in name)
+        path = os.path.join(directory, f"{safe}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.summary(), f, indent=2)
+        return path
+
+
+def summary_html(summary):
+    """Small HTML table of the hottest methods for the pytest-html report."""
+    rows = ""
+    for method, m in summary["methods"].items():
+        breakdown = ", ".join(f"{c} x{v['count']}" for c, v in m["by_command"].items())
+        rows += (f"<tr><td>{html.escape(method)}</td><td>{m['commands']}</td>"
+                 f"<td>{m['ms']:.1f}</td><td>{breakdown}</td></tr>")
+    return (f"<p>WebDriver: {summary['commands']} commands, {summary['ms']:.0f} ms</p>"
+            "<table><tr><th>Method</th><th>Commands</th><th>ms</th><th>Breakdown</th></tr>"
+            f"{rows}</table>")
+
+
+profiler = CommandProfiler()
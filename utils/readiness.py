@@ -0,0 +1,95 @@
+"""Navigate and return as soon as the page object can work.
+
+Page objects declare READY: candidate locators, any one of which being
+visible means the page is usable. Browsers run with an eager page-load
+strategy, so driver.get returns at DOMContentLoaded and images or late
+scripts no longer hold up the test.
+
+With READINESS_STATS on, the full load time of each page is read from
+Navigation Timing when the browser moves on, so the time saved per page
+shows up in the terminal summary.
+"""
+import threading
+import time
+from utils import config
+from utils.deadline import budget
+from utils.locators import wait_for_any
+from utils.perf_timing import perf_recorder
+from utils.resource_usage import resource_monitor
+
+_NAVIGATION_JS = """
+var n = performance.getEntriesByType('navigation')[0];
+return n ? {url: n.name, load: n.loadEventEnd} : null;
+"""
+
+
+class ReadinessStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = {}   # id(driver) -> (page, url, ready_ms)
+        self.pages = {}      # page -> {"count", "ready_ms", "loads", "load_ms"}
+
+    def record_ready(self, driver, page, url, ready_ms):
+        with self._lock:
+            entry = self.pages.setdefault(page, {"count": 0, "ready_ms": 0.0, "loads": 0, "load_ms": 0.0})
+            entry["count"] += 1
+            entry["ready_ms"] += ready_ms
+            self._pending[id(driver)] = (page, url, ready_ms)
+
+    def harvest(self, driver):
+        """Book the full load time of the page the driver is still on (if it finished loading)."""
+        with self._lock:
+            pending = self._pending.pop(id(driver), None)
+        if pending is None:
+            return
+        page, url, _ = pending
+        try:
+            nav = driver.execute_script(_NAVIGATION_JS)
+        except Exception:
+            return
+        if not nav or not nav.get("load") or nav.get("url", "").split("#")[0] != url.split("#")[0]:
+            return
+        with self._lock:
+            entry = self.pages[page]
+            entry["loads"] += 1
+            entry["load_ms"] += nav["load"]
+
+    def summary(self):
+        out = {}
+        with self._lock:
+            for page, e in self.pages.items():
+                ready = e["ready_ms"] / e["count"]
+                row = {"count": e["count"], "ready_ms": round(ready, 1)}
+                if e["loads"]:
+                    load = e["load_ms"] / e["loads"]
+                    row["load_ms"] = round(load, 1)
+                    row["saved_ms"] = round(load - ready, 1)
+                out[page] = row
+        return out
+
+
+readiness_stats = ReadinessStats()
+
+
+def open_ready(page, url, timeout=None):
+    """driver.get(url), then wait for page.READY. Returns the element that satisfied it (None on timeout)."""
+    driver = page.driver
+    stats = readiness_stats if config.READINESS_STATS else None
+    if stats:
+        stats.harvest(driver)
+    perf_recorder.harvest(driver)
+    start = time.perf_counter()
+    driver.get(url)
+    contract = getattr(page, "READY", None)
+    if not contract:
+        return None
+    cap = timeout or getattr(page, "timeout", config.DEFAULT_TIMEOUT)
+    el, _ = wait_for_any(driver, contract, budget(cap, getattr(page, "deadline", None)), page=page)
+    if el is None:
+        print(f" {type(page).__name__} not ready after navigation to {url}")
+        return None
+    if stats:
+        stats.record_ready(driver, type(page).__name__, url, (time.perf_counter() - start) * 1000)
+    perf_recorder.capture(driver, getattr(page, "PERF_KEY", type(page).__name__))
+    resource_monitor.step(driver, getattr(page, "PERF_KEY", type(page).__name__))
+    return el
@@ -0,0 +1,235 @@
+"""Browser memory and CPU per test, sampled at page-object steps and checked against budgets.
+
+A sample combines the browser's OS processes (RSS and CPU seconds of every
+process under chromedriver, via psutil when installed, else /proc) with page
+metrics from DevTools Performance.getMetrics (JS heap used, DOM nodes,
+layout count). One is taken at test start, at every step that also records
+page timing (product, cart, checkout_*, success, ...) and at test end. The
+peaks are compared with the RESOURCE_BUDGET_* settings and appended to
+RESOURCE_USAGE_FILE (JSONL) so runner capacity can be sized from real runs.
+
+With BROWSER_CONTEXTS the process figures are the shared browser's, so they
+include other contexts; the page metrics are still the test's own.
+"""
+import json
+import os
+import threading
+import time
+from utils import config
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+# DevTools metric name -> (sample key, scale)
+PAGE_METRICS = {
+    "JSHeapUsedSize": ("js_heap_mb", 1 / (1024 * 1024)),
+    "Nodes": ("dom_nodes", 1),
+    "LayoutCount": ("layouts", 1),
+}
+PEAK_KEYS = ("rss_mb", "js_heap_mb", "dom_nodes", "layouts")
+
+
+# -------------------------------
+# OS PROCESSES
+# -------------------------------
+def browser_pids(driver):
+    """Processes started by the driver's chromedriver (the browser and its renderers)."""
+    process = getattr(getattr(driver, "service", None), "process", None)
+    if process is None:
+        return []
+    if psutil:
+        try:
+            return [p.pid for p in psutil.Process(process.pid).children(recursive=True)]
+        except psutil.Error:
+            return []
+    parents = {pid: stat[0] for pid, stat in _proc_stats().items()}
+    found, todo = [], [process.pid]
+    while todo:
+        parent = todo.pop()
+        children = [pid for pid, ppid in parents.items() if ppid == parent]
+        found += children
+        todo += children
+    return found
+
+
+def process_usage(pids):
+    """{pid: (RSS bytes, CPU seconds)} for the pids that could be read."""
+    usage = {}
+    if psutil:
+        for pid in pids:
+            try:
+                p = psutil.Process(pid)
+                times = p.cpu_times()
+                usage[pid] = (p.memory_info().rss, times.user + times.system)
+            except psutil.Error:
+                continue
+        return usage
+    if not pids:
+        return usage
+    page_size = os.sysconf("SC_PAGE_SIZE")
+    ticks = os.sysconf("SC_CLK_TCK")
+    for pid, (_, utime, stime, rss_pages) in _proc_stats(pids).items():
+        usage[pid] = (rss_pages * page_size, (utime + stime) / ticks)
+    return usage
+
+
+def _proc_stats(pids=None):
+    # pid -> (ppid, utime, stime, rss pages) on Linux; {} elsewhere
+    stats = {}
+    if pids is None:
+        try:
+            pids = [int(name) for name in os.listdir("/proc") if name.isdigit()]
+        except OSError:
+            return stats
+    for pid in pids:
+        try:
+            with open(f"/proc/{pid}/stat", encoding="ascii", errors="replace") as f:
+                # The command name may contain spaces; fields after it are fixed
+                fields = f.read().rsplit(")", 1)[1].split()
+        except (OSError, IndexError):
+            continue
+        stats[pid] = (int(fields[1]), int(fields[11]), int(fields[12]), int(fields[21]))
+    return stats
+
+
+# -------------------------------
+# PER-TEST MONITOR
+# -------------------------------
+class ResourceMonitor:
+    def __init__(self, enabled=None, path=None):
+        self.enabled = config.RESOURCE_USAGE if enabled is None else enabled
+        self.path = path or config.RESOURCE_USAGE_FILE
+        self.run_id = os.getenv("RUN_ID") or time.strftime("%Y%m%d-%H%M%S")
+        self.records = []
+        self.over_budget = []
+        self._written = 0
+        self._lock = threading.Lock()
+        self._driver = None
+        self.samples = []
+        self._cpu_base = {}
+        self._cpu_last = {}
+
+    def begin(self, driver):
+        """Start accounting for a test on this driver."""
+        self._driver = None
+        self.samples = []
+        if not self.enabled or getattr(driver, "is_browserless", False):
+            return
+        try:
+            driver.execute_cdp_cmd("Performance.enable", {})
+        except Exception:
+            pass
+        self._driver = driver
+        self._start = time.perf_counter()
+        # CPU seconds per pid: when first seen (0 for processes started during the test) and latest
+        self._cpu_base = {pid: cpu for pid, (_, cpu) in process_usage(browser_pids(driver)).items()}
+        self._cpu_last = dict(self._cpu_base)
+        self.sample(driver, "start")
+
+    def step(self, driver, name):
+        """Sample at a step boundary (no-op unless a test is being accounted on this driver)."""
+        if driver is not self._driver or driver is None:
+            return None
+        return self.sample(driver, name)
+
+    def sample(self, driver, name):
+        s = {"step": name, "t_ms": round((time.perf_counter() - self._start) * 1000)}
+        # Chrome starts renderers as the test navigates, so look the processes up every time
+        usage = process_usage(browser_pids(driver))
+        if usage:
+            s["rss_mb"] = round(sum(rss for rss, _ in usage.values()) / (1024 * 1024), 1)
+            for pid, (_, cpu) in usage.items():
+                self._cpu_base.setdefault(pid, 0.0)
+                self._cpu_last[pid] = cpu
+        if self._cpu_last:
+            # Processes that exited keep the CPU they used until their last sample
+            s["cpu_s"] = round(sum(cpu - self._cpu_base[pid] for pid, cpu in self._cpu_last.items()), 2)
+        try:
+            metrics = driver.execute_cdp_cmd("Performance.getMetrics", {})["metrics"]
+        except Exception:
+            metrics = []
+        for m in metrics:
+            if m["name"] in PAGE_METRICS:
+                key, scale = PAGE_METRICS[m["name"]]
+                s[key] = round(m["value"] * scale, 1) if scale != 1 else int(m["value"])
+        self.samples.append(s)
+        return s
+
+    def end(self, driver, nodeid):
+        """Final sample; returns the test's summary (None if it was not accounted)."""
+        if driver is not self._driver or driver is None:
+            return None
+        self.sample(driver, "end")
+        self._driver = None
+        summary = summarize(self.samples)
+        summary["over_budget"] = check_budgets(summary)
+        with self._lock:
+            self.records.append({"run": self.run_id, "test": nodeid, **summary["peak"], "cpu_s": summary["cpu_s"],
+                                 "cpu_pct": summary["cpu_pct"]})
+            self.over_budget += [f"{nodeid}: {line}" for line in summary["over_budget"]]
+        return summary
+
+    def totals(self):
+        """Largest and average peak per metric over this run's tests."""
+        with self._lock:
+            records = list(self.records)
+        out = {}
+        for key in PEAK_KEYS + ("cpu_s",):
+            values = [r[key] for r in records if r.get(key) is not None]
+            if values:
+                out[key] = {"max": max(values), "avg": round(sum(values) / len(values), 1), "tests": len(values)}
+        return out
+
+    def save(self):
+        """Append this run's per-test peaks to the JSONL file."""
+        with self._lock:
+            records, self._written = self.records[self._written:], len(self.records)
+        if not records:
+            return
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write("".join(json.dumps(r) + "\n" for r in records))
+
+
+def summarize(samples):
+    peak = {}
+    for key in PEAK_KEYS:
+        values = [s[key] for s in samples if key in s]
+        peak[key] = max(values) if values else None
+    cpu = samples[-1].get("cpu_s") if samples else None
+    wall = samples[-1]["t_ms"] / 1000 if samples else 0
+    return {
+        "samples": samples,
+        "peak": peak,
+        "cpu_s": cpu,
+        "cpu_pct": round(cpu / wall * 100, 1) if cpu is not None and wall else None,
+    }
+
+
+def budgets():
+    """{key: limit} for the budgets that are set (0 = no budget)."""
+    limits = {
+        "rss_mb": config.RESOURCE_BUDGET_RSS_MB,
+        "cpu_s": config.RESOURCE_BUDGET_CPU_S,
+        "js_heap_mb": config.RESOURCE_BUDGET_JS_HEAP_MB,
+        "dom_nodes": config.RESOURCE_BUDGET_DOM_NODES,
+        "layouts": config.RESOURCE_BUDGET_LAYOUTS,
+    }
+    return {k: v for k, v in limits.items() if v}
+
+
+def check_budgets(summary, limits=None):
+    """Messages for every metric over its budget, naming the step where it peaked."""
+    limits = budgets() if limits is None else limits
+    messages = []
+    for key, limit in limits.items():
+        value = summary["cpu_s"] if key == "cpu_s" else summary["peak"].get(key)
+        if value is None or value <= limit:
+            continue
+        at = next((s["step"] for s in summary["samples"] if s.get(key) == value), "end")
+        messages.append(f"{key} {value:g} > budget {limit:g} (at {at})")
+    return messages
+
+
+resource_monitor = ResourceMonitor()
@@ -0,0 +1,196 @@
+"""Seed store state (login, new accounts, cart contents) over plain HTTP.
+
+The resulting session cookies are then handed to a WebDriver, so a test can
+start directly on the page it is about.
+"""
+import http.cookiejar
+import re
+import urllib.parse
+import urllib.request
+from html.parser import HTMLParser
+from utils import config
+
+
+class SeedingError(Exception):
+    pass
+
+
+class _FormParser(HTMLParser):
+    """Collects <form> elements with their action, method and default field values."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.forms = []
+        self._form = None
+        self._select = None
+
+    def handle_starttag(self, tag, attrs):
+        a = dict(attrs)
+        if tag == "form":
+            self._form = {"id": a.get("id", ""), "action": a.get("action", ""),
+                          "method": (a.get("method") or "get").lower(), "fields": {}, "selects": {},
+                          "names": set()}
+            self.forms.append(self._form)
+        elif self._form is None:
+            return
+        if tag in ("input", "textarea", "select") and a.get("name"):
+            self._form["names"].add(a["name"])
+        if tag == "input" and a.get("name"):
+            kind = (a.get("type") or "text").lower()
+            if kind in ("submit", "button", "image", "reset"):
+                return
+            if kind in ("radio", "checkbox") and "checked" not in a:
+                return
+            self._form["fields"][a["name"]] = a.get("value", "on" if kind == "checkbox" else "")
+        elif tag == "textarea" and a.get("name"):
+            self._form["fields"][a["name"]] = ""
+        elif tag == "select" and a.get("name"):
+            self._select = a["name"]
+            self._form["selects"][self._select] = []
+        elif tag == "option" and self._select:
+            value = a.get("value", "")
+            self._form["selects"][self._select].append(value)
+            if "selected" in a:
+                self._form["fields"][self._select] = value
+
+    def handle_endtag(self, tag):
+        if tag == "form":
+            self._form = None
+        elif tag == "select":
+            self._select = None
+
+
+class StoreSession:
+    LOGIN_ROUTE = "account/login"
+    ACCOUNT_ROUTE = "account/account"
+    REGISTER_ROUTE = "account/create"
+    PRODUCT_ROUTE = "product/product"
+    CART_ROUTE = "checkout/cart"
+
+    def __init__(self, base_url=None, timeout=15):
+        self.base_url = (base_url or config.BASE_URL).rstrip("/")
+        self.timeout = timeout
+        self.cookies = http.cookiejar.CookieJar()
+        self.opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(self.cookies))
+
+    def url(self, route, **params):
+        query = urllib.parse.urlencode({"rt": route, **params})
+        return f"{self.base_url}/index.php?{query}"
+
+    # -------------------------------
+    # HTTP
+    # -------------------------------
+    def get(self, url):
+        with self.opener.open(url, timeout=self.timeout) as resp:
+            return resp.geturl(), resp.read().decode("utf-8", "replace")
+
+    def post(self, url, data):
+        body = urllib.parse.urlencode(data).encode("utf-8")
+        with self.opener.open(url, data=body, timeout=self.timeout) as resp:
+            return resp.geturl(), resp.read().decode("utf-8", "replace")
+
+    def submit_form(self, page_url, values, required=()):
+        """Load page_url, pick the form that has all `required` fields and submit it.
+
+        Hidden inputs (tokens etc.) and default selections are kept; `values` override them.
+        """
+        _, html = self.get(page_url)
+        parser = _FormParser()
+        parser.feed(html)
+        names = set(required or values)
+        for form in parser.forms:
+            if names <= form["names"]:
+                break
+        else:
+            raise SeedingError(f"No form with fields {sorted(names)} on {page_url}")
+
+        data = dict(form["fields"])
+        # Required selects (product options, zones) get their first real choice
+        for name, choices in form["selects"].items():
+            if not data.get(name):
+                data[name] = next((c for c in choices if c), "")
+        data.update({k: str(v) for k, v in values.items()})
+
+        action = urllib.parse.urljoin(page_url, form["action"] or page_url)
+        if form["method"] == "post":
+            return self.post(action, data)
+        sep = "&" if "?" in action else "?"
+        return self.get(f"{action}{sep}{urllib.parse.urlencode(data)}")
+
+    # -------------------------------
+    # STORE ACTIONS
+    # -------------------------------
+    def login(self, username, password):
+        self.submit_form(self.url(self.LOGIN_ROUTE), {"loginname": username, "password": password})
+        if not self.is_logged_in():
+            raise SeedingError(f"HTTP login failed for {username}")
+        print(f" Seeded login for {username}")
+        return True
+
+    def is_logged_in(self):
+        final_url, _ = self.get(self.url(self.ACCOUNT_ROUTE))
+        return self.LOGIN_ROUTE not in urllib.parse.unquote(final_url)
+
+    def register(self, firstname, lastname, email, loginname, password, **extra):
+        values = {
+            "firstname": firstname,
+            "lastname": lastname,
+            "email": email,
+            "loginname": loginname,
+            "password": password,
+            "confirm": password,
+            **extra,
+        }
+        final_url, _ = self.submit_form(self.url(self.REGISTER_ROUTE), values,
+                                        required=("loginname", "password"))
+        if "account/success" not in urllib.parse.unquote(final_url):
+            raise SeedingError(f"HTTP registration failed for {loginname}")
+        print(f" Seeded account {loginname}")
+        return True
+
+    def add_to_cart(self, product_id, quantity=1, options=None):
+        values = {"product_id": product_id, "quantity": quantity, **(options or {})}
+        before = self.cart_quantities().get(product_id, 0)
+        self.submit_form(self.url(self.PRODUCT_ROUTE, product_id=product_id), values,
+                         required=("product_id",))
+        # The store may turn the add down (out of stock, missing option) and just show the product
+        # again; the product being in the cart proves nothing if it was there already
+        if self.cart_quantities().get(product_id, 0) <= before:
+            raise SeedingError(f"Store did not add product {product_id} to the cart")
+        print(f" Seeded cart with product {product_id} x{quantity}")
+        return True
+
+    def cart_quantities(self):
+        """{product id: quantity} from the cart page's quantity inputs (named quantity[<id>] or quantity[<id>:<options>])."""
+        _, page = self.get(self.url(self.CART_ROUTE))
+        quantities = {}
+        for tag in re.findall(r"<input\b[^>]*>", page):
+            name = re.search(r'name="quantity\[(\d+)', tag)
+            value = re.search(r'value="(\d+)"', tag)
+            if name and value:
+                product_id = int(name.group(1))
+                quantities[product_id] = quantities.get(product_id, 0) + int(value.group(1))
+        return quantities
+
+    # -------------------------------
+    # HAND OVER TO THE BROWSER
+    # -------------------------------
+    def inject_into(self, driver, start_url=None):
+        """Copy this session's cookies into the browser, then open start_url if given."""
+        try:
+            for c in self.cookies:
+                driver.execute_cdp_cmd("Network.setCookie", {
+                    "name": c.name, "value": c.value, "url": self.base_url,
+                    "path": c.path or "/", "secure": bool(c.secure),
+                    "httpOnly": bool(c.has_nonstandard_attr("HttpOnly")),
+                })
+        except Exception:
+            # No CDP (non-Chrome driver): cookies can only be set for the open document
+            driver.get(f"{self.base_url}/robots.txt")
+            for c in self.cookies:
+                cookie = {"name": c.name, "value": c.value, "path": c.path or "/", "secure": bool(c.secure)}
+                if c.domain.startswith("."):
+                    cookie["domain"] = c.domain
+                driver.add_cookie(cookie)
+        if start_url:
+            driver.get(start_url)
@@ -0,0 +1,381 @@
+"""Run only the tests a change can affect.
+
+    RECORD_DEPS=True python -m utils.parallel -n 4          # recording run (off by default)
+    SELECT_CHANGED=True pytest tests/                       # since the map was recorded
+    SELECT_CHANGED=True CHANGED_SINCE=origin/main pytest tests/
+    python -m utils.test_selection --since origin/main      # print the affected node ids
+
+Recording (RECORD_DEPS=True; sys.setprofile slows every call, so it is a run
+of its own, e.g. nightly on the main branch): while the suite runs, every function
+executed from this repository is booked to the running test, along with the
+class constants (locator lists, READY contracts) and config values those
+functions refer to. Session-scoped setup goes to a shared "session" bucket.
+The map is saved to DEPS_FILE together with the commit it was recorded at;
+parallel workers write DEPS_FILE.<worker>, merged by utils/parallel.py.
+
+Selection compares each changed file symbol by symbol (functions, methods,
+class constants, config values) between the git ref and the working tree. A
+test is selected if it depends on a changed symbol, uses a changed fixture,
+or is new. The full suite runs when the map is missing, was recorded on a
+commit that is not in HEAD's history, or a change cannot be attributed
+(module-level code in config.py/conftest.py, pytest hooks, session setup,
+requirements).
+"""
+import argparse
+import ast
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from utils import config
+
+VERSION = 1
+CONFIG_PATH = "utils/config.py"
+CONFTEST_PATH = "conftest.py"
+# Changes here can affect any test
+FULL_RUN_FILES = {"requirements.txt", "pytest.ini", "setup.cfg", "pyproject.toml", "tox.ini", ".env"}
+
+
+# -------------------------------
+# SYMBOLS
+# -------------------------------
+def _dump(nodes):
+    if isinstance(nodes, ast.AST):
+        return ast.dump(nodes)
+    return "\n".join(_dump(n) for n in nodes)
+
+
+def _assigned(node):
+    if isinstance(node, ast.Assign):
+        names = [t.id for t in node.targets if isinstance(t, ast.Name)]
+        return names if len(names) == len(node.targets) else []
+    if isinstance(node, ast.AnnAssign) and isinstance(node.target, ast.Name):
+        return [node.target.id]
+    return []
+
+
+def _is_docstring(node):
+    return isinstance(node, ast.Expr) and isinstance(node.value, ast.Constant) and isinstance(node.value.value, str)
+
+
+def symbol_table(source):
+    """{key: (kind, ast dump)}; kinds: def, const, class (bases and leftovers), module (everything else).
+
+    Keys are "name" or "Class.name". Formatting and comments do not change a dump.
+    """
+    table, module_rest = {}, []
+    for node in ast.parse(source).body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            table[node.name] = ("def", _dump(node))
+        elif isinstance(node, ast.ClassDef):
+            rest = node.bases + node.keywords + node.decorator_list
+            for item in node.body:
+                if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                    table[f"{node.name}.{item.name}"] = ("def", _dump(item))
+                elif _assigned(item):
+                    for name in _assigned(item):
+                        table[f"{node.name}.{name}"] = ("const", _dump(item))
+                elif not _is_docstring(item):
+                    rest.append(item)
+            table[node.name] = ("class", _dump(rest))
+        elif _assigned(node):
+            for name in _assigned(node):
+                table[name] = ("const", _dump(node))
+        elif not _is_docstring(node):
+            module_rest.append(node)
+    table["<module>"] = ("module", _dump(module_rest))
+    return table
+
+
+def changed_symbols(old_source, new_source):
+    """Keys added, removed or edited between two versions of a file (None if either does not parse)."""
+    try:
+        old = symbol_table(old_source) if old_source is not None else {}
+        new = symbol_table(new_source) if new_source is not None else {}
+    except SyntaxError:
+        return None
+    return {k for k in set(old) | set(new) if old.get(k) != new.get(k)}
+
+
+def fixture_names(source):
+    """Names of the functions in `source` decorated as pytest fixtures."""
+    try:
+        tree = ast.parse(source or "")
+    except SyntaxError:
+        return set()
+    return {node.name for node in tree.body
+            if isinstance(node, ast.FunctionDef) and any("fixture" in ast.dump(d) for d in node.decorator_list)}
+
+
+# -------------------------------
+# RECORDING
+# -------------------------------
+class DepsRecorder:
+    """Books executed repository code to the running test via sys.setprofile."""
+
+    def __init__(self, root="."):
+        self.root = os.path.abspath(root) + os.sep
+        self.session = set()
+        self.tests = {}
+        self._bucket = self.session
+        self._codes = {}
+        self._tables = {}
+        self._active = False
+        self._previous = (None, None)
+
+    def _profile(self, frame, event, arg):
+        if event == "call":
+            self._bucket.add(frame.f_code)
+
+    def start(self):
+        self._previous = (sys.getprofile(), threading.getprofile())
+        threading.setprofile(self._profile)   # e.g. local store request threads
+        sys.setprofile(self._profile)
+        self._active = True
+
+    def stop(self):
+        if not self._active:
+            return
+        sys.setprofile(self._previous[0])
+        threading.setprofile(self._previous[1])
+        self._active = False
+
+    def begin(self):
+        self._bucket = set()
+
+    def end(self, nodeid, fixtures=()):
+        codes, self._bucket = self._bucket, self.session
+        self.tests[nodeid] = {"deps": sorted(self.resolve(codes)), "fixtures": sorted(fixtures)}
+
+    @contextmanager
+    def session_scope(self):
+        """Book what runs inside to the session bucket (session/module-scoped fixture setup)."""
+        previous, self._bucket = self._bucket, self.session
+        try:
+            yield
+        finally:
+            self._bucket = previous
+
+    # -------------------------------
+    # CODE OBJECTS -> SYMBOLS
+    # -------------------------------
+    def _table(self, rel):
+        if rel not in self._tables:
+            try:
+                with open(os.path.join(self.root, rel), encoding="utf-8") as f:
+                    self._tables[rel] = symbol_table(f.read())
+            except (OSError, SyntaxError, ValueError):
+                self._tables[rel] = {}
+        return self._tables[rel]
+
+    def _locate(self, code):
+        if code in self._codes:
+            return self._codes[code]
+        found = None
+        path = code.co_filename
+        if path.startswith(self.root) and "site-packages" not in path and code.co_name != "<module>":
+            rel = os.path.relpath(path, self.root).replace(os.sep, "/")
+            table = self._table(rel)
+            key = (getattr(code, "co_qualname", None) or code.co_name).split(".<locals>")[0]
+            if key not in table:
+                # Module-level lambdas, or a bare co_name before Python 3.11
+                matches = [k for k in table if k.endswith("." + key)]
+                key = matches[0] if len(matches) == 1 else "<module>"
+            # Module and class bodies run once at import; they name everything they define
+            if table.get(key, ("",))[0] != "class":
+                names = set(code.co_names)
+                names.update(c for c in code.co_consts if isinstance(c, str) and c.isidentifier())
+                found = (rel, key, frozenset(names))
+        self._codes[code] = found
+        return found
+
+    def resolve(self, codes):
+        """Symbols for a set of executed code objects, plus the constants they refer to."""
+        deps, names, classes, files = set(), set(), set(), set()
+        for code in list(codes):
+            loc = self._locate(code)
+            if not loc:
+                continue
+            rel, key, code_names = loc
+            deps.add(f"{rel}::{key}")
+            names |= code_names
+            files.add(rel)
+            owner = key.split(".")[0]
+            if self._table(rel).get(owner, ("",))[0] == "class":
+                classes.add((rel, owner))
+        # Constants by name: module-level ones of touched files, class ones of touched classes,
+        # and config values (READY is fetched with getattr, hence the string constants above)
+        for rel in files | {CONFIG_PATH}:
+            for key, (kind, _) in self._table(rel).items():
+                owner, _, attr = key.rpartition(".")
+                if kind == "const" and attr in names and (
+                        (owner and (rel, owner) in classes) or (not owner and (rel in files or rel == CONFIG_PATH))):
+                    deps.add(f"{rel}::{key}")
+        return deps
+
+    # -------------------------------
+    # SAVE
+    # -------------------------------
+    def save(self, path=None, commit=None):
+        """Merge this run into the map on disk (tests not run this time keep their old entry)."""
+        was_active = self._active
+        if was_active:
+            self.stop()
+        _merge_into(path or config.DEPS_FILE, self.tests, self.resolve(self.session),
+                    commit or git_head(self.root))
+        if was_active:
+            self.start()
+
+
+def merge_maps(paths, path=None):
+    """Fold per-worker maps (utils/parallel.py) into the main one and delete them."""
+    parts = [m for m in (load_map(p) for p in paths) if m]
+    for p in paths:
+        try:
+            os.remove(p)
+        except OSError:
+            pass
+    if not parts:
+        return
+    tests, session = {}, set()
+    for part in parts:
+        tests.update(part["tests"])
+        session.update(part.get("session", []))
+    _merge_into(path or config.DEPS_FILE, tests, session, parts[0].get("commit"))
+
+
+def _merge_into(path, tests, session, commit):
+    data = load_map(path) or {"tests": {}, "session": []}
+    # After a partial run, older entries still describe the old commit: keep diffing from there
+    partial = data.get("commit") and not set(data["tests"]) <= set(tests)
+    data["tests"].update(tests)
+    data["session"] = sorted(set(data["session"]) | set(session))
+    data.update(version=VERSION, recorded=time.time())
+    if not partial:
+        data["commit"] = commit
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=1, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def load_map(path=None):
+    try:
+        with open(path or config.DEPS_FILE, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return data if data.get("version") == VERSION else None
+
+
+# -------------------------------
+# GIT
+# -------------------------------
+def _git(root, *args):
+    out = subprocess.run(["git", *args], cwd=root, capture_output=True, text=True)
+    return out.returncode, out.stdout
+
+
+def git_head(root="."):
+    code, out = _git(root, "rev-parse", "HEAD")
+    return out.strip() if code == 0 else None
+
+
+def changed_files(root, since):
+    """Files that differ between `since` and the working tree, untracked ones included (None if git fails)."""
+    code, diff = _git(root, "diff", "--name-only", since, "--")
+    if code != 0:
+        return None
+    _, untracked = _git(root, "ls-files", "--others", "--exclude-standard")
+    return sorted({line for line in (diff + untracked).splitlines() if line.strip()})
+
+
+def _read_at(root, ref, rel):
+    code, out = _git(root, "show", f"{ref}:{rel}")
+    return out if code == 0 else None
+
+
+def _read_now(root, rel):
+    try:
+        with open(os.path.join(root, rel), encoding="utf-8") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+# -------------------------------
+# SELECTION
+# -------------------------------
+def affected_tests(nodeids, deps=None, since=None, root="."):
+    """(selected node ids, reason); selected is None when the full suite has to run."""
+    deps = deps if deps is not None else load_map()
+    if not deps or not deps.get("tests"):
+        return None, "no dependency map"
+    recorded = deps.get("commit")
+    if not recorded or _git(root, "merge-base", "--is-ancestor", recorded, "HEAD")[0] != 0:
+        return None, "dependency map was recorded on a commit outside HEAD's history"
+    since = since or recorded
+    files = changed_files(root, since)
+    if files is None:
+        return None, f"cannot diff against {since}"
+
+    tests, session = deps["tests"], set(deps.get("session", []))
+    selected = {n for n in nodeids if n not in tests}   # new tests have no history yet
+    for rel in files:
+        if not rel.endswith(".py"):
+            if os.path.basename(rel) in FULL_RUN_FILES:
+                return None, f"{rel} changed"
+            continue
+        old, new = _read_at(root, since, rel), _read_now(root, rel)
+        keys = changed_symbols(old, new)
+        special = rel in (CONFIG_PATH, CONFTEST_PATH)
+        if keys is None:
+            if special:
+                return None, f"{rel} does not parse"
+            keys = {"<module>"}
+        fixtures = fixture_names(new) | fixture_names(old) if rel == CONFTEST_PATH else set()
+        for key in sorted(keys):
+            dep = f"{rel}::{key}"
+            if dep in session:
+                return None, f"{dep} runs in session setup"
+            if special and (key == "<module>" or key.startswith("pytest_")):
+                return None, f"{dep} changed"
+            for nodeid, entry in tests.items():
+                if key == "<module>":
+                    hit = any(d.startswith(f"{rel}::") for d in entry["deps"])
+                else:
+                    hit = dep in entry["deps"] or (key in fixtures and key in entry["fixtures"])
+                if hit:
+                    selected.add(nodeid)
+    known = set(nodeids)
+    return {n for n in selected if n in known}, f"{len(files)} changed files since {since[:12]}"
+
+
+# Module-level recorder used by conftest.py
+recorder = DepsRecorder(root=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--since", help="git ref to diff against (default: commit the map was recorded at)")
+    parser.add_argument("pytest_args", nargs="*")
+    args = parser.parse_args(argv)
+
+    from utils.parallel import collect
+    nodeids = collect(args.pytest_args)
+    selected, reason = affected_tests(nodeids, since=args.since or config.CHANGED_SINCE or None)
+    if selected is None:
+        print(f" Full suite ({reason}).", file=sys.stderr)
+        selected = nodeids
+    else:
+        print(f" {len(selected)} of {len(nodeids)} tests affected ({reason}).", file=sys.stderr)
+    for nodeid in sorted(selected):
+        print(nodeid)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())